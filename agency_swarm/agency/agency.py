@@ -124,10 +124,7 @@ class Agency:
         self.truncation_strategy = truncation_strategy
 
         # set thread type based send_message_tool_class async mode
-        if (
-            hasattr(send_message_tool_class.ToolConfig, "async_mode")
-            and send_message_tool_class.ToolConfig.async_mode
-        ):
+        if send_message_tool_class._tool_config.async_mode:
             self._thread_type = ThreadAsync
         else:
             self._thread_type = Thread
@@ -168,6 +165,7 @@ class Agency:
         self._init_threads()
         self._create_special_tools()
         self._init_agents()
+        self._warm_up_isolated_tools()
 
         atexit.register(self.mcp_cleanup)
 
@@ -753,6 +751,20 @@ class Agency:
     def plot_agency_chart(self):
         pass
 
+    def _warm_up_isolated_tools(self):
+        """
+        Starts the worker processes of the tools with ToolConfig.isolation = "subprocess" and imports the tools there,
+        so their first call doesn't wait for a process to start.
+        """
+        isolated_tools = [
+            tool
+            for agent in self.agents
+            for tool in agent.tools
+            if isinstance(tool, type) and issubclass(tool, BaseTool) and tool._tool_config.isolation == "subprocess"
+        ]
+        if isolated_tools:
+            Thread.get_tool_executor().warm_up(isolated_tools)
+
     def _init_agents(self):
         """
         Initializes all agents in the agency with unique IDs, shared instructions, and OpenAI models.
@@ -1154,10 +1166,12 @@ class Agency:
             app_token_env: str = "APP_TOKEN", 
             return_app: bool = False,
             cors_origins: List[str] = None,
+            **kwargs,
         ):
         """
         Launch a FastAPI server exposing the agency's completion and 
         streaming endpoints using the shared integrations.fastapi.run_fastapi utility.
+        Additional keyword arguments (e.g. max_queue_size, queue_timeout) are passed to run_fastapi.
         """
         from agency_swarm.integrations.fastapi import run_fastapi
 
@@ -1168,4 +1182,5 @@ class Agency:
             app_token_env=app_token_env,
             return_app=return_app,
             cors_origins=cors_origins or ["*"],
+            **kwargs,
         )
@@ -3,6 +3,7 @@ import inspect
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any, Dict, List, Literal, Optional, Type, TypedDict, Union
 
 from deepdiff import DeepDiff
@@ -539,7 +540,8 @@ class Agent:
                             openapi_spec = f.read()
                             f.close()  # fix permission error on windows
                         try:
-                            validate_openapi_spec(openapi_spec)
+                            # Parsed once, the spec is passed on to the ToolFactory
+                            openapi_spec = validate_openapi_spec(openapi_spec)
                         except Exception as e:
                             logger.error(
                                 "Invalid OpenAPI schema: " + os.path.basename(f_path)
@@ -626,14 +628,33 @@ class Agent:
         return ToolFactory.get_openapi_schema(self.tools, url)
 
     def _add_mcp_tools(self):
-        """Process MCP servers and add their tools to the agent."""
+        """
+        Process MCP servers and add their tools to the agent.
+
+        Servers are connected and their tools listed concurrently, within the startup timeout set by the
+        `MCP_STARTUP_TIMEOUT` env variable (default 20 seconds). All failed or slow servers are reported
+        together once the others are done.
+        """
         if not self.mcp_servers:
             return
 
-        for server in self.mcp_servers:
-            # Get tools from the MCP server
-            mcp_tools = ToolFactory.from_mcp(server)
+        timeout = float(os.getenv("MCP_STARTUP_TIMEOUT", 20))
+        pool = ThreadPoolExecutor(max_workers=len(self.mcp_servers), thread_name_prefix="mcp-startup")
+        futures = [pool.submit(ToolFactory.from_mcp, server) for server in self.mcp_servers]
+        wait(futures, timeout=timeout)
+        # Don't wait for slow servers, they are reported below
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        errors = []
+        for server, future in zip(self.mcp_servers, futures):
+            if not future.done():
+                logger.error(f"{server.name} MCP server did not start within {timeout} seconds")
+                errors.append((server.name, f"did not start within {timeout} seconds"))
+                # Close the server's sessions once it's done starting, so they don't leak
+                future.add_done_callback(lambda _, server=server: self._cleanup_late_mcp_server(server))
+                continue
             try:
+                mcp_tools = future.result()
                 logger.info(f"--- Adding Tools from MCP Server: {server.name} ---")
                 # Add each tool to the agent and print its name
                 for tool in mcp_tools:
@@ -644,7 +665,19 @@ class Agent:
                 )
             except Exception as e:
                 logger.error(f"Error processing {server.name} MCP server: {e}", exc_info=True)
-                raise Exception(f"Error starting {server.name} MCP server: {e}")
+                errors.append((server.name, e))
+
+        if len(errors) == 1:
+            raise Exception(f"Error starting {errors[0][0]} MCP server: {errors[0][1]}")
+        if errors:
+            raise Exception("Error starting MCP servers:\n" + "\n".join(f"{name}: {e}" for name, e in errors))
+
+    @staticmethod
+    def _cleanup_late_mcp_server(server):
+        try:
+            server.cleanup()
+        except Exception as e:
+            logger.error(f"Error shutting down {server.name} MCP server: {e}")
 
     # --- Settings Methods ---
 
@@ -1,13 +1,13 @@
 import os
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Literal, Optional, Type
 
 from dotenv import load_dotenv
 
 from agency_swarm.agency import Agency
 from agency_swarm.agents import Agent
-from agency_swarm.tools import BaseTool
+from agency_swarm.tools import BaseTool, ToolExecutor
 
 load_dotenv()
 
@@ -20,11 +20,51 @@ def run_fastapi(
     app_token_env: str = "APP_TOKEN",
     return_app: bool = False,
     cors_origins: List[str] = None,
+    max_queue_size: int = 100,
+    queue_timeout: Optional[float] = None,
+    priority_classes: Optional[List[str]] = None,
+    enable_metrics: bool = False,
+    tool_executor: Literal["thread", "process"] = "thread",
+    tool_max_workers: Optional[int] = None,
+    tool_timeout: Optional[float] = None,
+    tool_max_concurrency: Optional[int] = None,
+    tool_process_workers: Optional[int] = None,
+    tool_max_queue_size: Optional[int] = None,
+    idempotency_cache_size: int = 1000,
+    idempotency_ttl: float = 24 * 3600,
+    idempotency_db_path: Optional[str] = None,
 ):
     """
     Launch a FastAPI server exposing endpoints for multiple agencies and tools.
-    Each agency is deployed at /[agency-name]/get_completion and /[agency-name]/get_completion_stream.
+    Each agency is deployed at /[agency-name]/get_completion and /[agency-name]/get_completion_stream,
+    and as a websocket at /[agency-name]/ws.
     Each tool is deployed at /tool/[tool-name].
+
+    Completion requests pass through a per-agency admission controller. Runs of an agency share its threads, so
+    each agency processes one conversation at a time, while different agencies run in parallel:
+    max_queue_size: Maximum number of waiting requests per priority class. Requests above it get a 429 response.
+    queue_timeout: Maximum number of seconds a request may wait in the queue. None waits indefinitely.
+    priority_classes: Priority classes selectable with the X-Priority header, highest first.
+        Defaults to ["interactive", "batch"].
+
+    enable_metrics: If True, expose request, queue, run, tool and OpenAI API metrics at /metrics
+        in the Prometheus text format.
+
+    Sync tools are executed in a separate pool so they don't block the event loop:
+    tool_executor: "thread" or "process". Overridden by ToolConfig.executor. Tools run in warm worker processes
+        must be importable, with picklable fields and results.
+    tool_max_workers: Size of the tool pool. Defaults to TOOL_THREAD_POOL_SIZE env variable or min(32, cpus + 4).
+    tool_timeout: Default timeout in seconds for tool calls. Overridden by ToolConfig.timeout.
+    tool_max_concurrency: Default maximum number of concurrent calls per tool. Overridden by ToolConfig.max_concurrency.
+    tool_process_workers: Number of warm worker processes for tools using the "process" executor. Defaults to
+        tool_max_workers in "process" mode, or the number of cpus.
+    tool_max_queue_size: Default maximum number of waiting calls per tool. Calls above it get a 429 response.
+        Overridden by ToolConfig.max_queue_size.
+
+    Completion requests with an Idempotency-Key header are executed once per key:
+    idempotency_cache_size: Maximum number of responses kept in memory.
+    idempotency_ttl: Number of seconds responses are kept.
+    idempotency_db_path: Optional SQLite database path to keep responses across restarts.
     """
     if (agencies is None or len(agencies) == 0) and (tools is None or len(tools) == 0):
         print("No endpoints to deploy. Please provide at least one agency or tool.")
@@ -32,9 +72,11 @@ def run_fastapi(
 
     try:
         import uvicorn
-        from fastapi import FastAPI
+        from fastapi import Depends, FastAPI
         from fastapi.middleware.cors import CORSMiddleware
+        from fastapi.responses import PlainTextResponse
 
+        from .fastapi_utils.admission import AdmissionController
         from .fastapi_utils.endpoint_handlers import (
             exception_handler,
             get_verify_token,
@@ -42,7 +84,9 @@ def run_fastapi(
             make_stream_endpoint,
             make_tool_endpoint,
         )
+        from .fastapi_utils.idempotency import IdempotencyStore
         from .fastapi_utils.request_models import BaseRequest, add_agent_validator
+        from .fastapi_utils.websocket import get_websocket_verify_token, make_websocket_endpoint
     except ImportError:
         print(
             "FastAPI deployment dependencies are missing. Please install agency-swarm[fastapi] package"
@@ -53,27 +97,43 @@ def run_fastapi(
     if app_token is None or app_token == "":
         print(f"Warning: {app_token_env} is not set. Authentication will be disabled.")
     verify_token = get_verify_token(app_token)
+    verify_websocket_token = get_websocket_verify_token(app_token)
+    executor = ToolExecutor(
+        executor=tool_executor,
+        max_workers=tool_max_workers,
+        timeout=tool_timeout,
+        max_concurrency=tool_max_concurrency,
+        process_workers=tool_process_workers,
+        max_queue_size=tool_max_queue_size,
+    )
+
+    idempotency = IdempotencyStore(
+        max_entries=idempotency_cache_size, ttl=idempotency_ttl, db_path=idempotency_db_path
+    )
 
     @asynccontextmanager
     async def lifespan(app):
         # Startup logic
-        global _EXECUTOR
-        from .fastapi_utils.endpoint_handlers import _EXECUTOR, _MAX_WORKERS
-        if _EXECUTOR is None:
+        from .fastapi_utils import endpoint_handlers
+
+        if endpoint_handlers._EXECUTOR is None:
             print("Initializing ThreadPoolExecutor in FastAPI startup event")
-            _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+            endpoint_handlers._EXECUTOR = ThreadPoolExecutor(max_workers=endpoint_handlers._MAX_WORKERS)
         else:
             print("ThreadPoolExecutor already initialized")
+        executor.warm_up([tool for tool in tools or [] if isinstance(tool, type)])
         try:
             yield
         finally:
             # Shutdown logic
-            if _EXECUTOR is not None:
+            if endpoint_handlers._EXECUTOR is not None:
                 print("Shutting down ThreadPoolExecutor in FastAPI shutdown event")
-                _EXECUTOR.shutdown(wait=False, cancel_futures=True)
-                _EXECUTOR = None
+                endpoint_handlers._EXECUTOR.shutdown(wait=False, cancel_futures=True)
+                endpoint_handlers._EXECUTOR = None
             else:
                 print("No ThreadPoolExecutor to shut down")
+            executor.shutdown(wait=False)
+            idempotency.close()
 
     app = FastAPI(lifespan=lifespan)
     
@@ -112,28 +172,50 @@ def run_fastapi(
             AgencyRequest = add_agent_validator(VerboseRequest, AGENT_INSTANCES)
             AgencyRequestStreaming = add_agent_validator(BaseRequest, AGENT_INSTANCES)
 
+            # Both endpoints of an agency share the same admission queue
+            admission = AdmissionController(
+                max_queue_size=max_queue_size,
+                priority_classes=priority_classes,
+                queue_timeout=queue_timeout,
+                name=agency_name,
+            )
+
             app.add_api_route(
                 f"/{agency_name}/get_completion",
-                make_completion_endpoint(AgencyRequest, agency, verify_token),
+                make_completion_endpoint(AgencyRequest, agency, verify_token, admission, idempotency),
                 methods=["POST"],
             )
             app.add_api_route(
                 f"/{agency_name}/get_completion_stream",
-                make_stream_endpoint(AgencyRequestStreaming, agency, verify_token),
+                make_stream_endpoint(AgencyRequestStreaming, agency, verify_token, admission, idempotency),
                 methods=["POST"],
             )
+            app.add_api_websocket_route(
+                f"/{agency_name}/ws",
+                make_websocket_endpoint(AgencyRequestStreaming, agency, verify_websocket_token, admission),
+            )
             endpoints.append(f"/{agency_name}/get_completion")
             endpoints.append(f"/{agency_name}/get_completion_stream")
+            endpoints.append(f"/{agency_name}/ws")
 
     if tools:
         for tool in tools:
             tool_name = tool.__name__
-            tool_handler = make_tool_endpoint(tool, verify_token)
+            tool_handler = make_tool_endpoint(tool, verify_token, executor)
             app.add_api_route(
                 f"/tool/{tool_name}", tool_handler, methods=["POST"], name=tool_name
             )
             endpoints.append(f"/tool/{tool_name}")
 
+    if enable_metrics:
+        from agency_swarm.util.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+
+        async def metrics_handler(token: str = Depends(verify_token)):
+            return PlainTextResponse(get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+        app.add_api_route("/metrics", metrics_handler, methods=["GET"])
+        endpoints.append("/metrics")
+
     app.add_exception_handler(Exception, exception_handler)
 
     print("Created endpoints:\n" + "\n".join(endpoints))
@@ -0,0 +1,211 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional
+
+from agency_swarm.util import metrics
+
+_QUEUE_WAIT = metrics.histogram(
+    "agency_swarm_queue_wait_seconds",
+    "Time completion requests spent in the admission queue.",
+    ["agency", "priority"],
+)
+_REJECTED = metrics.counter(
+    "agency_swarm_admission_rejected_total",
+    "Number of completion requests rejected by admission control.",
+    ["agency", "priority"],
+)
+_IN_FLIGHT = metrics.gauge(
+    "agency_swarm_admission_in_flight",
+    "Number of conversations currently running per agency.",
+    ["agency"],
+)
+_QUEUED = metrics.gauge(
+    "agency_swarm_admission_queued",
+    "Number of completion requests waiting in the admission queue.",
+    ["agency", "priority"],
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted to an agency."""
+
+    def __init__(self, message: str, queue_position: Optional[int] = None, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.queue_position = queue_position
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded, priority-ordered admission in front of a single agency.
+
+    At most `max_in_flight` conversations run at once. Requests above that limit wait in a queue
+    ordered by priority class (first class in `priority_classes` is served first) and arrival time.
+    Each priority class has its own queue bound, so a flood of batch requests can't reject
+    interactive ones. Requests that don't fit are rejected immediately.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 1,
+        max_queue_size: int = 100,
+        priority_classes: Optional[List[str]] = None,
+        queue_timeout: Optional[float] = None,
+        name: str = "default",
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative.")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.priority_classes = list(priority_classes or ["interactive", "batch"])
+        self.queue_timeout = queue_timeout
+        self.name = name
+
+        self._ranks = {name: rank for rank, name in enumerate(self.priority_classes)}
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._queued: Dict[str, int] = {name: 0 for name in self.priority_classes}
+        self._counter = itertools.count()
+
+        # Stats
+        self._admitted = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._avg_run_time: Optional[float] = None
+
+    @property
+    def default_priority(self) -> str:
+        return self.priority_classes[0]
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(self._queued.values())
+
+    def validate_priority(self, priority: Optional[str]) -> str:
+        if priority is None or priority == "":
+            return self.default_priority
+        if priority not in self._ranks:
+            raise ValueError(f"Invalid priority class '{priority}'. Available classes: {self.priority_classes}")
+        return priority
+
+    async def acquire(self, priority: Optional[str] = None) -> float:
+        """
+        Wait for a free slot. Returns the time spent in the queue in seconds.
+
+        Raises:
+            AdmissionRejected: If the queue for the priority class is full or the queue timeout expires.
+        """
+        priority = self.validate_priority(priority)
+        start = time.monotonic()
+
+        if self._in_flight < self.max_in_flight and self.queued == 0:
+            self._in_flight += 1
+            self._record_admission(priority, 0.0)
+            return 0.0
+
+        if self._queued[priority] >= self.max_queue_size:
+            self._record_rejection(priority)
+            raise AdmissionRejected(
+                f"Too many queued requests for priority class '{priority}'. Please retry later.",
+                queue_position=self.queued,
+                retry_after=self._estimate_retry_after(self.queued),
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (self._ranks[priority], next(self._counter), future)
+        heapq.heappush(self._waiters, entry)
+        self._queued[priority] += 1
+        _QUEUED.inc(agency=self.name, priority=priority)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._queued[priority] -= 1
+            _QUEUED.dec(agency=self.name, priority=priority)
+            if future.done():
+                # The slot was handed over just before the cancellation, pass it on
+                self.release()
+            else:
+                future.cancel()
+            raise
+        except asyncio.TimeoutError:
+            if not future.done():
+                position = self._position_of(entry)
+                future.cancel()
+                self._queued[priority] -= 1
+                _QUEUED.dec(agency=self.name, priority=priority)
+                self._record_rejection(priority)
+                raise AdmissionRejected(
+                    f"Request waited more than {self.queue_timeout}s in the queue. Please retry later.",
+                    queue_position=position,
+                    retry_after=self._estimate_retry_after(position),
+                )
+
+        self._queued[priority] -= 1
+        _QUEUED.dec(agency=self.name, priority=priority)
+        waited = time.monotonic() - start
+        self._record_admission(priority, waited)
+        return waited
+
+    def release(self, run_time: Optional[float] = None) -> None:
+        """Free a slot and hand it to the highest priority waiter, if any."""
+        if run_time is not None:
+            if self._avg_run_time is None:
+                self._avg_run_time = run_time
+            else:
+                self._avg_run_time = 0.8 * self._avg_run_time + 0.2 * run_time
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Slot is transferred to the waiter, so in-flight count stays the same
+                future.set_result(None)
+                return
+        self._in_flight = max(0, self._in_flight - 1)
+        _IN_FLIGHT.set(self._in_flight, agency=self.name)
+
+    def queue_position(self, priority: Optional[str] = None) -> int:
+        """Position a new request of the given priority class would get in the queue."""
+        rank = self._ranks[self.validate_priority(priority)]
+        return sum(1 for r, _, f in self._waiters if r <= rank and not f.done())
+
+    def stats(self) -> dict:
+        admitted = self._admitted
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": dict(self._queued),
+            "admitted": admitted,
+            "rejected": self._rejected,
+            "queue_wait_avg": self._queue_wait_total / admitted if admitted else 0.0,
+            "queue_wait_max": self._queue_wait_max,
+        }
+
+    def _record_admission(self, priority: str, waited: float) -> None:
+        self._admitted += 1
+        self._queue_wait_total += waited
+        self._queue_wait_max = max(self._queue_wait_max, waited)
+        _QUEUE_WAIT.observe(waited, agency=self.name, priority=priority)
+        _IN_FLIGHT.set(self._in_flight, agency=self.name)
+
+    def _record_rejection(self, priority: str) -> None:
+        self._rejected += 1
+        _REJECTED.inc(agency=self.name, priority=priority)
+
+    def _position_of(self, entry) -> int:
+        return 1 + sum(1 for e in self._waiters if not e[2].done() and e[:2] < entry[:2])
+
+    def _estimate_retry_after(self, queued: int) -> int:
+        avg = self._avg_run_time or 1.0
+        return max(1, math.ceil(avg * (queued + 1) / self.max_in_flight))
@@ -1,10 +1,11 @@
 import asyncio
-import inspect
 import json
 import os
 import threading
+import time
+import weakref
 from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import anyio
 from anyio import (
@@ -12,13 +13,20 @@ from anyio import (
     create_memory_object_stream,
     fail_after,
 )
-from fastapi import Depends, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Depends, Header, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from openai.types.beta import AssistantStreamEvent
 
+from agency_swarm.tools import ToolExecutor
+from agency_swarm.util import metrics
+from agency_swarm.util.errors import ToolQueueFullError, ToolTimeoutError
 from agency_swarm.util.streaming import AgencyEventHandler
 
+from .admission import AdmissionController, AdmissionRejected
+from .idempotency import IdempotencyConflict, StreamRecording, fingerprint
+
 try:
     from typing import override  # py >= 3.12
 except ImportError:  # pragma: no cover – fallback path
@@ -27,7 +35,38 @@ except ImportError:  # pragma: no cover – fallback path
 _n_cpus = os.cpu_count() or 1
 _MAX_WORKERS = max(1, int(os.getenv("STREAM_THREAD_POOL_SIZE", _n_cpus * 4)))
 _EXECUTOR: Optional[ThreadPoolExecutor] = None
-_COMPLETION_LOCK = threading.Lock()  # Global lock for sequential completion processing
+_AGENCY_LOCKS = weakref.WeakKeyDictionary()  # agency -> lock serializing its runs
+_AGENCY_LOCKS_GUARD = threading.Lock()
+
+_REQUESTS = metrics.counter(
+    "agency_swarm_http_requests_total",
+    "Number of handled requests per endpoint.",
+    ["endpoint", "name", "status"],
+)
+_REQUEST_DURATION = metrics.histogram(
+    "agency_swarm_http_request_duration_seconds",
+    "Time spent handling requests, excluding the admission queue. Streams are measured until the run ends.",
+    ["endpoint", "name"],
+)
+_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "agency_swarm_http_requests_in_flight",
+    "Number of requests currently being handled per endpoint.",
+    ["endpoint", "name"],
+)
+_STREAM_EVENTS = metrics.counter(
+    "agency_swarm_stream_events_total",
+    "Number of server-sent events emitted by streaming endpoints.",
+    ["name"],
+)
+_EXECUTOR_PENDING = metrics.gauge(
+    "agency_swarm_executor_pending_tasks",
+    "Number of tasks submitted to the thread pool executor that haven't finished yet.",
+)
+_EXECUTOR_WORKERS = metrics.gauge(
+    "agency_swarm_executor_max_workers",
+    "Size of the thread pool executor.",
+)
+_EXECUTOR_WORKERS.set(_MAX_WORKERS)
 
 def get_executor() -> ThreadPoolExecutor:
     """Get the thread pool executor, ensuring it has been initialized."""
@@ -38,6 +77,44 @@ def get_executor() -> ThreadPoolExecutor:
         _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
     return _EXECUTOR
 
+def submit_to_executor(fn, *args) -> Future:
+    """Submit a function to the shared thread pool executor and track the number of pending tasks."""
+    future = get_executor().submit(fn, *args)
+    _EXECUTOR_PENDING.inc()
+    future.add_done_callback(lambda _: _EXECUTOR_PENDING.dec())
+    return future
+
+class _RequestMetrics:
+    """Tracks in-flight count, duration and status of a single request."""
+
+    def __init__(self, endpoint: str, name: str):
+        self.labels = {"endpoint": endpoint, "name": name}
+        self.start = time.perf_counter()
+        _REQUESTS_IN_FLIGHT.inc(**self.labels)
+
+    def finish(self, status: str) -> None:
+        _REQUESTS_IN_FLIGHT.dec(**self.labels)
+        _REQUEST_DURATION.observe(time.perf_counter() - self.start, **self.labels)
+        _REQUESTS.inc(status=status, **self.labels)
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """StreamingResponse calling `on_close` when it ends, even if the client left before the body was iterated."""
+
+    def __init__(self, *args, on_close: Callable[[], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
+
+def _agency_label(current_agency, admission: Optional[AdmissionController]) -> str:
+    if admission is not None:
+        return admission.name
+    return (getattr(current_agency, "name", None) or "agency").replace(" ", "_")
+
 def get_verify_token(app_token):
     auto_error = app_token is not None and app_token != ""
     security = HTTPBearer(auto_error=auto_error)
@@ -49,12 +126,46 @@ def get_verify_token(app_token):
         return credentials.credentials
     return verify_token
 
+def _admission_error_response(exc: AdmissionRejected) -> JSONResponse:
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=429,
+        content={"error": exc.message, "queue_position": exc.queue_position},
+        headers=headers,
+    )
+
+async def _admit(admission: Optional[AdmissionController], priority: Optional[str]):
+    """Acquire an admission slot. Returns (queue_wait, error_response)."""
+    if admission is None:
+        return 0.0, None
+    try:
+        return await admission.acquire(priority), None
+    except ValueError as e:
+        return 0.0, JSONResponse(status_code=400, content={"error": str(e)})
+    except AdmissionRejected as e:
+        return 0.0, _admission_error_response(e)
+
+def _agency_lock(agency) -> threading.Lock:
+    """
+    Lock serializing the runs of one agency. Runs share the agency's threads, so they can't overlap,
+    but runs of different agencies don't wait for each other.
+    """
+    with _AGENCY_LOCKS_GUARD:
+        lock = _AGENCY_LOCKS.get(agency)
+        if lock is None:
+            lock = _AGENCY_LOCKS[agency] = threading.Lock()
+        return lock
+
+def _idempotency_scope(raw_request: Request, idempotency_key: str) -> str:
+    return f"{raw_request.url.path}:{idempotency_key}"
+
+def _idempotency_conflict_response(exc: IdempotencyConflict) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"error": str(exc)})
+
 # Non‑streaming completion endpoint
-def make_completion_endpoint(request_model, current_agency, verify_token):
-    def handler(request: request_model, token: str = Depends(verify_token)):
-        # Use lock to ensure sequential processing
-        with _COMPLETION_LOCK:
-            # Run completion sequentially instead of in a separate thread
+def make_completion_endpoint(request_model, current_agency, verify_token, admission=None, idempotency=None):
+    def run_completion(request):
+        with _agency_lock(current_agency):
             if request.threads:
                 current_thread = get_threads(current_agency)
                 if current_thread != request.threads:
@@ -73,13 +184,117 @@ def make_completion_endpoint(request_model, current_agency, verify_token):
             
             return {"response": response, "threads": get_threads(current_agency)}
 
+    agency_label = _agency_label(current_agency, admission)
+
+    async def execute(request, x_priority):
+        queue_wait, error_response = await _admit(admission, x_priority)
+        if error_response is not None:
+            _REQUESTS.inc(endpoint="get_completion", name=agency_label, status=str(error_response.status_code))
+            return error_response
+
+        start = time.monotonic()
+        request_metrics = _RequestMetrics("get_completion", agency_label)
+        status = "500"
+        try:
+            result = await asyncio.wrap_future(submit_to_executor(run_completion, request))
+            status = "200"
+        finally:
+            request_metrics.finish(status)
+            if admission is not None:
+                admission.release(time.monotonic() - start)
+
+        return {"content": jsonable_encoder(result), "queue_wait": queue_wait}
+
+    async def handler(
+        request: request_model,
+        raw_request: Request,
+        token: str = Depends(verify_token),
+        x_priority: Optional[str] = Header(None),
+        idempotency_key: Optional[str] = Header(None),
+    ):
+        replayed = False
+        if idempotency is not None and idempotency_key:
+            try:
+                result, replayed = await idempotency.run(
+                    _idempotency_scope(raw_request, idempotency_key),
+                    fingerprint(await raw_request.body()),
+                    lambda: execute(request, x_priority),
+                    cacheable=lambda r: not isinstance(r, Response),
+                )
+            except IdempotencyConflict as e:
+                return _idempotency_conflict_response(e)
+        else:
+            result = await execute(request, x_priority)
+
+        if isinstance(result, Response):
+            return result
+        headers = {"X-Queue-Wait": f"{result['queue_wait']:.3f}"}
+        if replayed:
+            headers["Idempotent-Replayed"] = "true"
+        return JSONResponse(content=result["content"], headers=headers)
+
     return handler
 
 # Streaming SSE endpoint
-def make_stream_endpoint(request_model, current_agency, verify_token):
+def make_stream_endpoint(request_model, current_agency, verify_token, admission=None, idempotency=None):
     """FastAPI SSE endpoint factory using AnyIO (handles back‑pressure)."""
+    agency_label = _agency_label(current_agency, admission)
+
+    sse_headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",
+    }
+
+    async def replay(events):
+        for data in events:
+            yield data
+
+    async def handler(
+        request: request_model,
+        raw_request: Request,
+        token: str = Depends(verify_token),
+        x_priority: Optional[str] = Header(None),
+        idempotency_key: Optional[str] = Header(None),
+    ):
+        recording = None
+        if idempotency is not None and idempotency_key:
+            key = _idempotency_scope(raw_request, idempotency_key)
+            try:
+                request_fingerprint = fingerprint(await raw_request.body())
+                events = idempotency.lookup(key, request_fingerprint)
+                in_flight = idempotency.get_in_flight(key, request_fingerprint) if events is None else None
+            except IdempotencyConflict as e:
+                return _idempotency_conflict_response(e)
+            if events is not None or in_flight is not None:
+                # Completed streams are replayed, in-flight ones are followed from the first event
+                generator = replay(events) if events is not None else in_flight.follow()
+                return StreamingResponse(
+                    generator,
+                    media_type="text/event-stream",
+                    headers={**sse_headers, "Idempotent-Replayed": "true"},
+                )
+            recording = StreamRecording()
+            idempotency.start(key, request_fingerprint, recording)
+
+        def finish_recording(completed: bool = False) -> None:
+            """Release the idempotency key, once. Only successfully completed streams are replayed to duplicates."""
+            nonlocal recording
+            if recording is not None:
+                recording.close()
+                idempotency.finish(key, recording.events, store=completed)
+                recording = None
+
+        try:
+            queue_wait, error_response = await _admit(admission, x_priority)
+        except BaseException:
+            finish_recording()
+            raise
+        if error_response is not None:
+            finish_recording()
+            _REQUESTS.inc(endpoint="get_completion_stream", name=agency_label, status=str(error_response.status_code))
+            return error_response
 
-    async def handler(request: request_model, token: str = Depends(verify_token)):
         # Async queue bridging producer thread → event‑loop
         send_ch, recv_ch = create_memory_object_stream(256)
 
@@ -108,8 +323,7 @@ def make_stream_endpoint(request_model, current_agency, verify_token):
 
         def run_completion() -> None:
             try:
-                # Use lock to ensure sequential processing for streaming
-                with _COMPLETION_LOCK:
+                with _agency_lock(current_agency):
                     if request.threads:
                         current_thread = get_threads(current_agency)
                         if current_thread != request.threads:
@@ -128,10 +342,29 @@ def make_stream_endpoint(request_model, current_agency, verify_token):
                 _threadsafe_send({"error": str(exc)})
                 raise
 
-        worker: Future = get_executor().submit(run_completion)
+        start = time.monotonic()
+        request_metrics = _RequestMetrics("get_completion_stream", agency_label)
+        try:
+            worker: Future = submit_to_executor(run_completion)
+        except BaseException:
+            request_metrics.finish("500")
+            finish_recording()
+            if admission is not None:
+                admission.release()
+            raise
+
+        def _on_worker_done(future: Future) -> None:
+            failed = future.cancelled() or future.exception() is not None
+            request_metrics.finish("500" if failed else "200")
+            if admission is not None:
+                # The slot is held until the producer thread finishes, even if the client disconnects
+                loop.call_soon_threadsafe(admission.release, time.monotonic() - start)
+
+        worker.add_done_callback(_on_worker_done)
 
         # ---------- Async generator consumed by StreamingResponse ----------
         async def generate_response():
+            completed = False
             try:
                 while True:
                     try:
@@ -144,42 +377,65 @@ def make_stream_endpoint(request_model, current_agency, verify_token):
                         break
 
                     if event == "[DONE]":
+                        completed = True
                         break
                     if isinstance(event, dict) and "error" in event:
                         yield "data: " + json.dumps(event) + "\n\n"
                         break
 
-                    yield "data: " + json.dumps(event) + "\n\n"
+                    _STREAM_EVENTS.inc(name=agency_label)
+                    data = "data: " + json.dumps(event) + "\n\n"
+                    if recording is not None:
+                        recording.append(data)
+                    yield data
             except anyio.get_cancelled_exc_class():
                 worker.cancel()  # cannot forcibly kill, but we stop reading
                 raise
             finally:
                 send_ch.close()  # unblock producer if still running
+                finish_recording(completed)
 
-        return StreamingResponse(
+        def close_stream() -> None:
+            # The generator doesn't run at all if the client disconnects before the body is sent
+            send_ch.close()
+            finish_recording()
+
+        return _ClosingStreamingResponse(
             generate_response(),
             media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            },
+            headers={**sse_headers, "X-Queue-Wait": f"{queue_wait:.3f}"},
+            on_close=close_stream,
         )
 
     return handler
 
 # Tool endpoint
-def make_tool_endpoint(tool, verify_token):
+def make_tool_endpoint(tool, verify_token, tool_executor: Optional[ToolExecutor] = None):
+    """
+    Sync tools are offloaded to the tool executor, so a slow tool doesn't block the event loop.
+    Tool calls exceeding their timeout get a 504 response, calls rejected because the tool's queue is full a 429.
+    """
+    tool_name = tool.__name__ if isinstance(tool, type) else type(tool).__name__
+    if tool_executor is None:
+        tool_executor = ToolExecutor()
+
     async def handler(request: Request, token: str = Depends(verify_token)):
+        request_metrics = _RequestMetrics("tool", tool_name)
         try:
             data = await request.json()
             tool_instance = tool(**data) if isinstance(tool, type) else tool
-            if inspect.iscoroutinefunction(tool_instance.run):
-                result = await tool_instance.run()
-            else:
-                result = tool_instance.run()
+            client = request.client.host if request.client else None
+            result = await tool_executor.run(tool_instance, client=client)
+            request_metrics.finish("200")
             return {"response": result}
+        except ToolQueueFullError as e:
+            request_metrics.finish("429")
+            return JSONResponse(status_code=429, content={"Error": str(e)})
+        except ToolTimeoutError as e:
+            request_metrics.finish("504")
+            return JSONResponse(status_code=504, content={"Error": str(e)})
         except Exception as e:
+            request_metrics.finish("500")
             return JSONResponse(status_code=500, content={"Error": str(e)})
     return handler
 
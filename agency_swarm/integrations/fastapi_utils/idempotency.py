@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class IdempotencyConflict(Exception):
+    """Raised when an idempotency key is reused with a different request body."""
+
+
+def fingerprint(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class StreamRecording:
+    """Events of an in-flight stream, so duplicate requests can follow it from the start."""
+
+    def __init__(self):
+        self.events: List[str] = []
+        self.done = False
+        self._changed = asyncio.Event()
+
+    def append(self, data: str) -> None:
+        self.events.append(data)
+        self._notify()
+
+    def close(self) -> None:
+        self.done = True
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self):
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+
+class IdempotencyStore:
+    """
+    Response cache for requests carrying an `Idempotency-Key` header.
+
+    Completed responses are kept in an in-memory LRU and, if `db_path` is provided, in a SQLite
+    database that survives restarts. Requests with a key that is still being processed attach to
+    the in-flight execution instead of starting a new one.
+
+    Parameters:
+        max_entries: Maximum number of responses kept in memory.
+        ttl: Number of seconds a response is kept.
+        db_path: Optional path of the SQLite database used as a second tier.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 24 * 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Tuple[str, Any]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS idempotency "
+                    "(key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, created REAL NOT NULL, value TEXT NOT NULL)"
+                )
+
+    def lookup(self, key: str, request_fingerprint: str) -> Optional[Any]:
+        """
+        Return the stored response for the key, or None.
+
+        Raises:
+            IdempotencyConflict: If the key was used with a different request body.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT fingerprint, created, value FROM idempotency WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                entry = (row[0], row[1], json.loads(row[2]))
+                self._remember(key, entry)
+
+        if entry is None:
+            return None
+        stored_fingerprint, created, value = entry
+        if time.time() - created > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        if stored_fingerprint != request_fingerprint:
+            raise IdempotencyConflict("Idempotency key was already used with a different request body.")
+        return value
+
+    def get_in_flight(self, key: str, request_fingerprint: str) -> Optional[Any]:
+        """Return the handle of the in-flight execution for the key, or None."""
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            return None
+        if in_flight[0] != request_fingerprint:
+            raise IdempotencyConflict("Idempotency key is already used by a request with a different body.")
+        return in_flight[1]
+
+    def start(self, key: str, request_fingerprint: str, handle: Any) -> None:
+        self._in_flight[key] = (request_fingerprint, handle)
+
+    def finish(self, key: str, value: Any = None, store: bool = True) -> None:
+        in_flight = self._in_flight.pop(key, None)
+        if in_flight is None or not store:
+            return
+        entry = (in_flight[0], time.time(), value)
+        self._remember(key, entry)
+        if self._db is not None:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO idempotency (key, fingerprint, created, value) VALUES (?, ?, ?, ?)",
+                    (key, entry[0], entry[1], json.dumps(value)),
+                )
+                self._db.execute("DELETE FROM idempotency WHERE created < ?", (time.time() - self.ttl,))
+
+    async def run(
+        self,
+        key: str,
+        request_fingerprint: str,
+        fn: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Execute `fn` once per key. Returns (result, replayed).
+
+        The execution runs in its own task, so it completes and gets stored even if the
+        original client disconnects. Results rejected by `cacheable` are shared with concurrent
+        duplicates but not stored.
+        """
+        value = self.lookup(key, request_fingerprint)
+        if value is not None:
+            return value, True
+
+        task = self.get_in_flight(key, request_fingerprint)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        async def execute():
+            store = False
+            result = None
+            try:
+                result = await fn()
+                store = cacheable is None or cacheable(result)
+                return result
+            finally:
+                self.finish(key, result, store=store)
+
+        task = asyncio.ensure_future(execute())
+        # Retrieve the exception even if every waiting client disconnected
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.start(key, request_fingerprint, task)
+        return await asyncio.shield(task), False
+
+    def _remember(self, key: str, entry: Tuple[str, float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
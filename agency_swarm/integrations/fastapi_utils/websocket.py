@@ -0,0 +1,291 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from openai.types.beta import AssistantStreamEvent
+from pydantic import ValidationError
+
+from agency_swarm.util.streaming import AgencyEventHandler
+
+from .admission import AdmissionController, AdmissionRejected
+from .endpoint_handlers import (
+    _STREAM_EVENTS,
+    _agency_label,
+    _agency_lock,
+    _RequestMetrics,
+    get_threads,
+    override_threads,
+    submit_to_executor,
+)
+
+try:
+    from typing import override  # py >= 3.12
+except ImportError:  # pragma: no cover – fallback path
+    from typing_extensions import override  # type: ignore
+
+_FINAL_TYPES = ("done", "error", "cancelled")
+
+
+class TurnCancelled(Exception):
+    """Raised inside the producer thread to stop a cancelled turn."""
+
+
+class _Connection:
+    """Serializes sends of concurrent turns over one socket."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.closed = False
+        self._lock = asyncio.Lock()
+
+    async def send(self, message: dict) -> bool:
+        if self.closed:
+            return False
+        try:
+            async with self._lock:
+                await self.websocket.send_json(message)
+            return True
+        except Exception:
+            self.closed = True
+            return False
+
+
+class _Turn:
+    """
+    A single user turn. All messages of the turn are kept, so a client can resume it
+    from any sequence number, on the same or on a new connection.
+    """
+
+    def __init__(self, turn_id: str):
+        self.id = turn_id
+        self.messages: List[dict] = []
+        self.done = False
+        self.cancelled = False
+        self.task: Optional[asyncio.Task] = None
+        self.started = False
+        self._subscribers: List[_Connection] = []
+        self._lock = asyncio.Lock()
+
+    async def publish(self, message: dict) -> None:
+        async with self._lock:
+            if self.done:
+                return
+            message = {**message, "id": self.id, "seq": len(self.messages)}
+            self.messages.append(message)
+            self.done = message["type"] in _FINAL_TYPES
+            # Awaiting each send applies the socket's backpressure to the producer
+            for connection in list(self._subscribers):
+                if not await connection.send(message):
+                    self._subscribers.remove(connection)
+            if self.done:
+                self._subscribers.clear()
+
+    async def attach(self, connection: _Connection, after: int = -1) -> None:
+        async with self._lock:
+            for message in self.messages[after + 1 :]:
+                if not await connection.send(message):
+                    return
+            if not self.done:
+                self._subscribers.append(connection)
+
+
+class TurnRegistry:
+    """Turns of an agency, shared by all connections. Only the latest finished turns are kept."""
+
+    def __init__(self, max_finished: int = 100):
+        self.max_finished = max_finished
+        self._turns: "OrderedDict[str, _Turn]" = OrderedDict()
+
+    def get(self, turn_id: str) -> Optional[_Turn]:
+        return self._turns.get(turn_id)
+
+    def create(self, turn_id: str) -> _Turn:
+        existing = self._turns.get(turn_id)
+        if existing is not None and not existing.done:
+            raise ValueError(f"Turn '{turn_id}' is already running.")
+        turn = self._turns[turn_id] = _Turn(turn_id)
+        self._turns.move_to_end(turn_id)
+        self._prune()
+        return turn
+
+    def _prune(self) -> None:
+        finished = [turn_id for turn_id, turn in self._turns.items() if turn.done]
+        for turn_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._turns[turn_id]
+
+
+def get_websocket_verify_token(app_token):
+    """Websocket clients may send the token as a bearer header or as the `token` query parameter."""
+
+    def verify_token(websocket: WebSocket) -> bool:
+        if app_token is None or app_token == "":
+            return True
+        authorization = websocket.headers.get("authorization", "")
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer" and credentials == app_token:
+            return True
+        return websocket.query_params.get("token") == app_token
+
+    return verify_token
+
+
+# Websocket endpoint
+def make_websocket_endpoint(
+    request_model,
+    current_agency,
+    verify_token,
+    admission: Optional[AdmissionController] = None,
+    registry: Optional[TurnRegistry] = None,
+):
+    """
+    Multiplexes turns over one connection. Client messages:
+    - {"type": "message", "id": ..., "message": ..., "priority": ...}: starts a turn. Accepts the same
+      fields as the streaming endpoint.
+    - {"type": "cancel", "id": ...}: stops the turn at its next event.
+    - {"type": "resume", "id": ..., "after": seq}: replays messages of a turn after `seq` and follows it.
+
+    The server replies with "event", "done", "error" and "cancelled" messages, tagged with the turn
+    id and a sequence number.
+    """
+    agency_label = _agency_label(current_agency, admission)
+    registry = registry or TurnRegistry()
+
+    def run_turn(turn: _Turn, request, loop: asyncio.AbstractEventLoop) -> None:
+        def publish(message: dict) -> None:
+            try:
+                asyncio.run_coroutine_threadsafe(turn.publish(message), loop).result()
+            except RuntimeError:
+                # Event‑loop is closed (shutdown). Drop the message.
+                pass
+
+        class WebSocketEventHandler(AgencyEventHandler):
+            @override
+            def on_event(self, event: AssistantStreamEvent) -> None:
+                if turn.cancelled:
+                    raise TurnCancelled()
+                _STREAM_EVENTS.inc(name=agency_label)
+                publish({"type": "event", "data": event.model_dump()})
+
+        try:
+            with _agency_lock(current_agency):
+                if turn.cancelled:
+                    raise TurnCancelled()
+                if request.threads:
+                    current_thread = get_threads(current_agency)
+                    if current_thread != request.threads:
+                        override_threads(current_agency, request.threads)
+                response = current_agency.get_completion_stream(
+                    request.message,
+                    message_files=request.message_files,
+                    recipient_agent=request.recipient_agent,
+                    additional_instructions=request.additional_instructions,
+                    attachments=request.attachments,
+                    tool_choice=request.tool_choice,
+                    response_format=request.response_format,
+                    event_handler=WebSocketEventHandler,
+                )
+                threads = get_threads(current_agency)
+            publish({"type": "done", "response": response, "threads": threads})
+        except TurnCancelled:
+            publish({"type": "cancelled"})
+        except Exception as e:
+            if turn.cancelled:
+                publish({"type": "cancelled"})
+            else:
+                publish({"type": "error", "error": str(e)})
+
+    async def drive_turn(turn: _Turn, request, priority: Optional[str]) -> None:
+        try:
+            if admission is not None:
+                await admission.acquire(priority)
+        except (ValueError, AdmissionRejected) as e:
+            message = e.message if isinstance(e, AdmissionRejected) else str(e)
+            await turn.publish({"type": "error", "error": message})
+            return
+        except asyncio.CancelledError:
+            await turn.publish({"type": "cancelled"})
+            return
+
+        turn.started = True
+        start = time.monotonic()
+        request_metrics = _RequestMetrics("ws", agency_label)
+        try:
+            worker = submit_to_executor(run_turn, turn, request, asyncio.get_running_loop())
+            # The worker can't be interrupted, so it is awaited even if this task gets cancelled
+            await asyncio.shield(asyncio.wrap_future(worker))
+        finally:
+            request_metrics.finish("499" if turn.cancelled else "200")
+            if admission is not None:
+                admission.release(time.monotonic() - start)
+
+    async def start_turn(connection: _Connection, turn_id: str, payload: dict) -> None:
+        priority = payload.get("priority")
+        fields = {k: v for k, v in payload.items() if k not in ("type", "id", "priority")}
+        try:
+            request = request_model(**fields)
+            turn = registry.create(turn_id)
+        except (ValidationError, ValueError) as e:
+            await connection.send({"type": "error", "id": turn_id, "error": str(e)})
+            return
+        await turn.attach(connection)
+        turn.task = asyncio.create_task(drive_turn(turn, request, priority))
+
+    async def handler(websocket: WebSocket):
+        if not verify_token(websocket):
+            await websocket.close(code=1008)
+            return
+        await websocket.accept()
+        connection = _Connection(websocket)
+        background: Dict[int, asyncio.Task] = {}
+
+        try:
+            while True:
+                try:
+                    payload = json.loads(await websocket.receive_text())
+                    if not isinstance(payload, dict):
+                        raise ValueError("Message must be a JSON object.")
+                except ValueError as e:
+                    await connection.send({"type": "error", "id": None, "error": f"Invalid message: {e}"})
+                    continue
+
+                message_type = payload.get("type")
+                turn_id = payload.get("id")
+                if not turn_id:
+                    await connection.send({"type": "error", "id": None, "error": "Missing turn id."})
+                    continue
+
+                if message_type == "message":
+                    await start_turn(connection, str(turn_id), payload)
+                    continue
+
+                turn = registry.get(str(turn_id))
+                if turn is None:
+                    await connection.send({"type": "error", "id": turn_id, "error": f"Unknown turn '{turn_id}'."})
+                elif message_type == "cancel":
+                    turn.cancelled = True
+                    if not turn.started and turn.task is not None:
+                        turn.task.cancel()
+                elif message_type == "resume":
+                    try:
+                        after = int(payload.get("after", -1))
+                    except (TypeError, ValueError):
+                        await connection.send({"type": "error", "id": turn_id, "error": "'after' must be an integer."})
+                        continue
+                    # Replaying a long turn shouldn't block reading other messages
+                    task = asyncio.create_task(turn.attach(connection, after))
+                    background[id(task)] = task
+                    task.add_done_callback(lambda t: background.pop(id(t), None))
+                else:
+                    await connection.send(
+                        {"type": "error", "id": turn_id, "error": f"Unknown message type '{message_type}'."}
+                    )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # Turns keep running after a disconnect, so they can be resumed from another connection
+            connection.closed = True
+
+    return handler
@@ -1,67 +1,216 @@
 import asyncio
 import contextlib
+import hashlib
 import importlib
 import inspect
+import json
 import logging
 import os
 import sys
+import time
+import weakref
 from collections.abc import AsyncIterator
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 import mcp.types as types
 import uvicorn
 from dotenv import load_dotenv
-from mcp.server.lowlevel import Server
+from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-from starlette.routing import Mount
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 
 from agency_swarm import BaseTool
+from agency_swarm.tools import ToolExecutor
+from agency_swarm.util import metrics
+from agency_swarm.util.errors import ToolQueueFullError
 
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_TOOL_CALLS = metrics.counter(
+    "agency_swarm_mcp_tool_calls_total",
+    "Number of tool calls handled by the MCP server.",
+    ["tool", "status"],
+)
+_TOOL_CALL_DURATION = metrics.histogram(
+    "agency_swarm_mcp_tool_call_duration_seconds",
+    "Time spent executing tool calls in the MCP server.",
+    ["tool"],
+)
+_TOOL_CALLS_IN_FLIGHT = metrics.gauge(
+    "agency_swarm_mcp_tool_calls_in_flight",
+    "Number of tool calls currently executed by the MCP server.",
+    ["tool"],
+)
+
+
+def _load_tools_from_module(module_path: str) -> List[type[BaseTool]]:
+    """Import a module and return the BaseTool classes found in it."""
+    module_name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    if not spec or not spec.loader:
+        return []
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Find BaseTool subclasses in the module
+    return [
+        item
+        for _, item in inspect.getmembers(module)
+        if inspect.isclass(item) and issubclass(item, BaseTool) and item != BaseTool
+    ]
+
+
+class _ToolsDirectory:
+    """
+    Tool modules of a directory. The mtime and content hash of each module are kept, so a rescan only
+    re-imports modules whose content changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # module path -> (mtime, content hash, names of the tools of the module)
+        self._modules: Dict[str, Tuple[float, str, List[str]]] = {}
+
+        # Add tools directory to Python path if it's not already there
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    def _module_paths(self) -> List[str]:
+        return [
+            os.path.join(root, file)
+            for root, _, files in os.walk(self.path)
+            for file in files
+            if file.endswith(".py") and not file.startswith("__")
+        ]
+
+    def scan(self) -> Tuple[List[type[BaseTool]], List[str]]:
+        """
+        Import new and changed modules.
+
+        Returns:
+            The tools of the new and changed modules, and the names of the tools that were removed,
+            because their module was deleted or no longer defines them.
+        """
+        tools: List[type[BaseTool]] = []
+        removed: List[str] = []
+        module_paths = self._module_paths()
+
+        for module_path in module_paths:
+            try:
+                mtime = os.path.getmtime(module_path)
+                previous = self._modules.get(module_path)
+                if previous and previous[0] == mtime:
+                    continue
+                with open(module_path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                continue  # deleted while scanning
+            old_names = previous[2] if previous else []
+            if previous and previous[1] == digest:
+                self._modules[module_path] = (mtime, digest, old_names)
+                continue
+
+            try:
+                module_tools = _load_tools_from_module(module_path)
+            except Exception as e:
+                logger.error(f"Could not load module {os.path.basename(module_path)}: {e}")
+                # Keep the tools of the last working version until the module changes again
+                self._modules[module_path] = (mtime, digest, old_names)
+                continue
+            self._modules[module_path] = (mtime, digest, [tool.__name__ for tool in module_tools])
+            tools.extend(module_tools)
+            new_names = {tool.__name__ for tool in module_tools}
+            removed.extend(name for name in old_names if name not in new_names)
+
+        for module_path in set(self._modules) - set(module_paths):
+            removed.extend(self._modules.pop(module_path)[2])
+
+        return tools, removed
+
 
 def _load_tools_from_directory(tools_dir: str) -> List[type[BaseTool]]:
     """Load BaseTool classes from a directory."""
-    tools: List[type[BaseTool]] = []
-    
-    # Add tools directory to Python path if it's not already there
-    if tools_dir not in sys.path:
-        sys.path.insert(0, tools_dir)
-    
-    # Find all Python files in the tools directory
-    for root, _, files in os.walk(tools_dir):
-        for file in files:
-            if file.endswith('.py') and not file.startswith('__'):
-                module_path = os.path.join(root, file)
-                module_name = os.path.splitext(file)[0]
-                
-                # Import the module
-                try:
-                    spec = importlib.util.spec_from_file_location(module_name, module_path)
-                    if spec and spec.loader:
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-                        
-                        # Find BaseTool subclasses in the module
-                        for item_name, item in inspect.getmembers(module):
-                            if (inspect.isclass(item) and 
-                                issubclass(item, BaseTool) and 
-                                item != BaseTool):
-                                tools.append(item)
-                except Exception as e:
-                    logger.error(f"Could not load module {module_name}: {e}")
-    
-    return tools
+    return _ToolsDirectory(tools_dir).scan()[0]
+
+
+class _ToolRegistry:
+    """
+    Tools served by the MCP server. The MCP definition of each tool is built once at registration, so
+    list_tools requests are answered from memory. `version` is a hash of all definitions and only changes
+    when the registered tools change.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, type[BaseTool]] = {}
+        self._definitions: Dict[str, types.Tool] = {}
+        self.version = ""
+        self.list_tools_result = types.ListToolsResult(tools=[])
+
+    def register(self, tool_class: type[BaseTool], replace: bool = False) -> None:
+        self._add(tool_class, replace)
+        self._update()
+
+    def _add(self, tool_class: type[BaseTool], replace: bool = False) -> None:
+        tool_name = tool_class.__name__
+        if tool_name in self._tools and not replace:
+            raise ValueError(f"Duplicate tool name detected: {tool_name}. Please use a different tool name.")
+        # Get description from docstring
+        description = (tool_class.__doc__ or f"Tool: {tool_name}").strip()
+        self._definitions[tool_name] = types.Tool(
+            name=tool_name, description=description, inputSchema=tool_class.model_json_schema()
+        )
+        self._tools[tool_name] = tool_class
+        logger.info(f"Registered tool: {tool_name}")
+
+    def update(self, tools: List[type[BaseTool]], removed: List[str]) -> bool:
+        """Replace or add the given tools and remove the others. Returns True if the version changed."""
+        version = self.version
+        for tool_name in removed:
+            if self._tools.pop(tool_name, None) is not None:
+                del self._definitions[tool_name]
+                logger.info(f"Removed tool: {tool_name}")
+        for tool_class in tools:
+            self._add(tool_class, replace=True)
+        self._update()
+        return self.version != version
+
+    def _update(self) -> None:
+        definitions = [definition.model_dump(mode="json") for definition in self._definitions.values()]
+        self.version = hashlib.sha256(json.dumps(definitions, sort_keys=True).encode()).hexdigest()[:16]
+        self.list_tools_result = types.ListToolsResult(
+            tools=list(self._definitions.values()), _meta={"version": self.version}
+        )
+
+    def get(self, tool_name: str) -> Optional[type[BaseTool]]:
+        return self._tools.get(tool_name)
+
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+
+class _ToolsServer(Server):
+    """MCP server that can announce tools-changed notifications to its clients."""
+
+    def __init__(self, name: str, tools_changed: bool = False):
+        super().__init__(name)
+        self.tools_changed = tools_changed
+
+    def create_initialization_options(self, notification_options=None, experimental_capabilities=None):
+        notification_options = notification_options or NotificationOptions(tools_changed=self.tools_changed)
+        return super().create_initialization_options(notification_options, experimental_capabilities)
+
 
 def _verify_token(request: Request, app_token: Optional[str]) -> bool:
     """Simple token verification - returns True if authenticated, False otherwise"""
@@ -90,6 +239,13 @@ def run_mcp(
     server_name: str = "mcp-tools-server",
     cors_origins: List[str] = ["*"],
     return_app: bool = False,
+    enable_metrics: bool = False,
+    tool_executor: Literal["thread", "process"] = "thread",
+    tool_process_workers: Optional[int] = None,
+    tool_max_concurrency: Optional[int] = None,
+    tool_max_queue_size: Optional[int] = None,
+    watch: bool = False,
+    watch_interval: float = 1.0,
 ):
     """
     Launch an MCP (Model Context Protocol) server exposing BaseTool instances.
@@ -103,15 +259,29 @@ def run_mcp(
         cors_origins: List of allowed CORS origins
         return_app: If False, runs the server automatically.
         If True, return the Starlette app instead of running it.
+        enable_metrics: If True, expose tool call metrics at /metrics in the Prometheus text format,
+            and per-tool queue and latency statistics at /stats.
+        tool_executor: Where sync tools run by default, "thread" or "process". Overridden by ToolConfig.executor.
+            Tools run in warm worker processes must be importable, with picklable fields and results.
+        tool_process_workers: Number of worker processes. Defaults to the number of cpus.
+        tool_max_concurrency: Default maximum number of concurrent calls per tool. Overridden by
+            ToolConfig.max_concurrency.
+        tool_max_queue_size: Default maximum number of waiting calls per tool. Calls above it are rejected.
+            Overridden by ToolConfig.max_queue_size.
+        watch: If True and tools is a directory, reload the tools when its modules are added, changed or
+            deleted, and notify connected clients that the tools changed.
+        watch_interval: Number of seconds between two scans of the tools directory.
 
     Returns:
         Starlette app if return_app=True, otherwise None
     """
     
     # Handle tools input - either list of classes or directory path
+    tools_directory = None
     if isinstance(tools, str):
         # It's a directory path
-        tools_list = _load_tools_from_directory(tools)
+        tools_directory = _ToolsDirectory(tools)
+        tools_list = tools_directory.scan()[0]
         if not tools_list:
             raise ValueError(f"No BaseTool classes found in directory: {tools}")
         logger.info(f"Found {len(tools_list)} tools in {tools}")
@@ -120,96 +290,95 @@ def run_mcp(
         tools_list = tools
         if not tools_list or len(tools_list) == 0:
             raise ValueError("No tools provided. Please provide at least one BaseTool class.")
+        if watch:
+            raise ValueError("watch requires tools to be a directory path.")
 
     # Get authentication token
     app_token = os.getenv(app_token_env)
     if app_token is None or app_token == "":
         logger.warning(f"{app_token_env} is not set. Authentication will be disabled.")
 
-    # Create thread pool for sync tools
+    # Create thread pool and worker processes for sync tools
     max_workers = int(os.getenv("TOOL_THREAD_POOL_SIZE", min(32, (os.cpu_count() or 1) + 4)))
     if not os.getenv("TOOL_THREAD_POOL_SIZE"):
         logger.warning(f"TOOL_THREAD_POOL_SIZE env variable is not set. Defaulting to {max_workers} max workers.")
-    thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+    executor = ToolExecutor(
+        executor=tool_executor,
+        max_workers=max_workers,
+        process_workers=tool_process_workers,
+        max_concurrency=tool_max_concurrency,
+        max_queue_size=tool_max_queue_size,
+    )
 
     # Create tool registry
-    tool_registry = {}
-
-    # Register tools
+    tool_registry = _ToolRegistry()
     for tool_class in tools_list:
-        tool_name = tool_class.__name__
-        if tool_name in tool_registry:
-            raise ValueError(f"Duplicate tool name detected: {tool_name}. Please use a different tool name.")
-        tool_registry[tool_name] = tool_class
-        logger.info(f"Registered tool: {tool_name}")
+        tool_registry.register(tool_class)
+
+    # Sessions that listed or called tools, notified when the tools directory changes
+    sessions = weakref.WeakSet()
 
     def create_mcp_server() -> Server:
         """Create MCP server with registered tools"""
-        app = Server(server_name)
+        app = _ToolsServer(server_name, tools_changed=watch)
 
-        @app.call_tool()
-        async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
+        # Arguments are validated by the tool's compiled Pydantic model, skip the JSON schema validation
+        @app.call_tool(validate_input=False)
+        async def call_tool(name: str, arguments: dict) -> Union[list[types.TextContent], types.CallToolResult]:
             """Handle tool calls with proper error handling"""
+            sessions.add(app.request_context.session)
             try:
                 # Find the registered tool
-                if name not in tool_registry:
+                tool_class = tool_registry.get(name)
+                if tool_class is None:
                     logger.error(f"Unknown tool requested: {name}")
+                    _TOOL_CALLS.inc(tool=name, status="unknown_tool")
                     return [
                         types.TextContent(
                             type="text",
-                            text=f"Error: Unknown tool '{name}'. Available tools: {list(tool_registry.keys())}",
+                            text=f"Error: Unknown tool '{name}'. Available tools: {tool_registry.names()}",
                         )
                     ]
 
-                tool_class = tool_registry[name]
-
                 # Validate arguments against tool schema
                 try:
                     tool_instance = tool_class(**arguments)
                 except Exception as e:
                     logger.error(f"Invalid arguments for tool {name}: {e}")
+                    _TOOL_CALLS.inc(tool=name, status="invalid_arguments")
                     return [
                         types.TextContent(type="text", text=f"Error: Invalid arguments for tool '{name}': {str(e)}")
                     ]
 
                 # Execute tool
-                if asyncio.iscoroutinefunction(tool_instance.run):
-                    result = await tool_instance.run()
-                else:
-                    # Run sync tool in thread pool to avoid blocking
-                    loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(thread_pool, tool_instance.run)
+                start = time.perf_counter()
+                _TOOL_CALLS_IN_FLIGHT.inc(tool=name)
+                try:
+                    # Sync tools run in a thread or a worker process to avoid blocking.
+                    # Waiting calls are served round robin across tools and client sessions.
+                    result = await executor.run(tool_instance, client=id(app.request_context.session))
+                except ToolQueueFullError as e:
+                    logger.warning(f"Rejected call to tool {name}: {e}")
+                    _TOOL_CALLS.inc(tool=name, status="rejected")
+                    return types.CallToolResult(content=[types.TextContent(type="text", text=str(e))], isError=True)
+                finally:
+                    _TOOL_CALLS_IN_FLIGHT.dec(tool=name)
+                    _TOOL_CALL_DURATION.observe(time.perf_counter() - start, tool=name)
 
                 logger.info(f"Successfully executed tool: {name}")
+                _TOOL_CALLS.inc(tool=name, status="success")
                 return [types.TextContent(type="text", text=str(result))]
 
             except Exception as e:
                 logger.error(f"Error executing tool {name}: {e}", exc_info=True)
+                _TOOL_CALLS.inc(tool=name, status="error")
                 return [types.TextContent(type="text", text=f"Error executing tool '{name}': {str(e)}")]
 
         @app.list_tools()
-        async def list_tools() -> list[types.Tool]:
-            """Generate tool list from registered BaseTool instances"""
-            tools_list = []
-
-            try:
-                for tool_name, tool_class in tool_registry.items():
-                    # Get the schema from the BaseTool
-                    schema = tool_class.model_json_schema()
-
-                    # Get description from docstring
-                    description = tool_class.__doc__ or f"Tool: {tool_name}"
-                    description = description.strip()
-
-                    # Create the MCP tool
-                    tools_list.append(types.Tool(name=tool_name, description=description, inputSchema=schema))
-
-                logger.info(f"Listed {len(tools_list)} available tools")
-                return tools_list
-
-            except Exception as e:
-                logger.error(f"Error listing tools: {e}", exc_info=True)
-                return []
+        async def list_tools(request: types.ListToolsRequest) -> types.ListToolsResult:
+            """Return the tool definitions built at registration"""
+            sessions.add(app.request_context.session)
+            return tool_registry.list_tools_result
 
         return app
 
@@ -254,32 +423,81 @@ def run_mcp(
                 response = JSONResponse({"error": "Internal server error"}, status_code=500)
                 await response(scope, receive, send)
 
+        async def handle_metrics(request: Request):
+            """Expose collected metrics in the Prometheus text format"""
+            if not _verify_token(request, app_token):
+                return JSONResponse(
+                    {"error": "Authentication required"}, status_code=401, headers={"WWW-Authenticate": "Bearer"}
+                )
+            return PlainTextResponse(
+                metrics.get_metrics_registry().render(), media_type=metrics.PROMETHEUS_CONTENT_TYPE
+            )
+
+        async def handle_stats(request: Request):
+            """Expose per-tool queue and latency statistics"""
+            if not _verify_token(request, app_token):
+                return JSONResponse(
+                    {"error": "Authentication required"}, status_code=401, headers={"WWW-Authenticate": "Bearer"}
+                )
+            return JSONResponse(executor.stats())
+
+        async def notify_tools_changed() -> None:
+            for session in list(sessions):
+                try:
+                    await asyncio.wait_for(session.send_tool_list_changed(), timeout=5)
+                except Exception as e:
+                    logger.debug(f"Could not notify session about changed tools: {e}")
+                    sessions.discard(session)
+
+        async def watch_tools() -> None:
+            """Reload changed tool modules and notify clients"""
+            while True:
+                await asyncio.sleep(watch_interval)
+                try:
+                    # Modules are imported in a thread, so slow imports don't block requests
+                    changed, removed = await asyncio.to_thread(tools_directory.scan)
+                except Exception as e:
+                    logger.error(f"Error scanning tools directory {tools_directory.path}: {e}", exc_info=True)
+                    continue
+                if (changed or removed) and tool_registry.update(changed, removed):
+                    logger.info(f"Reloaded tools (version {tool_registry.version}): {tool_registry.names()}")
+                    await notify_tools_changed()
+
+        routes = [Mount("/mcp", app=handle_mcp)]
+        if enable_metrics:
+            routes.append(Route("/metrics", endpoint=handle_metrics, methods=["GET"]))
+            routes.append(Route("/stats", endpoint=handle_stats, methods=["GET"]))
+
         @contextlib.asynccontextmanager
         async def lifespan(app: Starlette) -> AsyncIterator[None]:
             """Application lifespan management"""
             try:
                 async with session_manager.run():
                     logger.info(f"MCP server '{server_name}' started")
-                    logger.info(f"Registered {len(tool_registry)} tools")
+                    logger.info(f"Registered {len(tool_registry)} tools (version {tool_registry.version})")
                     logger.info(f"Authentication: {'Enabled' if app_token else 'Disabled'}")
-                    yield
+                    executor.warm_up(tools_list)
+                    watcher = asyncio.create_task(watch_tools()) if watch else None
+                    try:
+                        yield
+                    finally:
+                        if watcher is not None:
+                            watcher.cancel()
             except Exception as e:
                 logger.error(f"Error during server startup: {e}", exc_info=True)
                 raise
             finally:
                 logger.info("Shutting down MCP server...")
-                # Shutdown thread pool to prevent thread leaks
+                # Shutdown thread pool and worker processes to prevent leaks
                 try:
-                    thread_pool.shutdown(wait=True)
+                    executor.shutdown(wait=True)
                     logger.info("Thread pool shut down successfully")
                 except Exception as e:
                     logger.error(f"Error shutting down thread pool: {e}", exc_info=True)
 
         # Fastapi interferes with session manager, so use Starlette directly
         return Starlette(
-            routes=[
-                Mount("/mcp", app=handle_mcp),
-            ],
+            routes=routes,
             lifespan=lifespan,
             middleware=middleware,
         )
@@ -1,12 +1,15 @@
 import asyncio
+import atexit
 import inspect
 import json
 import logging
 import os
 import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Generator, Type, Union
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Generator, Type, Union
 
 from openai import APIError, BadRequestError
 from openai.types.beta import AssistantToolChoice
@@ -18,14 +21,40 @@ from openai.types.beta.threads.runs.tool_call import ToolCall
 
 from agency_swarm.agents import Agent
 from agency_swarm.messages import MessageOutput
-from agency_swarm.tools import CodeInterpreter, FileSearch
+from agency_swarm.tools import CodeInterpreter, FileSearch, ToolExecutor
 from agency_swarm.user import User
+from agency_swarm.util import metrics
+from agency_swarm.util.errors import ToolTimeoutError
+from agency_swarm.util.helpers.event_loop import get_tool_loop
 from agency_swarm.util.oai import get_openai_client
 from agency_swarm.util.streaming.agency_event_handler import AgencyEventHandler
 from agency_swarm.util.tracking.tracking_manager import TrackingManager
 
 logger = logging.getLogger(__name__)
 
+_RUN_DURATION = metrics.histogram(
+    "agency_swarm_agent_run_duration_seconds",
+    "Duration of agent runs, from run creation to the final output.",
+    ["agent", "status"],
+)
+_OPENAI_REQUESTS = metrics.counter(
+    "agency_swarm_openai_requests_total",
+    "Number of OpenAI API requests made by threads.",
+    ["operation"],
+)
+_OPENAI_REQUEST_DURATION = metrics.histogram(
+    "agency_swarm_openai_request_duration_seconds",
+    "Duration of OpenAI API requests made by threads. Streamed requests include the generation time.",
+    ["operation"],
+)
+
+
+@contextmanager
+def _track_api_call(operation: str):
+    _OPENAI_REQUESTS.inc(operation=operation)
+    with _OPENAI_REQUEST_DURATION.time(operation=operation):
+        yield
+
 
 class ToolNotFoundError(Exception):
     """Raised when a tool is not found in an agent's functions."""
@@ -36,6 +65,13 @@ class ToolNotFoundError(Exception):
 class Thread:
     async_mode: str = None
     max_workers: int = 4
+    # Runs the tools with ToolConfig.isolation = "subprocess", shared by all threads
+    tool_executor: ToolExecutor = None
+    _tool_executor_lock = threading.Lock()
+    # Bounds the daemon threads running sync tools with a timeout, including the ones still running after it
+    _timeout_slots = threading.BoundedSemaphore(
+        int(os.getenv("TOOL_THREAD_POOL_SIZE", min(32, (os.cpu_count() or 1) + 4)))
+    )
 
     @property
     def thread_url(self):
@@ -84,7 +120,8 @@ class Thread:
         if self.id:
             return
 
-        self._thread = self.client.beta.threads.create()
+        with _track_api_call("threads.create"):
+            self._thread = self.client.beta.threads.create()
         self.id = self._thread.id
         if self.recipient_agent.examples:
             for example in self.recipient_agent.examples:
@@ -156,6 +193,7 @@ class Thread:
                 yield MessageOutput("text", self.agent.name, recipient_agent.name, message, message_obj)
 
         # 4. Create run (conversation block)
+        run_start = time.perf_counter()
         self._create_run(
             recipient_agent,
             additional_instructions,
@@ -178,15 +216,20 @@ class Thread:
         )
 
         # 6. Main try/except around the run loop
-        final_output = yield from self._execute_main_loop(
-            yield_messages=yield_messages,
-            recipient_agent=recipient_agent,
-            event_handler=event_handler,
-            parent_run_id=parent_run_id,
-            additional_instructions=additional_instructions,
-            tool_choice=tool_choice,
-            response_format=response_format,
-        )
+        run_status = "error"
+        try:
+            final_output = yield from self._execute_main_loop(
+                yield_messages=yield_messages,
+                recipient_agent=recipient_agent,
+                event_handler=event_handler,
+                parent_run_id=parent_run_id,
+                additional_instructions=additional_instructions,
+                tool_choice=tool_choice,
+                response_format=response_format,
+            )
+            run_status = "completed"
+        finally:
+            _RUN_DURATION.observe(time.perf_counter() - run_start, agent=recipient_agent.name, status=run_status)
 
         if final_output is None:
             raise Exception("No output was generated from the execution loop")
@@ -299,7 +342,7 @@ class Thread:
         self._ensure_no_active_run(action="cancel")
         try:
             if event_handler:
-                with self.client.beta.threads.runs.stream(
+                with _track_api_call("runs.stream"), self.client.beta.threads.runs.stream(
                     thread_id=self.id,
                     event_handler=event_handler(),
                     assistant_id=recipient_agent.id,
@@ -315,22 +358,24 @@ class Thread:
                     stream.until_done()
                     self._run = stream.get_final_run()
             else:
-                self._run = self.client.beta.threads.runs.create(
-                    thread_id=self.id,
-                    assistant_id=recipient_agent.id,
-                    additional_instructions=additional_instructions,
-                    tool_choice=tool_choice,
-                    max_prompt_tokens=recipient_agent.max_prompt_tokens,
-                    max_completion_tokens=recipient_agent.max_completion_tokens,
-                    truncation_strategy=recipient_agent.truncation_strategy,
-                    temperature=temperature,
-                    parallel_tool_calls=recipient_agent.parallel_tool_calls,
-                    response_format=response_format,
-                )
-                self._run = self.client.beta.threads.runs.poll(
-                    thread_id=self.id,
-                    run_id=self._run.id,
-                )
+                with _track_api_call("runs.create"):
+                    self._run = self.client.beta.threads.runs.create(
+                        thread_id=self.id,
+                        assistant_id=recipient_agent.id,
+                        additional_instructions=additional_instructions,
+                        tool_choice=tool_choice,
+                        max_prompt_tokens=recipient_agent.max_prompt_tokens,
+                        max_completion_tokens=recipient_agent.max_completion_tokens,
+                        truncation_strategy=recipient_agent.truncation_strategy,
+                        temperature=temperature,
+                        parallel_tool_calls=recipient_agent.parallel_tool_calls,
+                        response_format=response_format,
+                    )
+                with _track_api_call("runs.poll"):
+                    self._run = self.client.beta.threads.runs.poll(
+                        thread_id=self.id,
+                        run_id=self._run.id,
+                    )
         except APIError as e:
             match = re.search(r"Thread (\w+) already has an active run (\w+)", e.message)
             if match:
@@ -365,9 +410,14 @@ class Thread:
     def _run_until_done(self):
         while self._run.status in ["queued", "in_progress", "cancelling"]:
             time.sleep(0.5)
-            self._run = self.client.beta.threads.runs.retrieve(thread_id=self.id, run_id=self._run.id)
+            with _track_api_call("runs.retrieve"):
+                self._run = self.client.beta.threads.runs.retrieve(thread_id=self.id, run_id=self._run.id)
 
     def submit_tool_outputs(self, tool_outputs, event_handler=None, poll=True):
+        with _track_api_call("runs.submit_tool_outputs"):
+            self._submit_tool_outputs(tool_outputs, event_handler, poll)
+
+    def _submit_tool_outputs(self, tool_outputs, event_handler=None, poll=True):
         if not poll:
             self._run = self.client.beta.threads.runs.submit_tool_outputs(
                 thread_id=self.id, run_id=self._run.id, tool_outputs=tool_outputs
@@ -399,7 +449,8 @@ class Thread:
                 logger.warning(f"Can't cancel without a run ID: thread_id={actual_thread_id}")
                 return
 
-            self._run = self.client.beta.threads.runs.cancel(thread_id=actual_thread_id, run_id=actual_run_id)
+            with _track_api_call("runs.cancel"):
+                self._run = self.client.beta.threads.runs.cancel(thread_id=actual_thread_id, run_id=actual_run_id)
 
             self._run = self.client.beta.threads.runs.poll(
                 thread_id=actual_thread_id,
@@ -420,7 +471,8 @@ class Thread:
                 raise e
 
     def _get_last_message_text(self):
-        messages = self.client.beta.threads.messages.list(thread_id=self.id, limit=1)
+        with _track_api_call("messages.list"):
+            messages = self.client.beta.threads.messages.list(thread_id=self.id, limit=1)
 
         if len(messages.data) == 0 or len(messages.data[0].content) == 0:
             return ""
@@ -428,7 +480,8 @@ class Thread:
         return messages.data[0].content[0].text.value
 
     def _get_last_assistant_message(self):
-        messages = self.client.beta.threads.messages.list(thread_id=self.id, limit=1)
+        with _track_api_call("messages.list"):
+            messages = self.client.beta.threads.messages.list(thread_id=self.id, limit=1)
 
         if len(messages.data) == 0 or len(messages.data[0].content) == 0:
             raise Exception("No messages found in the thread")
@@ -449,9 +502,10 @@ class Thread:
         # Never post while a run is still alive
         self._ensure_no_active_run(action="wait")
         try:
-            return self.client.beta.threads.messages.create(
-                thread_id=self.id, role=role, content=message, attachments=attachments
-            )
+            with _track_api_call("messages.create"):
+                return self.client.beta.threads.messages.create(
+                    thread_id=self.id, role=role, content=message, attachments=attachments
+                )
         except BadRequestError as e:
             regex = re.compile(
                 r"Can't add messages to thread_([a-zA-Z0-9]+) while a run run_([a-zA-Z0-9]+) is active\."
@@ -509,11 +563,7 @@ class Thread:
 
             # check if the tool is already called
             for existing_tool_name in [name for name, _ in tool_outputs_and_names]:
-                if tool_name == existing_tool_name and (
-                    hasattr(tool_instance, "ToolConfig")
-                    and hasattr(tool_instance.ToolConfig, "one_call_at_a_time")
-                    and tool_instance.ToolConfig.one_call_at_a_time
-                ):
+                if tool_name == existing_tool_name and tool_instance._tool_config.one_call_at_a_time:
                     error_message = f"Error: Function {tool_name} is already called. You can only call this function once at a time. Please wait for the previous call to finish before calling it again."
                     raise RuntimeError(error_message)
 
@@ -529,55 +579,211 @@ class Thread:
             tool_instance._event_handler = event_handler
             tool_instance._tool_call = tool_call
 
-            output = tool_instance.run()
-            return output, tool_instance.ToolConfig.output_as_result
+            timeout = tool_instance._tool_config.timeout
+            loop_key = tool_name
+            if tool_instance._tool_config.isolation == "subprocess":
+                # The executor enforces the timeout, by killing the worker process
+                output = Thread.get_tool_executor().run(tool_instance)
+                timeout, loop_key = None, "tool-executor"
+            elif timeout is not None and not inspect.iscoroutinefunction(tool_instance.run):
+                output = self._run_with_timeout(tool_instance.run, tool_name, timeout)
+            else:
+                output = tool_instance.run()
+
+            if inspect.iscoroutine(output):
+                # Async tools start right away on a tool loop, the caller collects the returned future
+                output = get_tool_loop(loop_key).submit(self._await_tool(output, tool_call, is_retriever, timeout))
+            return output, tool_instance._tool_config.output_as_result
 
         except Exception as e:
-            error_message = f"Error: {e}"
-            if "For further information visit" in error_message:
-                error_message = error_message.split("For further information visit")[0]
+            return self._tool_error(e, tool_call, is_retriever), False
 
-            # Track error
-            self._tracking_manager.track_tool_error(
-                error=Exception(error_message),
-                tool_call=tool_call,
-                parent_run_id=self._run.id,
-                is_retriever=is_retriever,
-            )
+    def execute_tool_batch(
+        self,
+        tool_calls: list[ToolCall],
+        recipient_agent=None,
+        event_handler=None,
+    ) -> list[tuple[Any, bool]]:
+        """
+        Execute the calls of a batchable tool with a single call to its `run_batch`.
 
-            return error_message, False
+        Returns the output and output_as_result of each call, in the same order. Calls with invalid arguments
+        get their own error, and if `run_batch` fails, all the other calls get its error.
+        """
+        if not recipient_agent:
+            recipient_agent = self.recipient_agent
 
-    def _await_coroutines(self, tool_outputs):
-        async_tool_calls = []
-        for tool_output in tool_outputs:
-            if inspect.iscoroutine(tool_output["output"]):
-                async_tool_calls.append(tool_output)
+        tool_name = tool_calls[0].function.name
+        tool = next((func for func in recipient_agent.functions if func.__name__ == tool_name), None)
+        results: list[tuple[Any, bool]] = [None] * len(tool_calls)
+        instances = []
 
-        if async_tool_calls:
+        for index, tool_call in enumerate(tool_calls):
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    raise RuntimeError
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop = asyncio.get_event_loop()
-
-            results = loop.run_until_complete(
-                asyncio.gather(
-                    *[call["output"] for call in async_tool_calls],
-                    return_exceptions=True,  # Capture exceptions to set as individual results
+                self._tracking_manager.track_tool_start(
+                    tool_call=tool_call,
+                    run=self._run,
+                    agent_name=self.agent.name,
+                    recipient_agent_name=recipient_agent.name,
                 )
-            )
+                args = tool_call.function.arguments
+                tool_instance = tool(**(json.loads(args) if args else {}))
+                tool_instance._caller_agent = recipient_agent
+                tool_instance._event_handler = event_handler
+                tool_instance._tool_call = tool_call
+                instances.append((index, tool_instance))
+            except Exception as e:
+                results[index] = (self._tool_error(e, tool_call, False), False)
+
+        if instances:
+            batch = [tool_instance for _, tool_instance in instances]
+            timeout = tool._tool_config.timeout
+            try:
+                if timeout is not None and not inspect.iscoroutinefunction(tool.run_batch):
+                    outputs = self._run_with_timeout(lambda: tool.run_batch(batch), tool_name, timeout)
+                else:
+                    outputs = tool.run_batch(batch)
+                if inspect.iscoroutine(outputs):
+                    future = get_tool_loop(tool_name).submit(
+                        self._wait_with_timeout(outputs, tool_name, timeout)
+                    )
+                    outputs = future.result()
+                outputs = list(outputs)
+                if len(outputs) != len(batch):
+                    raise ValueError(
+                        f"run_batch of {tool_name} returned {len(outputs)} outputs for {len(batch)} calls."
+                    )
+            except Exception as e:
+                for index, _ in instances:
+                    results[index] = (self._tool_error(e, tool_calls[index], False), False)
+            else:
+                for (index, _), output in zip(instances, outputs):
+                    results[index] = (output, tool._tool_config.output_as_result)
+
+        return results
+
+    @staticmethod
+    def get_tool_executor() -> ToolExecutor:
+        """
+        Return the executor of the tools isolated in a subprocess, created on first use. It is shared by all
+        agencies, so its worker processes are shut down at exit.
+        """
+        with Thread._tool_executor_lock:
+            if Thread.tool_executor is None:
+                Thread.tool_executor = ToolExecutor()
+                atexit.register(Thread.tool_executor.shutdown, wait=False)
+            return Thread.tool_executor
+
+    @staticmethod
+    def _run_with_timeout(run: Callable[[], Any], tool_name: str, timeout: float) -> Any:
+        """
+        Call a sync tool in a daemon thread and wait for it at most `timeout` seconds, including the time spent
+        waiting for a free thread. At most `TOOL_THREAD_POOL_SIZE` (default min(32, cpus + 4)) of these threads
+        run at once. Threads can't be interrupted, so a tool that times out keeps running in the background,
+        and holds its thread, until it returns. Use `isolation = "subprocess"` to stop hung calls.
+        """
+        deadline = time.monotonic() + timeout
+        if not Thread._timeout_slots.acquire(timeout=timeout):
+            logger.warning(f"Tool {tool_name} timed out after {timeout}s waiting for a thread")
+            raise ToolTimeoutError(f"Tool {tool_name} timed out after {timeout} seconds.")
+        future = Future()
 
-            for tool_output, result in zip(async_tool_calls, results):
-                tool_output["output"] = str(result)
+        def target():
+            try:
+                future.set_result(run())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                Thread._timeout_slots.release()
 
-        return tool_outputs
+        try:
+            threading.Thread(target=target, name=f"tool-{tool_name}", daemon=True).start()
+        except BaseException:
+            Thread._timeout_slots.release()
+            raise
+        done, _ = wait([future], timeout=max(0.0, deadline - time.monotonic()))
+        if not done:
+            logger.warning(f"Tool {tool_name} timed out after {timeout}s")
+            raise ToolTimeoutError(f"Tool {tool_name} timed out after {timeout} seconds.")
+        return future.result()
+
+    @staticmethod
+    async def _wait_with_timeout(coro, tool_name: str, timeout: float | None) -> Any:
+        """Await an async tool, cancelling it after `timeout` seconds."""
+        task = asyncio.ensure_future(coro)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not done:
+            task.cancel()
+            logger.warning(f"Tool {tool_name} timed out after {timeout}s")
+            raise ToolTimeoutError(f"Tool {tool_name} timed out after {timeout} seconds.")
+        return task.result()
+
+    async def _await_tool(self, coro, tool_call: ToolCall, is_retriever: bool, timeout: float | None = None) -> Any:
+        """Await an async tool on its tool loop, and track its end as soon as it finishes."""
+        try:
+            output = await self._wait_with_timeout(coro, tool_call.function.name, timeout)
+        except Exception as e:
+            output = self._tool_error(e, tool_call, is_retriever)
+        self._tracking_manager.track_tool_end(
+            output=output,
+            tool_call=tool_call,
+            parent_run_id=self._run.id,
+            is_retriever=is_retriever,
+        )
+        return output
+
+    def _tool_error(self, error: Exception, tool_call: ToolCall, is_retriever: bool) -> str:
+        error_message = f"Error: {error}"
+        if "For further information visit" in error_message:
+            error_message = error_message.split("For further information visit")[0]
+
+        # Track error
+        self._tracking_manager.track_tool_error(
+            error=Exception(error_message),
+            tool_call=tool_call,
+            parent_run_id=self._run.id,
+            is_retriever=is_retriever,
+        )
+
+        return error_message
+
+    def _get_batched_tool_calls(
+        self, tool_calls: list[RequiredActionFunctionToolCall], recipient_agent: Agent
+    ) -> tuple[dict[str, list[RequiredActionFunctionToolCall]], list[RequiredActionFunctionToolCall]]:
+        """
+        Group the calls of batchable tools that were called more than once by tool name.
+        Returns the groups and the remaining tool calls. Tools with `one_call_at_a_time` are not batched,
+        so their extra calls get the same error as unbatched calls.
+        """
+        functions = {func.__name__: func for func in recipient_agent.functions}
+        groups: dict[str, list[RequiredActionFunctionToolCall]] = {}
+        for tool_call in tool_calls:
+            tool = functions.get(tool_call.function.name)
+            if (
+                tool is not None
+                and not tool_call.function.name.startswith("SendMessage")
+                and tool._tool_config.batchable
+                and tool._tool_config.isolation is None
+                and not tool._tool_config.one_call_at_a_time
+            ):
+                groups.setdefault(tool_call.function.name, []).append(tool_call)
+
+        batches = {tool_name: calls for tool_name, calls in groups.items() if len(calls) > 1}
+        batched_ids = {tool_call.id for calls in batches.values() for tool_call in calls}
+        return batches, [tool_call for tool_call in tool_calls if tool_call.id not in batched_ids]
 
     def _get_sync_async_tool_calls(self, tool_calls: list[RequiredActionFunctionToolCall], recipient_agent: Agent):
+        """
+        Split the tool calls into sync calls, calls to run in threads (`async_mode`) and calls of tools
+        with an `async def run` or isolated in a subprocess, which run in the background.
+        """
         async_tool_calls = []
         sync_tool_calls = []
+        coroutine_tool_calls = []
 
         for tool_call in tool_calls:
             if tool_call.function.name.startswith("SendMessage"):
@@ -597,14 +803,14 @@ class Thread:
                 self.cancel_run()
                 raise ToolNotFoundError(error_message)
 
-            if (
-                hasattr(tool.ToolConfig, "async_mode") and tool.ToolConfig.async_mode
-            ) or self.async_mode == "tools_threading":
+            if inspect.iscoroutinefunction(tool.run) or tool._tool_config.isolation == "subprocess":
+                coroutine_tool_calls.append(tool_call)
+            elif tool._tool_config.async_mode or self.async_mode == "tools_threading":
                 async_tool_calls.append(tool_call)
             else:
                 sync_tool_calls.append(tool_call)
 
-        return sync_tool_calls, async_tool_calls
+        return sync_tool_calls, async_tool_calls, coroutine_tool_calls
 
     def get_messages(self, limit=None):
         all_messages = []
@@ -642,14 +848,17 @@ class Thread:
 
         self._tracking_manager.track_agent_actions(tool_calls, self._run.id, parent_run_id)
 
-        sync_tool_calls, async_tool_calls = self._get_sync_async_tool_calls(tool_calls, recipient_agent)
+        batched_tool_calls, tool_calls = self._get_batched_tool_calls(tool_calls, recipient_agent)
+        sync_tool_calls, async_tool_calls, coroutine_tool_calls = self._get_sync_async_tool_calls(
+            tool_calls, recipient_agent
+        )
 
         def handle_output(
-            tool_call: ToolCall, output: str | Generator[Any, None, None]
+            tool_call: ToolCall, output: str | Generator[Any, None, None], track_end: bool = True
         ) -> str | Generator[MessageOutput, None, None]:
             """
             Local helper to handle the output from each tool call.
-            Yields messages if yield_messages is True.
+            Yields messages if yield_messages is True. Async tools track their end themselves (track_end=False).
             """
             final_output = None
             if inspect.isgenerator(output):
@@ -675,15 +884,46 @@ class Thread:
                 if tool_output[1]["tool_call_id"] == tool_call.id:
                     tool_output[1]["output"] = final_output
 
-            self._tracking_manager.track_tool_end(
-                output=final_output,
-                tool_call=tool_call,
-                parent_run_id=self._run.id,
-                is_retriever=tool_call.type == "file_search",
-            )
+            if track_end:
+                self._tracking_manager.track_tool_end(
+                    output=final_output,
+                    tool_call=tool_call,
+                    parent_run_id=self._run.id,
+                    is_retriever=tool_call.type == "file_search",
+                )
             return final_output
 
         final_output = None
+        # Futures of the async tools running on the tool loops, with their tool call and output_as_result
+        pending_tool_calls: dict[Future, tuple[ToolCall, bool]] = {}
+
+        # Start the async tools first, so they run while the other tools execute
+        for tool_call in coroutine_tool_calls:
+            if yield_messages:
+                yield MessageOutput(
+                    "function",
+                    recipient_agent.name,
+                    self.agent.name,
+                    str(tool_call.function),
+                    tool_call,
+                )
+            output, output_as_result = self.execute_tool(
+                tool_call,
+                recipient_agent,
+                event_handler,
+                tool_outputs_and_names,
+            )
+            tool_outputs_and_names.append(
+                (
+                    tool_call.function.name,
+                    {"tool_call_id": tool_call.id, "output": output},
+                )
+            )
+            if isinstance(output, Future):
+                pending_tool_calls[output] = (tool_call, output_as_result)
+            else:
+                # The tool failed before it started
+                yield from handle_output(tool_call, output)
 
         # If async tool calls are allowed, run them with a ThreadPoolExecutor
         if len(async_tool_calls) > 0 and self.async_mode == "tools_threading":
@@ -713,6 +953,9 @@ class Thread:
                 for future in as_completed(futures):
                     tool_call = futures[future]
                     output, output_as_result = future.result()
+                    if isinstance(output, Future):
+                        pending_tool_calls[output] = (tool_call, output_as_result)
+                        continue
                     gen = handle_output(tool_call, output)
                     if inspect.isgenerator(gen):
                         yield from gen
@@ -749,6 +992,10 @@ class Thread:
                     {"tool_call_id": tool_call.id, "output": output},
                 )
             )
+            if isinstance(output, Future):
+                # A sync run that returned a coroutine
+                pending_tool_calls[output] = (tool_call, output_as_result)
+                continue
             gen = handle_output(tool_call, output)
             if inspect.isgenerator(gen):
                 yield from gen
@@ -761,6 +1008,40 @@ class Thread:
                 final_output = output
                 break
 
+        # Run each group of calls of a batchable tool with a single run_batch, while the async tools run
+        for tool_name, batch in batched_tool_calls.items():
+            if final_output is not None:
+                break
+            if yield_messages:
+                for tool_call in batch:
+                    yield MessageOutput(
+                        "function",
+                        recipient_agent.name,
+                        self.agent.name,
+                        str(tool_call.function),
+                        tool_call,
+                    )
+            results = self.execute_tool_batch(batch, recipient_agent, event_handler)
+            for tool_call, (output, output_as_result) in zip(batch, results):
+                tool_outputs_and_names.append((tool_name, {"tool_call_id": tool_call.id, "output": output}))
+                output = yield from handle_output(tool_call, output)
+                if output_as_result:
+                    self.cancel_run()
+                    final_output = output
+                    break
+
+        # Collect the async tools in the order they finish
+        if final_output is None:
+            for future in as_completed(pending_tool_calls):
+                tool_call, output_as_result = pending_tool_calls[future]
+                output = yield from handle_output(tool_call, future.result(), track_end=False)
+                if output_as_result:
+                    self.cancel_run()
+                    final_output = output
+                    break
+        for future in pending_tool_calls:
+            future.cancel()
+
         # If a tool call had "output_as_result", return immediately
         if final_output is not None:
             return final_output
@@ -768,8 +1049,6 @@ class Thread:
         tool_outputs = [t for _, t in tool_outputs_and_names]
         tool_names = [n for n, _ in tool_outputs_and_names]
 
-        tool_outputs = self._await_coroutines(tool_outputs)
-
         for to_ in tool_outputs:
             if not isinstance(to_["output"], str):
                 to_["output"] = str(to_["output"])
@@ -882,7 +1161,8 @@ class Thread:
             tuple: (has_active_run, run_id)
         """
         # List runs with a filter for non-terminal states
-        runs = self.client.beta.threads.runs.list(thread_id=self.id, limit=1)
+        with _track_api_call("runs.list"):
+            runs = self.client.beta.threads.runs.list(thread_id=self.id, limit=1)
 
         for run in runs.data:
             if run.status not in self.terminal_states:
@@ -1,9 +1,11 @@
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Literal, Union
+from typing import Any, ClassVar, List, Literal, Optional, Union
 
 from docstring_parser import parse
 from openai.types.beta.threads.runs.tool_call import ToolCall
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from pydantic._internal._model_construction import ModelMetaclass
 
 from agency_swarm.util.shared_state import SharedState
 
@@ -16,29 +18,89 @@ class classproperty:
         return self.fget(owner)
 
 
-class BaseTool(BaseModel, ABC):
+def _copy_json(value: Any) -> Any:
+    """Copy a JSON-like value, faster than `copy.deepcopy`."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+class ResolvedToolConfig(BaseModel):
+    """`ToolConfig` of a tool class, resolved with its defaults when the class is created."""
+
+    model_config = ConfigDict(frozen=True)
+
+    strict: bool = False
+    one_call_at_a_time: bool = False
+    output_as_result: bool = False
+    async_mode: Optional[str] = None
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    max_queue_size: Optional[int] = None
+    executor: Optional[str] = None
+    isolation: Optional[str] = None
+    batchable: bool = False
+
+
+class _ToolConfigMeta(type):
+    """Metaclass of the resolved `ToolConfig` classes, which resolves them again when they're modified."""
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        for tool in list(cls.__dict__.get("_owners", ())):
+            tool.refresh_tool_config()
+
+
+class _BaseToolMeta(ModelMetaclass):
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name == "ToolConfig" and "_tool_config" in cls.__dict__:
+            cls.refresh_tool_config()
+
+
+class BaseTool(BaseModel, ABC, metaclass=_BaseToolMeta):
     _shared_state: ClassVar[SharedState] = None
     _caller_agent: Any = None
     _event_handler: Any = None
     _tool_call: ToolCall = None
+    _tool_config: ClassVar[ResolvedToolConfig]
     openai_schema: ClassVar[dict[str, Any]]
+    _openai_schema_cache: ClassVar[Optional[tuple]] = None
 
-    def __init__(self, **kwargs):
-        if not self.__class__._shared_state:
-            self.__class__._shared_state = SharedState()
-        super().__init__(**kwargs)
-
-        # Ensure all ToolConfig variables are initialized
-        config_defaults = {
-            "strict": False,
-            "one_call_at_a_time": False,
-            "output_as_result": False,
-            "async_mode": None,
-        }
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        if not cls._shared_state:
+            cls._shared_state = SharedState()
+        cls.refresh_tool_config()
 
-        for key, value in config_defaults.items():
-            if not hasattr(self.ToolConfig, key):
-                setattr(self.ToolConfig, key, value)
+    @classmethod
+    def refresh_tool_config(cls) -> None:
+        """
+        Resolve the class's `ToolConfig` into `_tool_config`, with the defaults of the missing settings.
+
+        Called when the class is created and when its `ToolConfig` is replaced or modified.
+        """
+        config = cls.ToolConfig
+        if not isinstance(config, _ToolConfigMeta):
+            # Subclass the config, so modifications of its settings can be detected
+            config = _ToolConfigMeta(
+                config.__name__, (config,), {"__module__": config.__module__, "__qualname__": config.__qualname__}
+            )
+            type.__setattr__(cls, "ToolConfig", config)
+        if "_owners" not in config.__dict__:
+            type.__setattr__(config, "_owners", weakref.WeakSet())
+        config._owners.add(cls)
+
+        values = {}
+        for name, field in ResolvedToolConfig.model_fields.items():
+            if not hasattr(config, name):
+                # Older code reads the settings from ToolConfig directly
+                type.__setattr__(config, name, field.default)
+            values[name] = getattr(config, name)
+        type.__setattr__(cls, "_tool_config", ResolvedToolConfig(**values))
 
     class ToolConfig:
         strict: bool = False
@@ -46,6 +108,18 @@ class BaseTool(BaseModel, ABC):
         # return the tool output as assistant message
         output_as_result: bool = False
         async_mode: Union[Literal["threading"], None] = None
+        # maximum execution time in seconds, the call returns an error when it's exceeded
+        timeout: Optional[float] = None
+        # maximum number of concurrent calls when served by run_fastapi or run_mcp
+        max_concurrency: Optional[int] = None
+        # maximum number of waiting calls when served by run_fastapi or run_mcp, further calls are rejected
+        max_queue_size: Optional[int] = None
+        # "thread" or "process" executor for sync tools served by run_fastapi or run_mcp
+        executor: Optional[Literal["thread", "process"]] = None
+        # "subprocess" to run the tool in a warm worker process, which is killed if the call times out
+        isolation: Optional[Literal["subprocess"]] = None
+        # run the parallel calls of the tool in a single step with one call to run_batch
+        batchable: bool = False
 
     @classproperty
     def openai_schema(cls) -> dict[str, Any]:
@@ -55,9 +129,23 @@ class BaseTool(BaseModel, ABC):
         Note:
             It's important to add a docstring to describe how to best use this class; it will be included in the description attribute and be part of the prompt.
 
+            The schema is computed once per class and cached until the class's docstring or strict mode changes,
+            its model is rebuilt or `invalidate_openai_schema()` is called. Each access returns a copy.
+
         Returns:
             model_json_schema (dict): A dictionary in the format of OpenAI's schema as jsonschema
         """
+        strict = cls._tool_config.strict
+        key = (cls.__doc__, strict)
+        # Looked up in the class's own namespace, subclasses have their own schema
+        cached = cls.__dict__.get("_openai_schema_cache")
+        if cached is None or cached[0] != key:
+            cached = (key, cls._build_openai_schema())
+            cls._openai_schema_cache = cached
+        return _copy_json(cached[1])
+
+    @classmethod
+    def _build_openai_schema(cls) -> dict[str, Any]:
         schema = cls.model_json_schema()
         docstring = parse(cls.__doc__ or "")
         parameters = {
@@ -89,7 +177,7 @@ class BaseTool(BaseModel, ABC):
             "parameters": parameters,
         }
 
-        strict = getattr(cls.ToolConfig, "strict", False)
+        strict = cls._tool_config.strict
         if strict:
             schema["strict"] = True
             schema["parameters"]["additionalProperties"] = False
@@ -100,6 +188,54 @@ class BaseTool(BaseModel, ABC):
 
         return schema
 
+    @classmethod
+    def invalidate_openai_schema(cls) -> None:
+        """Drop the cached `openai_schema` of the class and its subclasses, e.g. after changing its fields."""
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            if "_openai_schema_cache" in klass.__dict__:
+                klass._openai_schema_cache = None
+            classes.extend(klass.__subclasses__())
+
+    @classmethod
+    def model_rebuild(
+        cls,
+        *,
+        force: bool = False,
+        raise_errors: bool = True,
+        _parent_namespace_depth: int = 2,
+        _types_namespace: Any = None,
+    ) -> Optional[bool]:
+        cls.invalidate_openai_schema()
+        return super().model_rebuild(
+            force=force,
+            raise_errors=raise_errors,
+            _parent_namespace_depth=_parent_namespace_depth + 1,
+            _types_namespace=_types_namespace,
+        )
+
     @abstractmethod
-    def run(self):
+    def run(self) -> Any:
+        """
+        Execute the tool and return its output.
+
+        Can also be defined as `async def run`. Async tools start as soon as the agent calls them and run on
+        the shared event loop, concurrently with the other tool calls of the same step, so they must not
+        block the loop.
+        """
         pass
+
+    @classmethod
+    def run_batch(cls, instances: List["BaseTool"]) -> List[Any]:
+        """
+        Execute several calls of the tool at once and return their outputs, in the same order.
+
+        Used instead of `run` for the parallel calls of a step when `ToolConfig.batchable` is True. Override it
+        to make a single bulk request or a vectorized computation. Can also be defined as an async method.
+        The default implementation calls `run` on each instance.
+        """
+        return [instance.run() for instance in instances]
+
+
+BaseTool.refresh_tool_config()
@@ -0,0 +1,131 @@
+import asyncio
+import atexit
+import concurrent.futures
+import importlib.util
+import logging
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from agency_swarm.util.helpers.event_loop import BackgroundEventLoop, get_shared_loop
+
+logger = logging.getLogger(__name__)
+
+# Methods that can be sent again without side effects
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class HttpClientPool:
+    """
+    Keep-alive HTTP clients shared by the tools generated from OpenAPI schemas, one per server
+    (scheme, host and port), so consecutive calls to the same API reuse their connections instead of
+    opening a new TCP and TLS connection each time.
+
+    The clients run on the shared background event loop and can be used from any thread or event loop.
+    Failed connections are retried, and so are idempotent requests answered with 429, 502, 503 or 504,
+    with exponential backoff. Clients are created on first use and closed by `close()` or at interpreter
+    exit. The default pool, `ToolFactory.http_client_pool`, is shared by all agencies, so deleting an agency
+    doesn't close it.
+
+    Args:
+        max_connections: Maximum number of connections per server.
+        max_keepalive_connections: Maximum number of idle connections kept open per server.
+        keepalive_expiry: Seconds an idle connection is kept open.
+        timeout: Read, write and pool timeout of a request, in seconds.
+        connect_timeout: Timeout to establish a connection, in seconds.
+        retries: Number of times a failed request is retried.
+        backoff_factor: Seconds to wait before the first retry, doubled for each further retry.
+        http2: Use HTTP/2 when the server supports it. Requires the `h2` package.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 90.0,
+        connect_timeout: float = 10.0,
+        retries: int = 2,
+        backoff_factor: float = 0.5,
+        http2: bool = False,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError("HTTP/2 requires the h2 package. Install it with `pip install httpx[http2]`.")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.http2 = http2
+        self._clients: Dict[str, Tuple[BackgroundEventLoop, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _get_client(self, key: str) -> Tuple[BackgroundEventLoop, httpx.AsyncClient]:
+        with self._lock:
+            if key not in self._clients:
+                # The transport retries requests that failed to connect
+                transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2, retries=self.retries)
+                client = httpx.AsyncClient(timeout=self.timeout, transport=transport)
+                self._clients[key] = (get_shared_loop(f"http:{key}"), client)
+            return self._clients[key]
+
+    def _retry_delay(self, attempt: int, response: httpx.Response) -> float:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+        return self.backoff_factor * 2 ** (attempt - 1)
+
+    async def _send(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = await client.request(method, url, **kwargs)
+            if (
+                attempt >= self.retries
+                or method.upper() not in _IDEMPOTENT_METHODS
+                or response.status_code not in _RETRY_STATUSES
+            ):
+                return response
+            attempt += 1
+            delay = self._retry_delay(attempt, response)
+            logger.debug(f"Retrying {method.upper()} {url} after {response.status_code} in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request with the pooled client of the url's server. Accepts the arguments of `httpx.request`."""
+        runtime, client = self._get_client(self._key(url))
+        coro = self._send(client, method, url, **kwargs)
+        if runtime.in_loop_thread():
+            return await coro
+        # Cancelling the awaiting task cancels the request
+        return await asyncio.wrap_future(runtime.submit(coro))
+
+    def close(self) -> None:
+        """Close all clients and their connections. Clients are created again on the next request."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for runtime, client in clients:
+            if not runtime.is_running():
+                continue
+            future = runtime.submit(client.aclose())
+            if runtime.in_loop_thread():
+                continue
+            try:
+                future.result(timeout=5)
+            except (concurrent.futures.TimeoutError, RuntimeError) as e:
+                logger.warning(f"Failed to close HTTP client: {e}")
+
+    def stats(self) -> dict:
+        return {"clients": len(self._clients)}
@@ -0,0 +1,168 @@
+import copy
+import threading
+from typing import Any, Callable, ClassVar, Dict, Optional, Type
+
+from .BaseTool import BaseTool, _BaseToolMeta, classproperty
+
+# Keywords kept in the served schema, like in the schema of the built model. Extensions and OpenAPI-only
+# keywords such as `example` are dropped, `nullable` is turned into a null type.
+_SCHEMA_KEYWORDS = {
+    "type",
+    "properties",
+    "required",
+    "items",
+    "prefixItems",
+    "additionalProperties",
+    "enum",
+    "const",
+    "anyOf",
+    "oneOf",
+    "allOf",
+    "$ref",
+    "$defs",
+    "definitions",
+    "title",
+    "description",
+    "default",
+    "format",
+    "pattern",
+    "minLength",
+    "maxLength",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "multipleOf",
+    "minItems",
+    "maxItems",
+    "uniqueItems",
+    "examples",
+}
+
+
+def _nullable(schema: Dict[str, Any]) -> Dict[str, Any]:
+    schema_type = schema.get("type")
+    if isinstance(schema_type, str) and schema_type != "null":
+        return {**schema, "type": [schema_type, "null"]}
+    if isinstance(schema_type, list):
+        return schema if "null" in schema_type else {**schema, "type": [*schema_type, "null"]}
+    if any(option.get("type") == "null" for option in schema.get("anyOf", []) if isinstance(option, dict)):
+        return schema
+    return {"anyOf": [schema, {"type": "null"}]}
+
+
+def _normalize(schema: Any, strict: bool) -> Any:
+    """
+    Normalize a JSON schema like the schema of a built model: unknown keywords are dropped, and in strict mode
+    every object forbids additional properties, and its optional properties without a default are required but
+    nullable.
+    """
+    if isinstance(schema, list):
+        return [_normalize(item, strict) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    normalized = {}
+    for key, value in schema.items():
+        if key not in _SCHEMA_KEYWORDS:
+            continue
+        if key in ("properties", "$defs", "definitions"):
+            normalized[key] = {name: _normalize(item, strict) for name, item in value.items()}
+        elif key in ("items", "additionalProperties", "anyOf", "oneOf", "allOf", "prefixItems"):
+            normalized[key] = _normalize(value, strict)
+        else:
+            normalized[key] = copy.deepcopy(value)
+    if schema.get("nullable") is True:
+        normalized = _nullable(normalized)
+
+    schema_type = normalized.get("type")
+    is_object = (
+        "properties" in normalized
+        or schema_type == "object"
+        or (isinstance(schema_type, list) and "object" in schema_type)
+    )
+    # Maps (additionalProperties with a schema) are left as they are
+    if strict and is_object and not isinstance(normalized.get("additionalProperties"), dict):
+        properties = normalized.setdefault("properties", {})
+        required = set(normalized.get("required", []))
+        for name, prop in properties.items():
+            if name not in required and "default" not in prop:
+                properties[name] = _nullable(prop)
+        normalized["required"] = sorted(name for name, prop in properties.items() if "default" not in prop)
+        normalized["additionalProperties"] = False
+    return normalized
+
+
+class _LazyToolMeta(_BaseToolMeta):
+    def __call__(cls, *args, **kwargs):
+        # Instances are created from the materialized tool, with the Pydantic model of the parameters
+        return cls.materialize()(*args, **kwargs)
+
+
+class LazyTool(BaseTool, metaclass=_LazyToolMeta):
+    """
+    Placeholder of a tool created from a JSON schema, whose Pydantic model is only built when needed.
+
+    `openai_schema` is served from the source schema, so agents can list the tool without building its
+    model. The model is built on first instantiation, or when the fields or the JSON schema of the model
+    are accessed, with `materialize()`. Use `ToolFactory.from_openai_schema(..., lazy=True)` to create them.
+    """
+
+    _source_schema: ClassVar[Dict[str, Any]] = None
+    _factory: ClassVar[Callable[[], Type[BaseTool]]] = None
+    _materialized: ClassVar[Optional[Type[BaseTool]]] = None
+    _materialize_lock: ClassVar[threading.Lock] = threading.Lock()
+    is_materialized: ClassVar[bool]
+    model_fields: ClassVar[Dict[str, Any]]
+
+    @classmethod
+    def materialize(cls) -> Type[BaseTool]:
+        """Build the tool with the Pydantic model of its parameters, once."""
+        if cls._materialized is None:
+            with cls._materialize_lock:
+                if cls._materialized is None:
+                    tool = cls._factory()
+                    tool.ToolConfig = cls.ToolConfig
+                    cls._materialized = tool
+        if cls._shared_state is not None:
+            cls._materialized._shared_state = cls._shared_state
+        return cls._materialized
+
+    @classproperty
+    def is_materialized(cls) -> bool:
+        return cls._materialized is not None
+
+    @classproperty
+    def openai_schema(cls) -> Dict[str, Any]:
+        source = cls._source_schema
+        strict = cls._tool_config.strict
+        parameters = {k: v for k, v in (source.get("parameters") or {}).items() if k not in ("title", "description")}
+        parameters = _normalize({"type": "object", **parameters}, strict)
+        parameters.setdefault("properties", {})
+        parameters["required"] = sorted(parameters.get("required", []))
+
+        schema = {
+            "name": source["name"],
+            "description": source.get("description")
+            or f"Correctly extracted `{source['name']}` with all the required parameters with correct types",
+            "parameters": parameters,
+        }
+        if strict:
+            schema["strict"] = True
+        return schema
+
+    @classproperty
+    def model_fields(cls):
+        return cls.materialize().model_fields
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs) -> Dict[str, Any]:
+        return cls.materialize().model_json_schema(*args, **kwargs)
+
+    @classmethod
+    def model_validate(cls, *args, **kwargs) -> BaseTool:
+        return cls.materialize().model_validate(*args, **kwargs)
+
+    @classmethod
+    def model_validate_json(cls, *args, **kwargs) -> BaseTool:
+        return cls.materialize().model_validate_json(*args, **kwargs)
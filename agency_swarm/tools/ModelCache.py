@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+import pydantic
+from pydantic import BaseModel
+
+from agency_swarm.util.helpers.cache_path import get_cache_path
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generated source changes in a way the generator versions don't capture
+_FORMAT_VERSION = 1
+
+
+def _generator_version() -> str:
+    try:
+        return version("datamodel-code-generator")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ModelCache:
+    """
+    Content-addressed cache of the Pydantic models that `ToolFactory.from_openai_schema` builds from JSON
+    schemas. Entries are keyed by a hash of the schema, the options and the versions of the code generator
+    and Pydantic, so identical schemas are only parsed once.
+
+    The memory tier keeps the built models of the process. The disk tier keeps the generated model sources
+    across restarts, so a cold start only compiles them, without parsing the schema or generating code.
+
+    Args:
+        max_entries: Maximum number of models kept in memory.
+        cache_dir: Directory of the disk tier. None disables it.
+    """
+
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._models: "OrderedDict[str, Type[BaseModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions = f"{_FORMAT_VERSION}:{_generator_version()}:{pydantic.VERSION}"
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ModelCache":
+        """
+        Create the default cache. The `AGENCY_SWARM_MODEL_CACHE` env variable selects the tiers:
+        "disk" (default) for memory and disk, "memory" for memory only, "off" to disable the cache.
+        """
+        mode = os.getenv("AGENCY_SWARM_MODEL_CACHE", "disk").lower()
+        if mode == "off":
+            return cls(max_entries=0)
+        return cls(cache_dir=get_cache_path("models") if mode == "disk" else None)
+
+    def key(self, parameters: Dict[str, Any], **options: Any) -> str:
+        payload = json.dumps([self._versions, parameters, options], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Type[BaseModel]]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.memory_hits += 1
+            return model
+
+    def put(self, key: str, model: Type[BaseModel]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load_source(self, key: str) -> Optional[str]:
+        """Return the stored model source, or None if there is none or it's corrupted."""
+        if self.cache_dir is None:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            source = data["source"]
+            if data.get("key") != key or data.get("source_hash") != hashlib.sha256(source.encode()).hexdigest():
+                raise ValueError("hash mismatch")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring invalid cached model {key}: {e}")
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        return source
+
+    def save_source(self, key: str, source: str) -> None:
+        if self.cache_dir is None:
+            return
+        data = {"key": key, "source_hash": hashlib.sha256(source.encode()).hexdigest(), "source": source}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Failed to save cached model {key}: {e}")
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the models kept in memory, and the stored sources if `disk` is True."""
+        with self._lock:
+            self._models.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._models),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
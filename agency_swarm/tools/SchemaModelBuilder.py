@@ -0,0 +1,235 @@
+import keyword
+import re
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from .BaseTool import BaseTool
+
+_PRIMITIVES = {"string": str, "integer": int, "number": float, "boolean": bool, "null": type(None)}
+
+_CONSTRAINTS = {
+    "minLength": "min_length",
+    "maxLength": "max_length",
+    "pattern": "pattern",
+    "minimum": "ge",
+    "maximum": "le",
+    "exclusiveMinimum": "gt",
+    "exclusiveMaximum": "lt",
+    "multipleOf": "multiple_of",
+    "minItems": "min_length",
+    "maxItems": "max_length",
+}
+
+# Keywords kept in the generated JSON schema, even though they don't affect the Python type
+_EXTRA_KEYWORDS = ("format", "examples", "deprecated")
+
+
+class SchemaModelBuilder:
+    """
+    Builds Pydantic models directly from a JSON schema with `create_model`, without generating and
+    executing source code.
+
+    Supports `$defs`/`definitions`/`components` references (including recursive ones), enums, `anyOf`/`oneOf`
+    unions, `allOf` of objects, nullable types (`"type": [..., "null"]` and OpenAPI's `nullable`), nested
+    objects, arrays and maps. Property names that aren't valid Python identifiers get an alias.
+
+    Args:
+        schema: JSON schema of an object.
+        strict: If True, optional properties without a default are required but nullable, like in OpenAI's
+            strict mode.
+    """
+
+    def __init__(self, schema: Dict[str, Any], strict: bool = False):
+        self.schema = schema
+        self.strict = strict
+        self._models: Dict[str, Type[BaseModel]] = {}
+        self._refs: Dict[str, Any] = {}
+        self._building: Dict[str, str] = {}
+
+    def build(self, name: str = "Model") -> Type[BaseModel]:
+        model = self._object_model(self.schema, name)
+        # Resolve the forward references of recursive models
+        namespace = dict(self._models)
+        for built in self._models.values():
+            built.model_rebuild(force=True, _types_namespace=namespace)
+        return model
+
+    def _unique_name(self, name: str) -> str:
+        name = re.sub(r"\W", "_", name) or "Model"
+        # Same class names as the generated models, e.g. DateRange for a DateRangeSchema
+        if name.endswith("Schema") and len(name) > len("Schema"):
+            name = name[: -len("Schema")]
+        if name[0].isdigit():
+            name = f"Model{name}"
+        candidate, index = name, 1
+        while candidate in self._models or candidate in self._building.values():
+            candidate = f"{name}{index}"
+            index += 1
+        return candidate
+
+    def _resolve_ref(self, ref: str) -> Tuple[Dict[str, Any], str]:
+        if not ref.startswith("#/"):
+            raise ValueError(f"Unsupported reference {ref}, only local references are supported")
+        node: Any = self.schema
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, dict) or part not in node:
+                raise ValueError(f"Unresolvable reference {ref}")
+            node = node[part]
+        return node, ref.rsplit("/", 1)[-1]
+
+    def _type(self, schema: Any, name: str) -> Any:
+        """Python type of a schema. `name` is used for the models of nested objects."""
+        if schema is True or not schema:
+            return Any
+        if "$ref" in schema:
+            return self._ref_type(schema["$ref"])
+
+        nullable = schema.get("nullable", False)
+        if "const" in schema:
+            python_type = Literal[schema["const"]]
+        elif "enum" in schema:
+            values = [value for value in schema["enum"] if value is not None]
+            nullable = nullable or len(values) < len(schema["enum"])
+            python_type = Literal[tuple(values)] if values else type(None)
+        elif "anyOf" in schema or "oneOf" in schema:
+            options = schema.get("anyOf") or schema.get("oneOf")
+            python_type = self._union([self._type(option, f"{name}{index}") for index, option in enumerate(options)])
+        elif "allOf" in schema:
+            python_type = self._all_of(schema, name)
+        else:
+            schema_type = schema.get("type")
+            if isinstance(schema_type, list):
+                types = [t for t in schema_type if t != "null"]
+                nullable = nullable or len(types) < len(schema_type)
+                python_type = self._union([self._type({**schema, "type": t}, name) for t in types])
+            elif schema_type == "array":
+                python_type = List[self._type(schema.get("items"), f"{name}Item")]
+            elif schema_type == "object" or (schema_type is None and "properties" in schema):
+                python_type = self._object_type(schema, name)
+            elif schema_type in _PRIMITIVES:
+                python_type = _PRIMITIVES[schema_type]
+            else:
+                python_type = Any
+        return Optional[python_type] if nullable and python_type is not Any else python_type
+
+    @staticmethod
+    def _union(types: List[Any]) -> Any:
+        unique = list(dict.fromkeys(types))
+        if not unique:
+            return Any
+        return unique[0] if len(unique) == 1 else Union[tuple(unique)]
+
+    def _ref_type(self, ref: str) -> Any:
+        if ref in self._refs:
+            return self._refs[ref]
+        if ref in self._building:
+            # Recursive reference, resolved when the models are rebuilt
+            return self._building[ref]
+        target, ref_name = self._resolve_ref(ref)
+        if self._is_object(target):
+            model_name = self._unique_name(target.get("title") or ref_name)
+            self._building[ref] = model_name
+            try:
+                python_type = self._object_model(target, model_name)
+            finally:
+                del self._building[ref]
+        else:
+            python_type = self._type(target, ref_name)
+        self._refs[ref] = python_type
+        return python_type
+
+    @staticmethod
+    def _is_object(schema: Dict[str, Any]) -> bool:
+        return isinstance(schema, dict) and "properties" in schema
+
+    def _all_of(self, schema: Dict[str, Any], name: str) -> Any:
+        parts = [self._resolve_ref(part["$ref"])[0] if "$ref" in part else part for part in schema["allOf"]]
+        if len(parts) == 1:
+            return self._type({**{k: v for k, v in schema.items() if k != "allOf"}, **parts[0]}, name)
+        merged: Dict[str, Any] = {"type": "object", "properties": {}, "required": []}
+        for part in parts:
+            merged["properties"].update(part.get("properties", {}))
+            merged["required"].extend(part.get("required", []))
+        if "description" in schema:
+            merged["description"] = schema["description"]
+        return self._object_type(merged, name)
+
+    def _object_type(self, schema: Dict[str, Any], name: str) -> Any:
+        if "properties" not in schema:
+            additional = schema.get("additionalProperties")
+            value_type = self._type(additional, f"{name}Value") if isinstance(additional, dict) else Any
+            return Dict[str, value_type]
+        return self._object_model(schema, self._unique_name(schema.get("title") or name))
+
+    @staticmethod
+    def _class_name(property_name: str) -> str:
+        return "".join(part[:1].upper() + part[1:] for part in re.split(r"[\W_]+", property_name)) or "Model"
+
+    def _field_name(self, name: str, taken: set) -> str:
+        field_name = re.sub(r"\W", "_", name)
+        if not field_name or field_name[0].isdigit() or field_name[0] == "_":
+            field_name = f"field_{field_name.lstrip('_')}"
+        if keyword.iskeyword(field_name) or hasattr(BaseTool, field_name):
+            field_name = f"{field_name}_"
+        while field_name in taken:
+            field_name = f"{field_name}_"
+        return field_name
+
+    @staticmethod
+    def _constraints(schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Field arguments of the validation keywords of a property."""
+        constraints = {}
+        for key, argument in _CONSTRAINTS.items():
+            value = schema.get(key)
+            # Booleans are ints, but a boolean exclusiveMinimum/exclusiveMaximum is the draft-4 form
+            if value is not None and not isinstance(value, bool) and isinstance(value, (int, float, str)):
+                constraints[argument] = value
+        # Draft 4: "exclusiveMinimum": true makes "minimum" exclusive
+        for flag, bound, inclusive, exclusive in (
+            ("exclusiveMinimum", "minimum", "ge", "gt"),
+            ("exclusiveMaximum", "maximum", "le", "lt"),
+        ):
+            if schema.get(flag) is True and inclusive in constraints:
+                constraints[exclusive] = constraints.pop(inclusive)
+        return constraints
+
+    def _object_model(self, schema: Dict[str, Any], name: str) -> Type[BaseModel]:
+        required = set(schema.get("required", []))
+        fields: Dict[str, Any] = {}
+        for property_name, property_schema in schema.get("properties", {}).items():
+            property_schema = property_schema if isinstance(property_schema, dict) else {}
+            field_name = self._field_name(property_name, set(fields))
+            python_type = self._type(property_schema, self._class_name(property_name))
+
+            kwargs: Dict[str, Any] = {}
+            if field_name != property_name:
+                kwargs["alias"] = property_name
+            for key in ("title", "description"):
+                if key in property_schema:
+                    kwargs[key] = property_schema[key]
+            kwargs.update(self._constraints(property_schema))
+            extra = {key: property_schema[key] for key in _EXTRA_KEYWORDS if key in property_schema}
+            if "example" in property_schema and "examples" not in extra:
+                # OpenAPI's singular example
+                extra["examples"] = [property_schema["example"]]
+            if extra:
+                kwargs["json_schema_extra"] = extra
+
+            if property_name in required:
+                default = property_schema.get("default", ...)
+            else:
+                python_type = Optional[python_type] if python_type is not Any else python_type
+                default = property_schema.get("default")
+                if self.strict and "default" not in property_schema:
+                    # Required but nullable, like the generated models in strict mode
+                    default = ...
+            fields[field_name] = (python_type, Field(default, **kwargs))
+
+        config = ConfigDict(populate_by_name=True)
+        if schema.get("additionalProperties") is False:
+            config["extra"] = "forbid"
+        model = create_model(name, __config__=config, __doc__=schema.get("description"), **fields)
+        self._models[name] = model
+        return model
@@ -0,0 +1,485 @@
+import asyncio
+import inspect
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Hashable, List, Literal, Optional
+
+from agency_swarm.util import metrics
+from agency_swarm.util.errors import ToolQueueFullError, ToolTimeoutError, ToolWorkerCrashedError
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_WAIT = metrics.histogram(
+    "agency_swarm_tool_queue_wait_seconds",
+    "Time tool calls spent waiting for an execution slot.",
+    ["tool"],
+)
+_QUEUED = metrics.gauge(
+    "agency_swarm_tool_queued",
+    "Number of tool calls waiting for an execution slot.",
+    ["tool"],
+)
+_RUNNING = metrics.gauge(
+    "agency_swarm_tool_running",
+    "Number of tool calls currently executing.",
+    ["tool"],
+)
+_REJECTED = metrics.counter(
+    "agency_swarm_tool_rejected_total",
+    "Number of tool calls rejected because the queue of the tool was full.",
+    ["tool"],
+)
+
+
+def _run_tool(tool_class, fields: dict):
+    """
+    Entry point for tools executed in a worker process. Only the tool class, sent by reference, and the
+    field values are transferred, not private attributes such as the caller agent.
+    """
+    return tool_class(**fields).run()
+
+
+def _preload(*tool_classes) -> None:
+    """Imports the modules of the tools, as a side effect of receiving them."""
+
+
+class _ProcessWorker:
+    """
+    A single warm worker process. Each worker has its own pool, so a crashing tool only fails the calls
+    running on its worker, which is then replaced.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pending = 0
+        # Incremented each time the process is replaced
+        self.generation = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._preloaded: List[type] = []
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1)
+        return self._pool
+
+    def start(self, tool_classes: List[type]) -> None:
+        """Start the process and import the tools in it."""
+        self._preloaded = list(dict.fromkeys(self._preloaded + list(tool_classes)))
+        self.pool.submit(_preload, *tool_classes)
+
+    def submit(self, fn, *args) -> Future:
+        future = self.pool.submit(fn, *args)
+        self.pending += 1
+        future.add_done_callback(self._finish)
+        return future
+
+    def _finish(self, future: Future) -> None:
+        self.pending -= 1
+
+    def restart(self, generation: Optional[int] = None) -> None:
+        """Replace a crashed process. Does nothing if the process of `generation` was already replaced."""
+        if generation is not None and generation != self.generation:
+            return
+        self.generation += 1
+        self.shutdown(wait=False)
+
+    def kill(self) -> None:
+        """Kill the process, interrupting the running call, and start a new one with the same tools."""
+        if self._pool is not None:
+            # ProcessPoolExecutor can't interrupt a running call, only killing its process stops it
+            for process in list((self._pool._processes or {}).values()):
+                process.kill()
+        self.restart()
+        if self._preloaded:
+            self.pool.submit(_preload, *self._preloaded)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+class _ToolQueue:
+    """Calls of a single tool waiting for a slot, grouped by client."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit: Optional[int] = None
+        self.running = 0
+        self.queued = 0
+        self.waiting: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+    def has_room(self) -> bool:
+        return self.limit is None or self.running < self.limit
+
+    def pop(self) -> asyncio.Future:
+        """Pop the oldest call of the next client, then move that client to the end of the line."""
+        client, calls = next(iter(self.waiting.items()))
+        future = calls.popleft()
+        if calls:
+            self.waiting.move_to_end(client)
+        else:
+            del self.waiting[client]
+        self.queued -= 1
+        return future
+
+    def remove(self, client: Hashable, future: asyncio.Future) -> None:
+        calls = self.waiting.get(client)
+        if calls is None or future not in calls:
+            return
+        calls.remove(future)
+        if not calls:
+            del self.waiting[client]
+        self.queued -= 1
+
+
+class _FairScheduler:
+    """
+    Grants execution slots to tool calls.
+
+    At most `capacity` calls run at once, and at most `limit` calls of each tool. Calls that can't run yet
+    wait in a queue per tool, bounded by `max_queue_size`. Free slots are handed out round robin across
+    tools, and within a tool round robin across clients, so a flood of calls to one tool, or from one
+    client, doesn't starve the others.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity
+        self.running = 0
+        self._tools: Dict[str, _ToolQueue] = {}
+        # Tools with waiting calls, in the order they get their next turn
+        self._turns: "OrderedDict[str, None]" = OrderedDict()
+
+    def _has_room(self) -> bool:
+        return self.capacity is None or self.running < self.capacity
+
+    def get_queue(self, tool_name: str) -> _ToolQueue:
+        if tool_name not in self._tools:
+            self._tools[tool_name] = _ToolQueue(tool_name)
+        return self._tools[tool_name]
+
+    async def acquire(
+        self,
+        tool_name: str,
+        client: Hashable = None,
+        limit: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+    ) -> None:
+        """
+        Wait for a slot to run a call of the tool.
+
+        Raises:
+            ToolQueueFullError: If `max_queue_size` calls of the tool are already waiting.
+        """
+        queue = self.get_queue(tool_name)
+        queue.limit = limit
+        if not queue.queued and queue.has_room() and self._has_room():
+            self._grant(queue)
+            return
+        if max_queue_size is not None and queue.queued >= max_queue_size:
+            _REJECTED.inc(tool=tool_name)
+            raise ToolQueueFullError(f"Too many queued calls for tool {tool_name}. Please retry later.")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.waiting.setdefault(client, deque()).append(future)
+        queue.queued += 1
+        self._turns.setdefault(tool_name)
+        _QUEUED.set(queue.queued, tool=tool_name)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted while the caller was being cancelled
+                self.release(tool_name)
+            else:
+                queue.remove(client, future)
+                if not queue.waiting:
+                    self._turns.pop(tool_name, None)
+                _QUEUED.set(queue.queued, tool=tool_name)
+            raise
+
+    def release(self, tool_name: str) -> None:
+        queue = self._tools[tool_name]
+        queue.running -= 1
+        self.running -= 1
+        _RUNNING.set(queue.running, tool=tool_name)
+        self._dispatch()
+
+    def _grant(self, queue: _ToolQueue) -> None:
+        queue.running += 1
+        self.running += 1
+        _RUNNING.set(queue.running, tool=queue.name)
+
+    def _dispatch(self) -> None:
+        granted = True
+        while granted and self._turns and self._has_room():
+            granted = False
+            for tool_name in list(self._turns):
+                if not self._has_room():
+                    break
+                queue = self._tools[tool_name]
+                if not queue.has_room():
+                    continue
+                future = queue.pop()
+                if queue.waiting:
+                    self._turns.move_to_end(tool_name)
+                else:
+                    del self._turns[tool_name]
+                _QUEUED.set(queue.queued, tool=tool_name)
+                if future.cancelled():
+                    granted = True
+                    continue
+                self._grant(queue)
+                future.set_result(None)
+                granted = True
+
+
+class _ToolStats:
+    def __init__(self, scheduler: _FairScheduler):
+        self.scheduler = scheduler
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    def record_duration(self, duration: float) -> None:
+        self.completed += 1
+        self.duration_total += duration
+        self.duration_max = max(self.duration_max, duration)
+
+    def to_dict(self, tool_name: str) -> dict:
+        queue = self.scheduler.get_queue(tool_name)
+        started = self.completed + queue.running
+        return {
+            "running": queue.running,
+            "queued": queue.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_avg": self.queue_wait_total / started if started else 0.0,
+            "queue_wait_max": self.queue_wait_max,
+            "duration_avg": self.duration_total / self.completed if self.completed else 0.0,
+            "duration_max": self.duration_max,
+        }
+
+
+class ToolExecutor:
+    """
+    Runs tool instances without blocking the event loop.
+
+    Async tools are awaited natively. Sync tools are offloaded to a thread pool or to warm worker
+    processes. Timeouts, concurrency limits, queue bounds and the executor can be set server-wide or per
+    tool with `ToolConfig.timeout`, `ToolConfig.max_concurrency`, `ToolConfig.max_queue_size` and
+    `ToolConfig.executor`, which take precedence. Tools with `ToolConfig.isolation = "subprocess"` always run
+    in a worker process. A process running a call that times out or is cancelled is killed and replaced.
+
+    Calls that can't run yet, because the tool is at its concurrency limit or all threads or worker
+    processes are busy, wait in a queue per tool. Free slots go round robin across tools and clients.
+
+    Process calls go to the least loaded worker, preferring the tool's own worker on ties, so the tool's
+    imports and caches stay warm.
+
+    Parameters:
+        executor: "thread" or "process". Tools executed in worker processes must be importable
+            and their fields and results must be picklable.
+        max_workers: Size of the thread pool. Defaults to the `TOOL_THREAD_POOL_SIZE` env variable or
+            min(32, cpus + 4). In "process" mode, also the default number of worker processes.
+        timeout: Default timeout in seconds for a single tool call. None disables it.
+        max_concurrency: Default maximum number of concurrent calls per tool. None disables it.
+        process_workers: Number of worker processes. Defaults to the number of cpus.
+        max_queue_size: Default maximum number of calls waiting per tool. Calls above it raise
+            ToolQueueFullError. None disables it.
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"] = "thread",
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Invalid executor '{executor}'. Use 'thread' or 'process'.")
+        if process_workers is None:
+            process_workers = max_workers if executor == "process" and max_workers else os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = int(os.getenv("TOOL_THREAD_POOL_SIZE", min(32, (os.cpu_count() or 1) + 4)))
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.process_workers = process_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._workers = [_ProcessWorker(index) for index in range(process_workers)]
+        self.max_queue_size = max_queue_size
+        # Sync tools share the threads or the worker processes, async tools only have per-tool limits
+        self._schedulers = {
+            "thread": _FairScheduler(max_workers),
+            "process": _FairScheduler(process_workers),
+            "async": _FairScheduler(),
+        }
+        self._stats: Dict[str, _ToolStats] = {}
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+        return self._pool
+
+    def get_executor(self, tool_class) -> str:
+        if tool_class._tool_config.isolation == "subprocess":
+            return "process"
+        executor = tool_class._tool_config.executor
+        return executor if executor is not None else self.executor
+
+    def warm_up(self, tool_classes: List[type]) -> None:
+        """
+        Start the worker processes of the given tools and import the tools there, without waiting.
+        Does nothing if none of the tools runs in a process.
+        """
+        tool_classes = [
+            tool_class
+            for tool_class in tool_classes
+            if self.get_executor(tool_class) == "process" and not inspect.iscoroutinefunction(tool_class.run)
+        ]
+        if not tool_classes:
+            return
+        for worker in self._workers:
+            worker.start([tool_class for tool_class in tool_classes if self._home(tool_class) is worker])
+
+    def _home(self, tool_class) -> _ProcessWorker:
+        return self._workers[zlib.crc32(tool_class.__name__.encode()) % len(self._workers)]
+
+    def _select_worker(self, tool_class) -> _ProcessWorker:
+        home = self._home(tool_class)
+        return min(self._workers, key=lambda worker: (worker.pending, worker is not home))
+
+    async def _run_in_process(self, tool_instance) -> Any:
+        tool_class = type(tool_instance)
+        worker = self._select_worker(tool_class)
+        fields = {field.alias or name: getattr(tool_instance, name) for name, field in tool_class.model_fields.items()}
+        generation = worker.generation
+        future = worker.submit(_run_tool, tool_class, fields)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            if generation == worker.generation:
+                logger.error(f"Worker process {worker.index} crashed while running {tool_class.__name__}, replacing it")
+            worker.restart(generation)
+            raise ToolWorkerCrashedError(f"Tool {tool_class.__name__} crashed its worker process.")
+        except asyncio.CancelledError:
+            # Timed out or cancelled while running, free the worker for the next calls
+            if future.running() and generation == worker.generation:
+                logger.warning(f"Killing worker process {worker.index} running {tool_class.__name__}")
+                worker.kill()
+            raise
+
+    def get_timeout(self, tool_class) -> Optional[float]:
+        timeout = tool_class._tool_config.timeout
+        return timeout if timeout is not None else self.timeout
+
+    def get_max_concurrency(self, tool_class) -> Optional[int]:
+        max_concurrency = tool_class._tool_config.max_concurrency
+        return max_concurrency if max_concurrency is not None else self.max_concurrency
+
+    def get_max_queue_size(self, tool_class) -> Optional[int]:
+        max_queue_size = tool_class._tool_config.max_queue_size
+        return max_queue_size if max_queue_size is not None else self.max_queue_size
+
+    def _get_scheduler(self, tool_instance) -> _FairScheduler:
+        if inspect.iscoroutinefunction(tool_instance.run):
+            return self._schedulers["async"]
+        return self._schedulers[self.get_executor(type(tool_instance))]
+
+    async def run(self, tool_instance, client: Hashable = None) -> Any:
+        """
+        Execute the tool and return its output.
+
+        Args:
+            tool_instance: The tool to run.
+            client: Identifies the caller, e.g. a session id. Waiting calls of a tool are served
+                round robin across clients.
+
+        Raises:
+            ToolQueueFullError: If the queue of the tool is full.
+            ToolTimeoutError: If the tool doesn't finish within its timeout.
+        """
+        tool_class = type(tool_instance)
+        tool_name = tool_class.__name__
+        timeout = self.get_timeout(tool_class)
+        scheduler = self._get_scheduler(tool_instance)
+        stats = self._stats.setdefault(tool_name, _ToolStats(scheduler))
+
+        start = time.perf_counter()
+        try:
+            await scheduler.acquire(
+                tool_name,
+                client,
+                limit=self.get_max_concurrency(tool_class),
+                max_queue_size=self.get_max_queue_size(tool_class),
+            )
+        except ToolQueueFullError:
+            stats.rejected += 1
+            raise
+        waited = time.perf_counter() - start
+        stats.record_wait(waited)
+        _QUEUE_WAIT.observe(waited, tool=tool_name)
+
+        try:
+            if inspect.iscoroutinefunction(tool_instance.run):
+                task = asyncio.ensure_future(tool_instance.run())
+            elif self.get_executor(tool_class) == "process":
+                task = asyncio.ensure_future(self._run_in_process(tool_instance))
+            else:
+                loop = asyncio.get_running_loop()
+                task = loop.run_in_executor(self.pool, tool_class.run, tool_instance)
+        except BaseException:
+            scheduler.release(tool_name)
+            raise
+        started = time.perf_counter()
+
+        def finish(_):
+            # Worker threads can't be interrupted, so the slot is only freed once the call actually finishes.
+            # Worker processes are killed instead.
+            stats.record_duration(time.perf_counter() - started)
+            scheduler.release(tool_name)
+
+        task.add_done_callback(finish)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            if isinstance(task, asyncio.Task):
+                task.cancel()
+            logger.warning(f"Tool {tool_name} timed out after {timeout}s")
+            raise ToolTimeoutError(f"Tool {tool_name} timed out after {timeout} seconds.")
+        except asyncio.CancelledError:
+            if isinstance(task, asyncio.Task):
+                task.cancel()
+            raise
+
+    def stats(self) -> Dict[str, dict]:
+        """Queue and latency statistics of each tool that has been called."""
+        return {tool_name: stats.to_dict(tool_name) for tool_name, stats in self._stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        for worker in self._workers:
+            worker.shutdown(wait=wait)
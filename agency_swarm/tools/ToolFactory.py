@@ -1,26 +1,50 @@
+import fnmatch
 import inspect
 import json
 import logging
 import os
 import sys
+import time
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple, Type, Union
 
-import httpx
-import jsonref
 from datamodel_code_generator import DataModelType, PythonVersion
 from datamodel_code_generator.model import get_data_model_types
 from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
 from pydantic import BaseModel
 
+from agency_swarm.util import metrics
+from agency_swarm.util.openapi import OpenAPIRefResolver
+
 from .BaseTool import BaseTool
+from .HttpClientPool import HttpClientPool
+from .LazyTool import LazyTool
+from .ModelCache import ModelCache
+from .SchemaModelBuilder import SchemaModelBuilder
 
 logger = logging.getLogger(__name__)
 
+_OPENAPI_DURATION = metrics.histogram(
+    "agency_swarm_openapi_load_seconds",
+    "Time spent creating tools from OpenAPI schemas, by phase.",
+    ["phase"],
+)
+
+_HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
 
 class ToolFactory:
+    # Models built from JSON schemas, shared by all tools with the same parameters
+    model_cache: ModelCache = ModelCache.from_env()
+    # Keep-alive HTTP clients of the tools created from OpenAPI schemas
+    http_client_pool: HttpClientPool = HttpClientPool()
+    # "codegen" generates and executes model sources, "native" builds the models directly with create_model
+    schema_engine: Literal["codegen", "native"] = os.getenv("AGENCY_SWARM_SCHEMA_ENGINE", "codegen")
+    # Whether tools created from schemas only build their parameters model when first used
+    lazy_tools: bool = os.getenv("AGENCY_SWARM_LAZY_TOOLS", "false").lower() in ("1", "true")
+
     @staticmethod
     def from_langchain_tools(tools: List) -> List[Type[BaseTool]]:
         """
@@ -72,24 +96,98 @@ class ToolFactory:
         return ToolFactory.from_openai_schema(format_tool_to_openai_function(tool), callback)
 
     @staticmethod
-    def from_openai_schema(schema: Dict[str, Any], callback: Any) -> Type[BaseTool]:
+    def from_openai_schema(
+        schema: Dict[str, Any],
+        callback: Any,
+        engine: Optional[Literal["codegen", "native"]] = None,
+        lazy: Optional[bool] = None,
+    ) -> Type[BaseTool]:
         """
         Converts an OpenAI schema into a BaseTool.
 
+        The parameters model is looked up in `ToolFactory.model_cache` first, so identical schemas are only
+        parsed and generated once.
+
         Parameters:
             schema: The OpenAI schema to convert.
             callback: The function to run when the tool is called.
+            engine: How the parameters model is built, "codegen" or "native". Defaults to
+                `ToolFactory.schema_engine`, set by the `AGENCY_SWARM_SCHEMA_ENGINE` env variable.
+            lazy: Whether to return a `LazyTool`, which only builds the parameters model when the tool is first
+                used. Defaults to `ToolFactory.lazy_tools`, set by the `AGENCY_SWARM_LAZY_TOOLS` env variable.
 
         Returns:
             A BaseTool.
         """
+        if lazy if lazy is not None else ToolFactory.lazy_tools:
+            return ToolFactory._create_lazy_tool(schema, callback, engine)
+
+        engine = engine or ToolFactory.schema_engine
+        if engine not in ("codegen", "native"):
+            raise ValueError(f"Invalid schema engine '{engine}'. Use 'codegen' or 'native'.")
+        strict = schema.get("strict", False)
+        cache = ToolFactory.model_cache
+        key = cache.key(schema["parameters"], strict=strict, engine=engine)
+        model = cache.get(key)
+        if model is None:
+            if engine == "native":
+                model = SchemaModelBuilder(schema["parameters"], strict=strict).build()
+            else:
+                source = cache.load_source(key)
+                if source is None:
+                    source = ToolFactory._generate_model_source(schema["parameters"], strict)
+                    cache.save_source(key, source)
+                model = ToolFactory._build_model(source, schema["name"])
+            cache.put(key, model)
+
+        class ToolConfig:
+            strict: bool = schema.get("strict", False)
+
+        tool = type(
+            schema["name"],
+            (BaseTool, model),
+            {
+                "__doc__": schema.get("description", ""),
+                "run": callback,
+            },
+        )
+
+        tool.ToolConfig = ToolConfig
+
+        return tool
+
+    @staticmethod
+    def _create_lazy_tool(schema: Dict[str, Any], callback: Any, engine: Optional[str] = None) -> Type[BaseTool]:
+        class ToolConfig:
+            strict: bool = schema.get("strict", False)
+
+        def factory() -> Type[BaseTool]:
+            return ToolFactory.from_openai_schema(schema, callback, engine=engine, lazy=False)
+
+        tool = type(
+            schema["name"],
+            (LazyTool,),
+            {
+                "__doc__": schema.get("description", ""),
+                "run": callback,
+                "_source_schema": schema,
+                "_factory": staticmethod(factory),
+            },
+        )
+        tool.ToolConfig = ToolConfig
+
+        return tool
+
+    @staticmethod
+    def _generate_model_source(parameters: Dict[str, Any], strict: bool = False) -> str:
+        """Generate the source code of a Pydantic model named `Model` from a JSON schema."""
         data_model_types = get_data_model_types(
             DataModelType.PydanticV2BaseModel,
             target_python_version=PythonVersion.PY_310,
         )
 
         parser = JsonSchemaParser(
-            json.dumps(schema["parameters"]),
+            json.dumps(parameters),
             data_model_type=data_model_types.data_model,
             data_model_root_type=data_model_types.root_model,
             data_model_field_type=data_model_types.field_model,
@@ -98,7 +196,7 @@ class ToolFactory:
             use_schema_description=True,
             validation=False,
             class_name="Model",
-            strip_default_none=schema.get("strict", False),  # default parameters are not supported in strict mode
+            strip_default_none=strict,  # default parameters are not supported in strict mode
             # custom_template_dir=Path('/path/to/data_schema_templates')
         )
 
@@ -116,8 +214,11 @@ class ToolFactory:
 
         # Rebuild the model to ensure it's fully defined
         result += "\n\nModel.model_rebuild(force=True)"
+        return result
 
-        # Execute the result to extract the model
+    @staticmethod
+    def _build_model(source: str, name: str) -> Type[BaseModel]:
+        """Execute a generated model source and return its `Model`."""
         exec_globals = {
             # We might not strictly need all these in globals anymore if they are imported in the string,
             # but keeping them shouldn't hurt.
@@ -137,34 +238,19 @@ class ToolFactory:
             "Enum": Enum,
         }
 
-        exec(result, exec_globals)
+        exec(source, exec_globals)
         model = exec_globals.get("Model")
 
         if not model:
-            raise ValueError(f"Could not extract model from schema {schema['name']}")
+            raise ValueError(f"Could not extract model from schema {name}")
 
         # --- FIX: Explicitly rebuild the generated model --- #
         try:
             model.model_rebuild(force=True)
         except Exception as e:
-            print(f"Warning: Could not rebuild model {schema['name']} after exec: {e}")
+            print(f"Warning: Could not rebuild model {name} after exec: {e}")
         # --- END FIX --- #
-
-        class ToolConfig:
-            strict: bool = schema.get("strict", False)
-
-        tool = type(
-            schema["name"],
-            (BaseTool, model),
-            {
-                "__doc__": schema.get("description", ""),
-                "run": callback,
-            },
-        )
-
-        tool.ToolConfig = ToolConfig
-
-        return tool
+        return model
 
     @staticmethod
     def from_openapi_schema(
@@ -172,6 +258,14 @@ class ToolFactory:
         headers: Dict[str, str] = None,
         params: Dict[str, Any] = None,
         strict: bool = False,
+        http_client_pool: Optional[HttpClientPool] = None,
+        include_tags: Optional[List[str]] = None,
+        exclude_tags: Optional[List[str]] = None,
+        include_paths: Optional[List[str]] = None,
+        exclude_paths: Optional[List[str]] = None,
+        include_operations: Optional[List[str]] = None,
+        exclude_operations: Optional[List[str]] = None,
+        lazy: Optional[bool] = None,
     ) -> List[Type[BaseTool]]:
         """
         Converts an OpenAPI schema into a list of BaseTools.
@@ -181,75 +275,153 @@ class ToolFactory:
             headers: The headers to use for requests.
             params: The parameters to use for requests.
             strict: Whether to use strict OpenAI mode.
+            http_client_pool: The pool of HTTP clients used by the tools. Defaults to `ToolFactory.http_client_pool`.
+            include_tags: Only convert the operations with one of these tags.
+            exclude_tags: Skip the operations with one of these tags.
+            include_paths: Only convert the operations whose path matches one of these glob patterns, e.g. "/users/*".
+            exclude_paths: Skip the operations whose path matches one of these glob patterns.
+            include_operations: Only convert the operations whose operationId matches one of these glob patterns.
+            exclude_operations: Skip the operations whose operationId matches one of these glob patterns.
+            lazy: Whether to only build the parameters model of a tool when it's first used. Defaults to
+                `ToolFactory.lazy_tools`.
         Returns:
             A list of BaseTools.
         """
-        if isinstance(schema, dict):
-            openapi_spec = schema
-            openapi_spec = jsonref.JsonRef.replace_refs(openapi_spec)
-        else:
-            openapi_spec = jsonref.loads(schema)
-        tools = []
+        started = time.perf_counter()
+        openapi_spec = json.loads(schema) if isinstance(schema, str) else schema
+        parsed = time.perf_counter()
+
+        # Select the operations before resolving anything
+        filters = {
+            "include_tags": include_tags,
+            "exclude_tags": exclude_tags,
+            "include_paths": include_paths,
+            "exclude_paths": exclude_paths,
+            "include_operations": include_operations,
+            "exclude_operations": exclude_operations,
+        }
+        resolver = OpenAPIRefResolver(openapi_spec)
+        operations = []
+        skipped = 0
+        for path, path_item in openapi_spec["paths"].items():
+            if "$ref" in path_item:
+                path_item = resolver.resolve(path_item)
+            for method, operation in path_item.items():
+                if method not in _HTTP_METHODS:
+                    continue
+                if ToolFactory._is_operation_selected(path, operation, **filters):
+                    operations.append((path, method, operation))
+                else:
+                    skipped += 1
+
         headers = headers or {}
         headers = {k: v for k, v in headers.items() if v is not None}
+        functions = []
+        for path, method, operation in operations:
+            # Use the callback factory to create a unique callback for each path/method
+            # This ensures each callback captures the correct path value
+            callback = ToolFactory._create_callback_for_path(
+                path, method, openapi_spec, params, headers, http_client_pool
+            )
 
-        for path, methods in openapi_spec["paths"].items():
-            for method, spec_with_ref in methods.items():
-                # Use the callback factory to create a unique callback for each path/method
-                # This ensures each callback captures the correct path value
-                callback = ToolFactory._create_callback_for_path(path, method, openapi_spec, params, headers)
-
-                # 1. Resolve JSON references.
-                spec = jsonref.replace_refs(spec_with_ref)
-
-                # 2. Extract a name for the functions.
-                function_name = spec.get("operationId")
-
-                # 3. Extract a description and parameters.
-                desc = spec.get("description") or spec.get("summary", "")
-
-                schema = {"type": "object", "properties": {}}
-
-                req_body = spec.get("requestBody", {}).get("content", {}).get("application/json", {}).get("schema")
-                if req_body:
-                    schema["properties"]["requestBody"] = req_body
-
-                spec_params = spec.get("parameters", [])
-                if spec_params:
-                    param_properties = {}
-                    required_params = []
-                    for param in spec_params:
-                        if "schema" not in param and "type" in param:
-                            param["schema"] = {"type": param["type"]}
-                        param_properties[param["name"]] = param["schema"]
-                        if "description" in param:
-                            param_properties[param["name"]]["description"] = param["description"]
-                        if "required" in param and param["required"]:
-                            required_params.append(param["name"])
-                        if "example" in param:
-                            param_properties[param["name"]]["example"] = param["example"]
-                        if "examples" in param:
-                            param_properties[param["name"]]["examples"] = param["examples"]
-
-                    schema["properties"]["parameters"] = {
-                        "type": "object",
-                        "properties": param_properties,
-                        "required": required_params,
-                    }
-
-                function = {
-                    "name": function_name,
-                    "description": desc,
-                    "parameters": schema,
-                    "strict": strict,
+            # 1. Resolve JSON references. Components are resolved once and shared between operations.
+            spec = resolver.resolve(operation)
+
+            # 2. Extract a name for the functions.
+            function_name = spec.get("operationId")
+
+            # 3. Extract a description and parameters.
+            desc = spec.get("description") or spec.get("summary", "")
+
+            schema = {"type": "object", "properties": {}}
+
+            req_body = spec.get("requestBody", {}).get("content", {}).get("application/json", {}).get("schema")
+            if req_body:
+                schema["properties"]["requestBody"] = req_body
+
+            spec_params = spec.get("parameters", [])
+            if spec_params:
+                param_properties = {}
+                required_params = []
+                for param in spec_params:
+                    # Copy, the parameter schemas may be shared components
+                    param_schema = dict(param.get("schema") or {"type": param.get("type", "string")})
+                    for key in ("description", "example", "examples"):
+                        if key in param:
+                            param_schema[key] = param[key]
+                    param_properties[param["name"]] = param_schema
+                    if "required" in param and param["required"]:
+                        required_params.append(param["name"])
+
+                schema["properties"]["parameters"] = {
+                    "type": "object",
+                    "properties": param_properties,
+                    "required": required_params,
                 }
 
-                tools.append(ToolFactory.from_openai_schema(function, callback))
-
+            defs = resolver.get_defs(schema)
+            if defs:
+                schema["$defs"] = defs
+
+            functions.append(
+                (
+                    {
+                        "name": function_name,
+                        "description": desc,
+                        "parameters": schema,
+                        "strict": strict,
+                    },
+                    callback,
+                )
+            )
+        resolved = time.perf_counter()
+
+        tools = [ToolFactory.from_openai_schema(function, callback, lazy=lazy) for function, callback in functions]
+        finished = time.perf_counter()
+
+        _OPENAPI_DURATION.observe(parsed - started, phase="parse")
+        _OPENAPI_DURATION.observe(resolved - parsed, phase="resolve")
+        _OPENAPI_DURATION.observe(finished - resolved, phase="models")
+        logger.info(
+            f"Created {len(tools)} tools from OpenAPI schema in {finished - started:.2f}s "
+            f"(parse {parsed - started:.2f}s, resolve {resolved - parsed:.2f}s, models {finished - resolved:.2f}s), "
+            f"{skipped} operations filtered out"
+        )
         return tools
 
     @staticmethod
-    def _create_callback_for_path(path, method, openapi_spec, params, headers):
+    def _is_operation_selected(
+        path: str,
+        operation: Dict[str, Any],
+        include_tags: Optional[List[str]] = None,
+        exclude_tags: Optional[List[str]] = None,
+        include_paths: Optional[List[str]] = None,
+        exclude_paths: Optional[List[str]] = None,
+        include_operations: Optional[List[str]] = None,
+        exclude_operations: Optional[List[str]] = None,
+    ) -> bool:
+        tags = set(operation.get("tags", []))
+        operation_id = operation.get("operationId", "")
+
+        def matches(value: str, patterns: List[str]) -> bool:
+            return any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+
+        if include_tags is not None and not tags & set(include_tags):
+            return False
+        if exclude_tags and tags & set(exclude_tags):
+            return False
+        if include_paths is not None and not matches(path, include_paths):
+            return False
+        if exclude_paths and matches(path, exclude_paths):
+            return False
+        if include_operations is not None and not matches(operation_id, include_operations):
+            return False
+        if exclude_operations and matches(operation_id, exclude_operations):
+            return False
+        return True
+
+    @staticmethod
+    def _create_callback_for_path(path, method, openapi_spec, params, headers, http_client_pool=None):
         """
         Creates a callback function for a specific path and method.
         This is a factory function that captures the current values of path and method.
@@ -260,6 +432,8 @@ class ToolFactory:
             openapi_spec: The OpenAPI specification.
             params: Additional parameters to include in the request.
             headers: Headers to include in the request.
+            http_client_pool: The pool of HTTP clients to send the request with. Defaults to
+                `ToolFactory.http_client_pool`.
 
         Returns:
             An async callback function that makes the appropriate HTTP request.
@@ -276,31 +450,11 @@ class ToolFactory:
             url = url.rstrip("/")
             parameters = {k: v for k, v in parameters.items() if v is not None}
             parameters = {**parameters, **params} if params else parameters
-            async with httpx.AsyncClient(timeout=90) as client:  # Set custom read timeout to 10 seconds
-                if method == "get":
-                    response = await client.get(url, params=parameters, headers=headers)
-                elif method == "post":
-                    response = await client.post(
-                        url,
-                        params=parameters,
-                        json=self.model_dump().get("requestBody", None),
-                        headers=headers,
-                    )
-                elif method == "put":
-                    response = await client.put(
-                        url,
-                        params=parameters,
-                        json=self.model_dump().get("requestBody", None),
-                        headers=headers,
-                    )
-                elif method == "delete":
-                    response = await client.delete(
-                        url,
-                        params=parameters,
-                        json=self.model_dump().get("requestBody", None),
-                        headers=headers,
-                    )
-                return response.json()
+            # Only operations that declare a request body have the field
+            body = self.model_dump().get("requestBody", None)
+            pool = http_client_pool or ToolFactory.http_client_pool
+            response = await pool.request(method.upper(), url, params=parameters, json=body, headers=headers)
+            return response.json()
 
         return callback
 
@@ -343,7 +497,7 @@ class ToolFactory:
         return imported_class
 
     @staticmethod
-    def from_mcp(server):
+    def from_mcp(server, lazy: Optional[bool] = None):
         #  Do not pull tools from MCP server if pre-loaded tools are provided
         tool_definitions = server.list_tools()
         tools = []
@@ -392,7 +546,12 @@ class ToolFactory:
 
                     # Call the tool with just the arguments, not the whole model
                     try:
-                        result = server.call_tool(tool_name, args)
+                        timeout = self._tool_config.timeout
+                        if timeout is not None:
+                            # Also cancels the call on the server
+                            result = await server.acall_tool(tool_name, args, timeout=timeout)
+                        else:
+                            result = await server.acall_tool(tool_name, args)
                         logger.info(f"Tool {tool_name} output: {result}")
                     except Exception as e:
                         logger.error(f"Tool call failed: {type(e).__name__}: {e!r}")
@@ -417,6 +576,7 @@ class ToolFactory:
             tool = ToolFactory.from_openai_schema(
                 {"name": name, "description": description, "parameters": parameters, "strict": server.strict},
                 callback,
+                lazy=lazy,
             )
             tools.append(tool)
 
@@ -461,10 +621,9 @@ class ToolFactory:
                 continue
 
             openai_schema = tool.openai_schema
-            defs = {}
-            if "$defs" in openai_schema["parameters"]:
-                defs = openai_schema["parameters"]["$defs"]
-                del openai_schema["parameters"]["$defs"]
+            # The definitions are moved to the components
+            defs = openai_schema["parameters"].get("$defs", {})
+            parameters = {k: v for k, v in openai_schema["parameters"].items() if k != "$defs"}
 
             schema["paths"]["/" + openai_schema["name"]] = {
                 "post": {
@@ -472,7 +631,7 @@ class ToolFactory:
                     "operationId": openai_schema["name"],
                     "x-openai-isConsequential": False,
                     "parameters": [],
-                    "requestBody": {"content": {"application/json": {"schema": openai_schema["parameters"]}}},
+                    "requestBody": {"content": {"application/json": {"schema": parameters}}},
                 }
             }
 
@@ -2,4 +2,5 @@ from .BaseTool import BaseTool
 from .oai.CodeInterpreter import CodeInterpreter
 from .oai.FileSearch import FileSearch
 from .oai.Retrieval import Retrieval
+from .ToolExecutor import ToolExecutor
 from .ToolFactory import ToolFactory
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from agency_swarm.util.helpers.cache_path import get_cache_path
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir() -> Path:
+    """Directory of the MCP tool manifests. Set by the `AGENCY_SWARM_CACHE_DIR` env variable."""
+    return get_cache_path("mcp")
+
+
+def tool_to_dict(tool: Any) -> dict:
+    """Convert an MCP tool or a pre-loaded tool to a JSON serializable dict."""
+    if isinstance(tool, dict):
+        return {
+            "name": tool.get("name"),
+            "description": tool.get("description"),
+            "inputSchema": tool.get("inputSchema"),
+        }
+    input_schema = getattr(tool, "inputSchema")
+    if isinstance(input_schema, type):
+        input_schema = input_schema.model_json_schema()
+    return {"name": tool.name, "description": getattr(tool, "description", None), "inputSchema": input_schema}
+
+
+def schema_hash(tools: list[dict]) -> str:
+    return hashlib.sha256(json.dumps(tools, sort_keys=True).encode()).hexdigest()
+
+
+class ToolManifest:
+    """
+    Tools of an MCP server persisted on disk, so agents can be created without waiting for the server.
+
+    Args:
+        server_name: Name of the server.
+        identity: Describes how the server is started or reached (e.g. its command or url). Servers with
+            the same name but a different identity get separate manifests.
+    """
+
+    def __init__(self, server_name: str, identity: str = ""):
+        key = hashlib.sha256(f"{server_name}\0{identity}".encode()).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", server_name)[:64]
+        self.server_name = server_name
+        self.path = get_cache_dir() / f"{slug}-{key}.json"
+        self.hash: str | None = None
+
+    def load(self) -> list[dict] | None:
+        """Return the stored tools, or None if there is no valid manifest."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            tools = data["tools"]
+            if data.get("schema_hash") != schema_hash(tools):
+                raise ValueError("schema hash mismatch")
+            self.hash = data["schema_hash"]
+            return tools
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring invalid tool manifest of MCP server {self.server_name}: {e}")
+            return None
+
+    def save(self, tools: list[Any]) -> bool:
+        """Store the tools. Returns True if the manifest changed."""
+        tool_dicts = [tool_to_dict(tool) for tool in tools]
+        digest = schema_hash(tool_dicts)
+        if digest == (self.hash or self.stored_hash()):
+            self.hash = digest
+            return False
+        data = {"server": self.server_name, "schema_hash": digest, "updated_at": time.time(), "tools": tool_dicts}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so readers never see a partial manifest
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self.hash = digest
+        except OSError as e:
+            logger.warning(f"Failed to save tool manifest of MCP server {self.server_name}: {e}")
+            return False
+        logger.info(f"Saved tool manifest of MCP server {self.server_name} to {self.path}")
+        return True
+
+    def stored_hash(self) -> str | None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("schema_hash")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def delete(self) -> None:
+        self.hash = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
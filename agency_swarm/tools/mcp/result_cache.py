@@ -0,0 +1,109 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from mcp.types import CallToolResult
+
+from agency_swarm.util import metrics
+
+logger = logging.getLogger(__name__)
+
+_CACHE_LOOKUPS = metrics.counter(
+    "agency_swarm_mcp_result_cache_total",
+    "Number of MCP tool calls looked up in the client-side result cache.",
+    ["server", "tool", "result"],
+)
+
+
+class ToolResultCache:
+    """
+    Client-side cache of MCP tool call results, for read-only tools that are called repeatedly with the
+    same arguments. Results are keyed by tool name and arguments, expire after a TTL and the least
+    recently used entries are evicted above `max_entries`. Error results are not cached.
+
+    Results of calls that started before the cache was cleared are not stored, pass the `generation`
+    read before the call to `put`.
+
+    Args:
+        server_name: Name of the server, used to label the metrics.
+        tools: Names of the tools whose results are cached, or a mapping of tool names to their own TTL.
+        ttl: Default number of seconds a result is kept.
+        max_entries: Maximum number of results kept for the server.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        tools: list[str] | dict[str, float],
+        ttl: float = 60.0,
+        max_entries: int = 256,
+    ):
+        self.server_name = server_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._ttls = dict(tools) if isinstance(tools, dict) else {name: ttl for name in tools}
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, CallToolResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def is_cached(self, tool_name: str) -> bool:
+        return tool_name in self._ttls
+
+    @staticmethod
+    def _key(tool_name: str, arguments: dict[str, Any] | None) -> tuple[str, str]:
+        return tool_name, json.dumps(arguments or {}, sort_keys=True, default=str)
+
+    def get(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult | None:
+        """Return a copy of the cached result, or None if there is no fresh result."""
+        if not self.is_cached(tool_name):
+            return None
+        key = self._key(tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                result = "hit"
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                result = "miss"
+        _CACHE_LOOKUPS.inc(server=self.server_name, tool=tool_name, result=result)
+        # Copy, so callers modifying the result don't modify the cache
+        return entry[1].model_copy(deep=True) if result == "hit" else None
+
+    def put(self, tool_name: str, arguments: dict[str, Any] | None, result: CallToolResult, generation: int) -> None:
+        if not self.is_cached(tool_name) or getattr(result, "isError", False):
+            return
+        key = self._key(tool_name, arguments)
+        expires_at = time.monotonic() + self._ttls[tool_name]
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (expires_at, result.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                logger.debug(f"Clearing {len(self._entries)} cached tool results of MCP server {self.server_name}")
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,5 +1,7 @@
 import abc
 import asyncio
+import concurrent.futures
+import json
 import logging
 import os
 import tempfile
@@ -17,10 +19,15 @@ from mcp import Tool as MCPTool
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import GetSessionIdCallback, streamablehttp_client
 from mcp.shared.message import SessionMessage
-from mcp.types import CallToolResult, JSONRPCMessage
+from mcp.types import CallToolResult, JSONRPCMessage, ServerNotification, ToolListChangedNotification
 from pydantic import BaseModel
 from typing_extensions import NotRequired, TypedDict
 
+from agency_swarm.util.helpers.event_loop import get_shared_loop
+
+from .manifest import ToolManifest, tool_to_dict
+from .result_cache import ToolResultCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +94,23 @@ class MCPServer(abc.ABC):
         pass
 
 
+class _PooledSession:
+    """One connection to the server. Servers keep a pool of them and route calls to the least loaded."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session: ClientSession | None = None
+        self.task: asyncio.Task | None = None  # Owns the connection, see `_run_session`
+        self.stop: asyncio.Event | None = None
+        self.generation = 0  # Incremented on every (re)connection
+        self.in_flight = 0
+        self.reconnect_future: asyncio.Future | None = None
+
+    @property
+    def reconnecting(self) -> bool:
+        return self.reconnect_future is not None and not self.reconnect_future.done()
+
+
 class _MCPServerWithClientSession(MCPServer, abc.ABC):
     """Base class for MCP servers that use a `ClientSession` to communicate with the server."""
 
@@ -96,6 +120,12 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         strict: bool = False,
         allowed_tools: list[str] | None = None,
         pre_loaded_tools: list[MCPToolParams] | None = None,
+        max_concurrency: int | None = 10,
+        persist_tools_list: bool = False,
+        pool_size: int = 1,
+        cache_tool_results: list[str] | dict[str, float] | None = None,
+        tool_results_ttl: float = 60.0,
+        tool_results_max_entries: int = 256,
     ):
         """
         Args:
@@ -113,23 +143,54 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
                 2. Tools will not be fetched from the server,
                 3. Connection to the server will be delayed until first tool use.
                 4. No schema validation will be performed, make sure provided schemas are compatible with the server.
+            max_concurrency: Maximum number of requests sent to the server at the same time. Requests above the
+                limit wait for a free slot. None removes the limit.
+            persist_tools_list: Whether to store the tools list on disk. If a stored list is found, tools are
+                created from it and the connection is delayed until first tool use, like with `pre_loaded_tools`.
+                The stored list is refreshed in the background once connected and whenever the server
+                reports that its tools changed. Ignored if pre_loaded_tools are provided.
+            pool_size: Number of connections to the server. Each connection spawns its own process (stdio) or
+                opens its own session (HTTP). Calls go to the least loaded connection, and failed
+                connections are replaced while calls continue on the others.
+            cache_tool_results: Allowlist of read-only tools whose results are cached on the client, as a list
+                of tool names or a mapping of tool names to their own TTL in seconds.
+            tool_results_ttl: Default number of seconds cached results are kept.
+            tool_results_max_entries: Maximum number of cached results.
         """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
         self._initialized = False
+        self._max_concurrency = max_concurrency
+        self._pool_size = pool_size
+        self._init_lock = threading.Lock()
+        self._manifest = ToolManifest(self.name, self._manifest_identity()) if persist_tools_list else None
+        self._manifest_tools: list[MCPToolParams] | None = None
+        self.result_cache = (
+            ToolResultCache(self.name, cache_tool_results, ttl=tool_results_ttl, max_entries=tool_results_max_entries)
+            if cache_tool_results
+            else None
+        )
 
         if allowed_tools and not pre_loaded_tools:
             logger.warning("allowed_tools are not used if pre_loaded_tools are provided")
 
-        if pre_loaded_tools:
+        if self._manifest is not None and not pre_loaded_tools:
+            stored_tools = self._manifest.load()
+            if stored_tools is not None:
+                self._manifest_tools = [MCPToolParams(**tool) for tool in stored_tools]
+
+        if pre_loaded_tools or self._manifest_tools is not None:
             # Store parameters for later initialization
             self._cache_tools_list = cache_tools_list
             # Set minimal attributes needed for lazy mode
-            self.session = None
+            self._sessions: list[_PooledSession] = []
             self._strict = strict
             self._allowed_tools = allowed_tools
             self.pre_loaded_tools = pre_loaded_tools
         else:
-            # Normal initialization
-            self.init_server(cache_tools_list, strict, allowed_tools)
+            # Start connecting in the background, so that servers created together connect concurrently.
+            # Calls wait for the connection.
+            self.init_server(cache_tools_list, strict, allowed_tools, wait=False)
 
     def init_server(
         self,
@@ -137,10 +198,15 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         strict: bool = False,
         allowed_tools: list[str] | None = None,
         pre_loaded_tools: list[MCPToolParams] | None = None,
+        wait: bool = True,
     ):
-        """Perform the actual server initialization."""
-        self.session: ClientSession | None = None
-        self.exit_stack: AsyncExitStack = AsyncExitStack()
+        """
+        Perform the actual server initialization.
+
+        The connection is managed by a task on the shared MCP runtime loop, which hosts the sessions of all
+        servers in the process. If `wait` is False, returns without waiting for the connection.
+        """
+        self._sessions: list[_PooledSession] = []
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self._cache_tools_list = cache_tools_list
         self._strict = strict
@@ -150,47 +216,50 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         self._cache_dirty = True
         self._tools_list: list[MCPTool] | None = None
         self._sync_manager = None
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._loop = asyncio.new_event_loop()
+        self._runtime = get_shared_loop(self.name)
+        self._loop = self._runtime.loop
         self._queue = asyncio.Queue()
         self._shutdown_event = threading.Event()
         self._ready_event = threading.Event()
+        self._ready_future: Future = Future()
         self._startup_exception = None  # Store startup exception for detailed error reporting
-        self._thread.start()
-
+        self._closing = False
+        self._cancelled_tasks: set[asyncio.Task] = set()
+        self._main_future: Future = self._runtime.submit(self._main())
+
+        if not wait:
+            return
+        if self._runtime.in_loop_thread():
+            raise RuntimeError(f"Can't wait for MCP server '{self.name}' to connect from the MCP runtime loop.")
         # Wait for the connection to be established before returning
         if not self._ready_event.wait(timeout=20):
             raise TimeoutError("Server initialization timed out")
 
-    def _run_loop(self):
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_until_complete(self._main())
+    def _set_ready(self):
+        self._ready_event.set()
+        if not self._ready_future.done():
+            self._ready_future.set_result(None)
 
     async def _main(self):
         """
-        Main event loop for the background thread managing async MCP server operations.
+        Main task on the MCP runtime loop managing async MCP server operations.
 
-        Handles initial connection, dispatches synchronous method calls (connect, list_tools, call_tool, cleanup)
-        to their async counterparts, maintains proper cleanup and shutdown.
+        Handles the initial connection, cleanup and shutdown. Calls don't go through this task: every call runs
+        in its own task, so calls to the same server overlap, up to `max_concurrency` at a time.
         """
+        self._semaphore = asyncio.Semaphore(self._max_concurrency) if self._max_concurrency else None
+        self._pending_tasks: set[asyncio.Task] = set()
         try:
             await self._connect_async()
             self._initialized = True
-            self._ready_event.set()
+            self._set_ready()
+            if self._manifest_tools is not None:
+                # Tools were created from the stored list, check that it's still up to date
+                self._spawn(self._refresh_manifest())
             while True:
                 item = await self._queue.get()
                 if item == "SHUTDOWN":
                     break
-                method, args, result_future, timeout = item
-                try:
-                    coro = getattr(self, f"_{method}_async")(*args)
-                    result = await asyncio.wait_for(coro, timeout=timeout)
-                    result_future.set_result(result)
-                except asyncio.TimeoutError:
-                    result_future.set_exception(TimeoutError(f"MCP server call '{method}' timed out after {timeout}s"))
-                except BaseException as e:
-                    logger.error(f"Error in MCP server method '{method}': {e}")
-                    result_future.set_exception(e)                    
 
         except BaseException as e:
             # Extract the root cause from ExceptionGroup if present
@@ -198,17 +267,155 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
             # Store the actual meaningful exception for detailed error reporting
             self._startup_exception = root_exception
             # If connection fails, still signal ready event to unblock waiting calls
-            if not self._ready_event.is_set():
-                self._ready_event.set()
+            self._set_ready()
             logger.error(f"Error in MCP server main loop: {root_exception}")
             return  # Do not raise exceptions here as it leads to loop halting
 
         finally:
+            self._closing = True
+            pending = list(self._pending_tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
             # Cleanup must happen while the event loop is still active
             await self._cleanup_async()
             self._initialized = False  # Server is no longer functional
             self._shutdown_event.set()
 
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a task that is cancelled when the server shuts down."""
+        task = asyncio.create_task(coro)
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+        return task
+
+    def _start_call(self, method: str, args: tuple, result_future: Future, timeout: float | None):
+        """Start a call on the loop. Must run in the loop thread."""
+        if self._closing or not self._initialized:
+            if not result_future.done():
+                result_future.set_exception(RuntimeError("MCP server is not running or has been shut down."))
+            return
+        task = self._spawn(self._dispatch(method, args, result_future, timeout))
+        # Cancelling the caller's future cancels the call
+        result_future.add_done_callback(
+            lambda f: f.cancelled() and self._loop.call_soon_threadsafe(self._cancel_task, task)
+        )
+
+    async def _dispatch(self, method: str, args: tuple, result_future: Future, timeout: float | None):
+        """Run a single call and report its outcome to the caller's future."""
+        if result_future.cancelled():
+            return
+        try:
+            result = await asyncio.wait_for(self._run_method(method, args), timeout=timeout)
+            if not result_future.done():
+                result_future.set_result(result)
+        except asyncio.TimeoutError:
+            if not result_future.done():
+                result_future.set_exception(TimeoutError(f"MCP server call '{method}' timed out after {timeout}s"))
+        except asyncio.CancelledError:
+            result_future.cancel()
+        except BaseException as e:
+            logger.error(f"Error in MCP server method '{method}': {e}")
+            if not result_future.done():
+                result_future.set_exception(e)
+        finally:
+            self._cancelled_tasks.discard(asyncio.current_task())
+
+    async def _run_method(self, method: str, args: tuple):
+        if method == "connect":
+            # Connections are owned by the main task
+            await asyncio.gather(*(self._request_reconnect(pooled, pooled.generation) for pooled in self._sessions))
+            return
+        if self._semaphore is None:
+            return await getattr(self, f"_{method}_async")(*args)
+        async with self._semaphore:
+            return await getattr(self, f"_{method}_async")(*args)
+
+    def _cancel_task(self, task: asyncio.Task):
+        self._cancelled_tasks.add(task)
+        task.cancel()
+
+    def _is_cancelling(self) -> bool:
+        """Whether the current task is being cancelled, as opposed to failing because the connection closed."""
+        task = asyncio.current_task()
+        cancelling = getattr(task, "cancelling", None)  # Python 3.11+
+        if cancelling is not None and cancelling() > 0:
+            return True
+        return task in self._cancelled_tasks
+
+    def _request_reconnect(self, pooled: _PooledSession, generation: int) -> asyncio.Future:
+        """
+        Ask the main task to replace the connection of the given generation. Concurrent calls that fail on
+        the same connection share a single reconnection. Returns a future resolved once it's replaced.
+        """
+        if pooled.reconnecting:
+            return pooled.reconnect_future
+        future = self._loop.create_future()
+        if generation != pooled.generation:
+            future.set_result(None)  # Another call already reconnected
+            return future
+        # Stop routing calls to this connection
+        pooled.session = None
+        pooled.reconnect_future = future
+        self._spawn(self._handle_reconnect_request(pooled, future))
+        return future
+
+    async def _acquire_session(self) -> _PooledSession:
+        """Return the least loaded live connection, waiting for a replacement if none is live."""
+        while True:
+            live = [pooled for pooled in self._sessions if pooled.session is not None]
+            if live:
+                return min(live, key=lambda pooled: pooled.in_flight)
+            if not self._sessions:
+                raise UserError("Server not initialized. Make sure you call `connect()` first.")
+            futures = [
+                pooled.reconnect_future if pooled.reconnecting else self._request_reconnect(pooled, pooled.generation)
+                for pooled in self._sessions
+            ]
+            done, _ = await asyncio.wait([asyncio.shield(f) for f in futures], return_when=asyncio.FIRST_COMPLETED)
+            if not any(pooled.session is not None for pooled in self._sessions):
+                # Every finished reconnection failed
+                for f in done:
+                    f.result()
+
+    async def _with_session(self, fn):
+        """Run `fn(session)` on the least loaded connection, retrying once if that connection closes."""
+        pooled = await self._acquire_session()
+        generation = pooled.generation
+        pooled.in_flight += 1
+        try:
+            return await fn(pooled.session)
+        except BaseException as e:
+            # Check if it's a connection closed error and attempt to reconnect
+            if not self._is_connection_closed_error(e) or self._is_cancelling():
+                raise
+            # Closed connection error does not include an error message
+            error_message = e if str(e) != "" else type(e).__name__
+            logger.info(f"Connection closed, attempting to reconnect: {error_message}")
+            self._request_reconnect(pooled, generation)
+        finally:
+            pooled.in_flight -= 1
+
+        # Retry on another live connection, or on the replaced one
+        pooled = await self._acquire_session()
+        pooled.in_flight += 1
+        try:
+            return await fn(pooled.session)
+        finally:
+            pooled.in_flight -= 1
+
+    async def _handle_reconnect_request(self, pooled: _PooledSession, future: asyncio.Future):
+        try:
+            await self._reconnect_async(pooled)
+            future.set_result(None)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception in case every waiting call was cancelled
+            future.exception()
+
     @staticmethod
     def extract_error_from_log(log_file_path: str, errlog_handle=None) -> str | None:
         """
@@ -234,41 +441,53 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
                 time.sleep(0.2)
         return contents
 
-    def _call_in_loop(self, method, *args, timeout=120):
-        # Add a timeout to prevent indefinite hangs
-        if not self._ready_event.wait(timeout=10):
-            errlog = getattr(self, "_errlog_buffer", None)
-            if errlog:
-                error_message = self.extract_error_from_log(errlog.name, errlog)
-                if error_message and error_message.strip() != "":
-                    raise RuntimeError(error_message)
-                else:
-                    raise RuntimeError(
-                        "Failed to connect to the server. Please check if the server is running and accessible."
-                    )
+    def _raise_connection_error(self):
+        errlog = getattr(self, "_errlog_buffer", None)
+        if errlog:
+            error_message = self.extract_error_from_log(errlog.name, errlog)
+            if error_message and error_message.strip() != "":
+                raise RuntimeError(error_message)
             else:
-                # SSE servers do not support error logging, print generic message
                 raise RuntimeError(
                     "Failed to connect to the server. Please check if the server is running and accessible."
                 )
+        else:
+            # SSE servers do not support error logging, print generic message
+            raise RuntimeError(
+                "Failed to connect to the server. Please check if the server is running and accessible."
+            )
 
+    def _check_running(self):
         # Check if there was a startup exception
         if self._startup_exception is not None:
             raise RuntimeError(f"MCP server failed to start: {self._startup_exception}")
 
-        # Check if the server is still initialized (event loop is still running)
+        # Check if the server is still initialized (main task is still running)
         if not self._initialized:
             raise RuntimeError("MCP server is not running or has been shut down.")
 
+    def _call_in_loop(self, method, *args, timeout=120):
+        if self._runtime.in_loop_thread():
+            raise RuntimeError(
+                f"Synchronous MCP call '{method}' would block the MCP runtime loop. Use the async API instead."
+            )
+        # Add a timeout to prevent indefinite hangs
+        if not self._ready_event.wait(timeout=20):
+            self._raise_connection_error()
+        self._check_running()
+
         result_future = Future()
         try:
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, (method, args, result_future, timeout))
+            self._loop.call_soon_threadsafe(self._start_call, method, args, result_future, timeout)
             # Add timeout to prevent indefinite hanging if event loop crashes
-            import concurrent.futures
             return result_future.result(timeout=timeout + 2)  # Add 2 seconds buffer to method timeout
         except concurrent.futures.TimeoutError:
-            # Event loop likely crashed or is unresponsive
-            self._initialized = False
+            if result_future.done():
+                raise  # The call itself timed out
+            result_future.cancel()
+            if self._main_future.done():
+                # Main task crashed
+                self._initialized = False
             raise RuntimeError(f"MCP server operation '{method}' timed out - server may have crashed or become unresponsive")
 
     # Synchronous public methods
@@ -279,105 +498,197 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
     def list_tools(self):
         if self.pre_loaded_tools:
             return self.pre_loaded_tools
+        if self._manifest_tools is not None and not self._initialized:
+            return self._filter_allowed_tools(self._manifest_tools)
         self._ensure_initialized()
         return self._call_in_loop("list_tools", timeout=10)
 
     def call_tool(self, tool_name, arguments, timeout=120):
+        if (cached := self._get_cached_result(tool_name, arguments)) is not None:
+            return cached
+        generation = self.result_cache.generation if self.result_cache is not None else 0
         self._ensure_initialized()
-        return self._call_in_loop("call_tool", tool_name, arguments, timeout=timeout)
+        result = self._call_in_loop("call_tool", tool_name, arguments, timeout=timeout)
+        self._cache_result(tool_name, arguments, result, generation)
+        return result
 
     # TODO: Adjust cleanup to avoid http server warnings
     def cleanup(self):
         # Loop might not be initialized yet
         if hasattr(self, "_loop"):
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, "SHUTDOWN")
-            self._shutdown_event.wait()
-            self._loop.call_soon_threadsafe(self._loop.stop)
-            self._thread.join()
+            if not self._main_future.done():
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, "SHUTDOWN")
+                self._shutdown_event.wait()
+            if (errlog := getattr(self, "_errlog_buffer", None)) is not None:
+                self.extract_error_from_log(errlog.name, errlog)  # Delete the error log file
+
+    # Asynchronous public methods, for callers that already run in an event loop
+    async def _acall_in_loop(self, method, *args, timeout=120):
+        try:
+            # Shielded, so a caller giving up doesn't cancel the future shared by all callers
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self._ready_future)), timeout=20)
+        except asyncio.TimeoutError:
+            self._raise_connection_error()
+        self._check_running()
+
+        if asyncio.get_running_loop() is self._loop:
+            # Already on the MCP runtime loop, skip the queue and the thread hop
+            try:
+                return await asyncio.wait_for(self._run_method(method, args), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"MCP server call '{method}' timed out after {timeout}s")
+
+        # Cancelling the awaiting task cancels the future, which cancels the call
+        result_future = Future()
+        self._loop.call_soon_threadsafe(self._start_call, method, args, result_future, timeout)
+        return await asyncio.wrap_future(result_future)
+
+    async def alist_tools(self):
+        if self.pre_loaded_tools:
+            return self.pre_loaded_tools
+        if self._manifest_tools is not None and not self._initialized:
+            return self._filter_allowed_tools(self._manifest_tools)
+        self._ensure_initialized(wait=False)
+        return await self._acall_in_loop("list_tools", timeout=10)
+
+    async def acall_tool(self, tool_name, arguments, timeout=120):
+        if (cached := self._get_cached_result(tool_name, arguments)) is not None:
+            return cached
+        generation = self.result_cache.generation if self.result_cache is not None else 0
+        self._ensure_initialized(wait=False)
+        result = await self._acall_in_loop("call_tool", tool_name, arguments, timeout=timeout)
+        self._cache_result(tool_name, arguments, result, generation)
+        return result
+
+    def _get_cached_result(self, tool_name, arguments) -> CallToolResult | None:
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(tool_name, arguments)
+
+    def _cache_result(self, tool_name, arguments, result: CallToolResult, generation: int):
+        if self.result_cache is not None:
+            self.result_cache.put(tool_name, arguments, result, generation)
+
+    async def acleanup(self):
+        if hasattr(self, "_loop"):
+            if not self._main_future.done():
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, "SHUTDOWN")
+                await asyncio.wrap_future(self._main_future)
             if (errlog := getattr(self, "_errlog_buffer", None)) is not None:
                 self.extract_error_from_log(errlog.name, errlog)  # Delete the error log file
 
     # Async implementations
     async def _connect_async(self):
+        """Open every connection of the pool."""
+        self._sessions = [_PooledSession(index) for index in range(self._pool_size)]
         try:
-            # For HTTP clients, ensure we give enough time for the connection to establish
-            # and handle any initial connection retries that the client might need
-            transport = await self.exit_stack.enter_async_context(self.create_streams())
-            read, write = transport[:2]  # Take only first 2 values(ignore get_session_id from http server)
-            session = await self.exit_stack.enter_async_context(ClientSession(read, write))
-            await session.initialize()
-            self.session = session
+            await asyncio.gather(*(self._connect_session(pooled) for pooled in self._sessions))
+        except BaseException:
+            await self._cleanup_async()
+            raise
+
+    async def _connect_session(self, pooled: _PooledSession):
+        connected = self._loop.create_future()
+        pooled.stop = asyncio.Event()
+        pooled.task = asyncio.create_task(self._run_session(pooled, connected))
+        try:
+            await connected
         except asyncio.TimeoutError:
             logger.error("Session initialization timed out")
-            await self._cleanup_async()
             raise
         except BaseException as e:
             logger.error(f"Error initializing MCP server: {e}")
-            await self._cleanup_async()
             raise
 
-    async def _list_tools_async(self) -> list[MCPTool]:
-        if not self.session:
-            raise UserError("Server not initialized. Make sure you call `connect()` first.")
-
+    async def _run_session(self, pooled: _PooledSession, connected: asyncio.Future):
+        """
+        Open a connection and keep it until `pooled.stop` is set. Each connection is owned by its own task,
+        because the transports' cancel scopes must be exited by the task that entered them. This way a
+        connection can be replaced while calls continue on the others.
+        """
         try:
-            # Return from cache if caching is enabled, we have tools, and the cache is not dirty
-            if self._cache_tools_list and not self._cache_dirty and self._tools_list:
-                tools = self._tools_list
-            else:
-                # Reset the cache dirty to False
-                self._cache_dirty = False
-                # Fetch the tools from the server
-                self._tools_list = (await self.session.list_tools()).tools
-                tools = self._tools_list
+            async with AsyncExitStack() as exit_stack:
+                # For HTTP clients, ensure we give enough time for the connection to establish
+                # and handle any initial connection retries that the client might need
+                transport = await exit_stack.enter_async_context(self.create_streams())
+                read, write = transport[:2]  # Take only first 2 values(ignore get_session_id from http server)
+                session = await exit_stack.enter_async_context(
+                    ClientSession(read, write, message_handler=self._handle_message)
+                )
+                await session.initialize()
+                pooled.session = session
+                pooled.generation += 1
+                connected.set_result(None)
+                await pooled.stop.wait()
         except BaseException as e:
-            # Check if it's a connection closed error and attempt to reconnect
-            if self._is_connection_closed_error(e):
-                error_message = e if str(e) != "" else type(e).__name__
-                logger.info(f"Connection closed, attempting to reconnect: {error_message}")
-                await self._reconnect_async()
-                # Retry the operation after reconnection
-                if self._cache_tools_list and not self._cache_dirty and self._tools_list:
-                    tools = self._tools_list
-                else:
-                    self._cache_dirty = False
-                    self._tools_list = (await self.session.list_tools()).tools
-                    tools = self._tools_list
-            else:
-                raise
+            if not connected.done():
+                connected.set_exception(self._extract_root_exception(e))
+            elif not pooled.stop.is_set():
+                logger.warning(f"Connection {pooled.index} to MCP server {self.name} closed: {e}")
+        finally:
+            pooled.session = None
+
+    @property
+    def session(self) -> ClientSession | None:
+        """The least loaded live session, if any."""
+        live = [pooled for pooled in getattr(self, "_sessions", []) if pooled.session is not None]
+        return min(live, key=lambda pooled: pooled.in_flight).session if live else None
 
-        # Filter tools if allowed_tools is set
+    async def _list_tools_async(self) -> list[MCPTool]:
+        # Return from cache if caching is enabled, we have tools, and the cache is not dirty
+        if self._cache_tools_list and not self._cache_dirty and self._tools_list:
+            tools = self._tools_list
+        else:
+            # Reset the cache dirty to False
+            self._cache_dirty = False
+            # Fetch the tools from the server
+            self._tools_list = (await self._with_session(lambda session: session.list_tools())).tools
+            self._save_manifest(self._tools_list)
+            tools = self._tools_list
+
+        return self._filter_allowed_tools(tools)
+
+    def _filter_allowed_tools(self, tools: list) -> list:
         if self._allowed_tools is not None:
             tools = [tool for tool in tools if getattr(tool, "name", None) in self._allowed_tools]
         return tools
 
-    async def _call_tool_async(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
-        if not self.session:
-            raise UserError("Server not initialized. Make sure you call `connect()` first.")
+    def _manifest_identity(self) -> str:
+        """Describes how the server is reached, so that stored tool lists of different servers don't mix."""
+        return ""
+
+    def _save_manifest(self, tools: list[MCPTool]):
+        if self._manifest is not None and self._manifest.save(tools):
+            self._manifest_tools = [MCPToolParams(**tool_to_dict(tool)) for tool in tools]
 
+    async def _refresh_manifest(self):
         try:
-            result = await self.session.call_tool(tool_name, arguments)
-            return result
-        except BaseException as e:
-            # Check if it's a connection closed error and attempt to reconnect
-            if self._is_connection_closed_error(e):
-                # Closed connection error does not include an error message
-                error_message = e if str(e) != "" else type(e).__name__
-                logger.info(f"Connection closed, attempting to reconnect: {error_message}")
-                await self._reconnect_async()
-                # Retry the tool call after reconnection
-                return await self.session.call_tool(tool_name, arguments)
-            else:
-                raise
+            self._cache_dirty = True
+            await self._run_method("list_tools", ())
+        except Exception as e:
+            logger.warning(f"Failed to refresh the tools list of MCP server {self.name}: {e}")
+
+    async def _handle_message(self, message):
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logger.info(f"Tools of MCP server {self.name} changed")
+            self.invalidate_tools_cache()
+            if self._manifest is not None:
+                # Don't wait for the list here, responses are read by the same task
+                self._spawn(self._refresh_manifest())
+
+    async def _call_tool_async(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        return await self._with_session(lambda session: session.call_tool(tool_name, arguments))
+
+    async def _close_session(self, pooled: _PooledSession):
+        pooled.session = None
+        if pooled.task is not None:
+            pooled.stop.set()
+            # The task never raises, and must finish closing the transport even if this call is cancelled
+            await asyncio.shield(pooled.task)
 
     async def _cleanup_async(self):
         async with self._cleanup_lock:
-            try:
-                await self.exit_stack.aclose()
-                self.session = None
-            except BaseException as e:
-                logger.error(f"Error cleaning up server: {e}")
-                raise e
+            await asyncio.gather(*(self._close_session(pooled) for pooled in self._sessions))
 
     @property
     def strict(self) -> bool:
@@ -409,8 +720,10 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         pass
 
     def invalidate_tools_cache(self):
-        """Invalidate the tools cache."""
+        """Invalidate the tools cache and the cached tool results."""
         self._cache_dirty = True
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
     def _is_connection_closed_error(self, exception: Exception) -> bool:
         """Check if the exception indicates a closed connection."""
@@ -440,28 +753,24 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
 
         return any(indicator in exception_str for indicator in closed_indicators)
 
-    async def _reconnect_async(self):
-        """Reconnect to the server after a connection failure."""
-        logger.info("Attempting to reconnect to MCP server")
-
-        # Clean up the existing connection
-        try:
-            if self.session:
-                await self.exit_stack.aclose()
-                self.session = None
-        except BaseException as e:
-            logger.warning(f"Error during cleanup before reconnect: {e}")
+    async def _reconnect_async(self, pooled: _PooledSession | None = None):
+        """Reconnect to the server after a connection failure. Replaces the given connection, or all of them."""
+        for pooled in [pooled] if pooled is not None else self._sessions:
+            logger.info(f"Attempting to reconnect to MCP server (connection {pooled.index})")
 
-        # Reset the exit stack for new connection
-        self.exit_stack = AsyncExitStack()
+            # Clean up the existing connection
+            try:
+                await self._close_session(pooled)
+            except BaseException as e:
+                logger.warning(f"Error during cleanup before reconnect: {e}")
 
-        # Re-establish the connection
-        await self._connect_async()
+            # Re-establish the connection
+            await self._connect_session(pooled)
 
-        # Invalidate tools cache to ensure fresh data after reconnection
-        self._cache_dirty = True
+            # Invalidate tools cache and cached results to ensure fresh data after reconnection
+            self.invalidate_tools_cache()
 
-        logger.info("Successfully reconnected to MCP server")
+            logger.info("Successfully reconnected to MCP server")
 
     def _extract_root_exception(self, exception: Exception) -> Exception:
         """Extract the root cause exception from ExceptionGroups or return the original exception."""
@@ -475,10 +784,17 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
                     return sub_exception
         return exception
 
-    def _ensure_initialized(self):
+    def _is_connecting(self) -> bool:
+        main_future = getattr(self, "_main_future", None)
+        return main_future is not None and not main_future.done() and not self._ready_event.is_set()
+
+    def _ensure_initialized(self, wait: bool = True):
         """Ensure the server is initialized. If init_on_use was used, initialize now."""
-        if not self._initialized:
-            self.init_server(self._cache_tools_list, self._strict, self._allowed_tools, self.pre_loaded_tools)
+        with self._init_lock:
+            if not self._initialized and not self._is_connecting():
+                self.init_server(
+                    self._cache_tools_list, self._strict, self._allowed_tools, self.pre_loaded_tools, wait=wait
+                )
 
 
 class MCPServerStdioParams(TypedDict):
@@ -527,6 +843,12 @@ class MCPServerStdio(_MCPServerWithClientSession):
         strict: bool = False,
         allowed_tools: list[str] | None = None,
         pre_loaded_tools: list[MCPToolParams] | None = None,
+        max_concurrency: int | None = 10,
+        persist_tools_list: bool = False,
+        pool_size: int = 1,
+        cache_tool_results: list[str] | dict[str, float] | None = None,
+        tool_results_ttl: float = 60.0,
+        tool_results_max_entries: int = 256,
     ):
         """Create a new MCP server based on the stdio transport.
 
@@ -551,6 +873,17 @@ class MCPServerStdio(_MCPServerWithClientSession):
                 2. Tools will not be fetched from the server,
                 3. Connection to the server will be delayed until first tool use.
                 4. No schema validation will be performed, make sure provided schemas are compatible with the server.
+            max_concurrency: Maximum number of requests sent to the server at the same time. Defaults to 10.
+                None removes the limit.
+            persist_tools_list: Whether to store the tools list on disk, so that agents can be created
+                from it on the next start without waiting for the server. Defaults to `False`.
+            pool_size: Number of connections to keep to the server. Calls go to the least loaded one.
+                Defaults to 1.
+            cache_tool_results: Names of read-only tools whose results are cached on the client, or a mapping
+                of tool names to their own TTL in seconds. Calls with the same arguments are answered from
+                the cache. The cache is cleared by `invalidate_tools_cache()` and on reconnects.
+            tool_results_ttl: Number of seconds cached results are kept. Defaults to 60.
+            tool_results_max_entries: Maximum number of cached results. Defaults to 256.
         """
         # For backwards compatibility, if strict is not provided, check if it's in the params
         if not strict:
@@ -576,6 +909,12 @@ class MCPServerStdio(_MCPServerWithClientSession):
             strict=strict,
             allowed_tools=allowed_tools,
             pre_loaded_tools=pre_loaded_tools,
+            max_concurrency=max_concurrency,
+            persist_tools_list=persist_tools_list,
+            pool_size=pool_size,
+            cache_tool_results=cache_tool_results,
+            tool_results_ttl=tool_results_ttl,
+            tool_results_max_entries=tool_results_max_entries,
         )
 
     def create_streams(
@@ -595,6 +934,9 @@ class MCPServerStdio(_MCPServerWithClientSession):
         """A readable name for the server."""
         return self._name
 
+    def _manifest_identity(self) -> str:
+        return json.dumps([self.params.command, self.params.args, str(self.params.cwd or "")])
+
 
 class MCPServerSseParams(TypedDict):
     """Mirrors the params in`mcp.client.sse.sse_client`."""
@@ -629,6 +971,12 @@ class MCPServerSse(_MCPServerWithClientSession):
         strict: bool = False,
         allowed_tools: list[str] | None = None,
         pre_loaded_tools: list[MCPToolParams] | None = None,
+        max_concurrency: int | None = 10,
+        persist_tools_list: bool = False,
+        pool_size: int = 1,
+        cache_tool_results: list[str] | dict[str, float] | None = None,
+        tool_results_ttl: float = 60.0,
+        tool_results_max_entries: int = 256,
     ):
         """Create a new MCP server based on the HTTP with SSE transport.
 
@@ -654,6 +1002,17 @@ class MCPServerSse(_MCPServerWithClientSession):
                 2. Tools will not be fetched from the server,
                 3. Connection to the server will be delayed until first tool use.
                 4. No schema validation will be performed, make sure provided schemas are compatible with the server.
+            max_concurrency: Maximum number of requests sent to the server at the same time. Defaults to 10.
+                None removes the limit.
+            persist_tools_list: Whether to store the tools list on disk, so that agents can be created
+                from it on the next start without waiting for the server. Defaults to `False`.
+            pool_size: Number of connections to keep to the server. Calls go to the least loaded one.
+                Defaults to 1.
+            cache_tool_results: Names of read-only tools whose results are cached on the client, or a mapping
+                of tool names to their own TTL in seconds. Calls with the same arguments are answered from
+                the cache. The cache is cleared by `invalidate_tools_cache()` and on reconnects.
+            tool_results_ttl: Number of seconds cached results are kept. Defaults to 60.
+            tool_results_max_entries: Maximum number of cached results. Defaults to 256.
         """
         # For backwards compatibility, if strict is not provided, check if it's in the params
         if not strict:
@@ -668,6 +1027,12 @@ class MCPServerSse(_MCPServerWithClientSession):
             strict=strict,
             allowed_tools=allowed_tools,
             pre_loaded_tools=pre_loaded_tools,
+            max_concurrency=max_concurrency,
+            persist_tools_list=persist_tools_list,
+            pool_size=pool_size,
+            cache_tool_results=cache_tool_results,
+            tool_results_ttl=tool_results_ttl,
+            tool_results_max_entries=tool_results_max_entries,
         )
 
     def create_streams(
@@ -691,6 +1056,9 @@ class MCPServerSse(_MCPServerWithClientSession):
         """A readable name for the server."""
         return self._name
 
+    def _manifest_identity(self) -> str:
+        return self.params["url"]
+
 
 class MCPServerStreamableHttpParams(TypedDict):
     """Mirrors the params in`mcp.client.streamable_http.streamablehttp_client`."""
@@ -725,6 +1093,12 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
         strict: bool = False,
         allowed_tools: list[str] | None = None,
         pre_loaded_tools: list[MCPToolParams] | None = None,
+        max_concurrency: int | None = 10,
+        persist_tools_list: bool = False,
+        pool_size: int = 1,
+        cache_tool_results: list[str] | dict[str, float] | None = None,
+        tool_results_ttl: float = 60.0,
+        tool_results_max_entries: int = 256,
     ):
         """Create a new MCP server based on the Streamable HTTP transport.
 
@@ -750,6 +1124,17 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
                 2. Tools will not be fetched from the server,
                 3. Connection to the server will be delayed until first tool use.
                 4. No schema validation will be performed, make sure provided schemas are compatible with the server.
+            max_concurrency: Maximum number of requests sent to the server at the same time. Defaults to 10.
+                None removes the limit.
+            persist_tools_list: Whether to store the tools list on disk, so that agents can be created
+                from it on the next start without waiting for the server. Defaults to `False`.
+            pool_size: Number of connections to keep to the server. Calls go to the least loaded one.
+                Defaults to 1.
+            cache_tool_results: Names of read-only tools whose results are cached on the client, or a mapping
+                of tool names to their own TTL in seconds. Calls with the same arguments are answered from
+                the cache. The cache is cleared by `invalidate_tools_cache()` and on reconnects.
+            tool_results_ttl: Number of seconds cached results are kept. Defaults to 60.
+            tool_results_max_entries: Maximum number of cached results. Defaults to 256.
         """
         # For backwards compatibility, if strict is not provided, check if it's in the params
         if not strict:
@@ -765,6 +1150,12 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
             strict=strict,
             allowed_tools=allowed_tools,
             pre_loaded_tools=pre_loaded_tools,
+            max_concurrency=max_concurrency,
+            persist_tools_list=persist_tools_list,
+            pool_size=pool_size,
+            cache_tool_results=cache_tool_results,
+            tool_results_ttl=tool_results_ttl,
+            tool_results_max_entries=tool_results_max_entries,
         )
 
     def create_streams(
@@ -789,3 +1180,6 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
     def name(self) -> str:
         """A readable name for the server."""
         return self._name
+
+    def _manifest_identity(self) -> str:
+        return self.params["url"]
@@ -40,7 +40,7 @@ class SendMessageBase(BaseTool, ABC):
     def _get_completion(self, message: Union[str, None] = None, **kwargs):
         thread = self._get_thread()
 
-        if self.ToolConfig.async_mode == "threading":
+        if self._tool_config.async_mode == "threading":
             return thread.get_completion_async(
                 message=message,
                 parent_run_id=self._tool_call.id,
@@ -1,2 +1,14 @@
 class RefusalError(Exception):
     pass
+
+
+class ToolTimeoutError(Exception):
+    """Raised when a tool doesn't finish within its configured timeout."""
+
+
+class ToolWorkerCrashedError(Exception):
+    """Raised when the worker process running a tool exits unexpectedly."""
+
+
+class ToolQueueFullError(Exception):
+    """Raised when a tool call is rejected because the queue of the tool is full."""
@@ -0,0 +1,8 @@
+import os
+from pathlib import Path
+
+
+def get_cache_path(*parts: str) -> Path:
+    """Path in the cache directory of Agency Swarm, set by the `AGENCY_SWARM_CACHE_DIR` env variable."""
+    base = os.getenv("AGENCY_SWARM_CACHE_DIR") or os.path.join(Path.home(), ".cache", "agency_swarm")
+    return Path(base).joinpath(*parts)
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+import zlib
+from concurrent.futures import Future
+from typing import Coroutine, List, Optional
+
+
+class BackgroundEventLoop:
+    """An event loop running forever in a daemon thread."""
+
+    def __init__(self, name: str = "agency-swarm-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def in_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+
+_loops: List[BackgroundEventLoop] = []
+_tool_loops: List[BackgroundEventLoop] = []
+_loops_lock = threading.Lock()
+
+
+def _pick_loop(loops: List[BackgroundEventLoop], env_var: str, prefix: str, key: Optional[str]) -> BackgroundEventLoop:
+    with _loops_lock:
+        if not loops:
+            size = max(1, int(os.getenv(env_var, 1)))
+            loops.extend(BackgroundEventLoop(f"{prefix}-{i}") for i in range(size))
+        index = zlib.crc32(key.encode()) % len(loops) if key else 0
+        return loops[index]
+
+
+def get_shared_loop(key: Optional[str] = None) -> BackgroundEventLoop:
+    """
+    Return one of the process-wide background event loops.
+
+    The pool size is set by the `AGENCY_SWARM_LOOP_THREADS` env variable (default 1). The same key
+    always maps to the same loop, so everything related to one resource (e.g. an MCP server)
+    shares a loop.
+    """
+    return _pick_loop(_loops, "AGENCY_SWARM_LOOP_THREADS", "agency-swarm-loop", key)
+
+
+def get_tool_loop(key: Optional[str] = None) -> BackgroundEventLoop:
+    """
+    Return one of the background event loops running async tools.
+
+    They are separate from the shared loops, so an async tool that blocks its loop doesn't stall MCP
+    sessions and pooled HTTP clients. The pool size is set by the `AGENCY_SWARM_TOOL_LOOP_THREADS`
+    env variable (default 1).
+    """
+    return _pick_loop(_tool_loops, "AGENCY_SWARM_TOOL_LOOP_THREADS", "agency-swarm-tools", key)
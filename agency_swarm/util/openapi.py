@@ -1,4 +1,9 @@
 import json
+import re
+from typing import Any, Dict, Set
+from urllib.parse import unquote
+
+import jsonref
 
 
 def validate_openapi_spec(spec: str):
@@ -24,3 +29,99 @@ def validate_openapi_spec(spec: str):
 
     # If the function reaches this point, the spec has passed basic validation
     return spec
+
+
+class OpenAPIRefResolver:
+    """
+    Resolves the `$ref`s of an OpenAPI spec in a single pass. Each referenced component is resolved once
+    and shared by all the schemas using it, so large specs with deep component graphs are not expanded
+    again for every operation.
+
+    Recursive references can't be expanded. They are replaced by a reference to `#/$defs/<name>`, and
+    `get_defs` returns the definitions a resolved schema needs.
+
+    Args:
+        spec: The OpenAPI spec. It is not modified.
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._resolved: Dict[str, Any] = {}
+        self._in_progress: Set[str] = set()
+        self._def_names: Dict[str, str] = {}
+
+    def resolve(self, node: Any) -> Any:
+        """Return a copy of `node` with all references replaced by the resolved components."""
+        if isinstance(node, dict):
+            if isinstance(node.get("$ref"), str):
+                return self._resolve_ref(node)
+            return {key: self.resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.resolve(value) for value in node]
+        return node
+
+    def _resolve_ref(self, node: dict) -> Any:
+        ref = node["$ref"]
+        if ref in self._resolved:
+            target = self._resolved[ref]
+        elif ref in self._in_progress:
+            return {"$ref": f"#/$defs/{self._def_name(ref)}"}
+        else:
+            self._in_progress.add(ref)
+            try:
+                target = self.resolve(self._lookup(ref))
+            finally:
+                self._in_progress.discard(ref)
+            self._resolved[ref] = target
+        # Keywords next to the reference, like a description, override the component's
+        siblings = {key: value for key, value in node.items() if key != "$ref"}
+        if siblings and isinstance(target, dict):
+            return {**target, **self.resolve(siblings)}
+        return target
+
+    def _lookup(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            # Remote reference, loaded and resolved by jsonref
+            return jsonref.replace_refs({"$ref": ref})
+        node: Any = self.spec
+        for part in ref[1:].split("/")[1:]:
+            part = unquote(part).replace("~1", "/").replace("~0", "~")
+            if isinstance(node, list) and part.isdigit():
+                node = node[int(part)]
+            elif isinstance(node, dict) and part in node:
+                node = node[part]
+            else:
+                raise ValueError(f"Unresolvable reference {ref}")
+        return node
+
+    def _def_name(self, ref: str) -> str:
+        if ref not in self._def_names:
+            name = re.sub(r"\W", "_", ref.rsplit("/", 1)[-1]) or "Model"
+            candidate, index = name, 1
+            while candidate in self._def_names.values():
+                candidate = f"{name}{index}"
+                index += 1
+            self._def_names[ref] = candidate
+        return self._def_names[ref]
+
+    def get_defs(self, schema: Any) -> Dict[str, Any]:
+        """Return the `$defs` needed by the recursive references of a resolved schema."""
+        if not self._def_names:
+            return {}
+        refs = {f"#/$defs/{name}": ref for ref, name in self._def_names.items()}
+        defs: Dict[str, Any] = {}
+        stack, seen = [schema], set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, dict):
+                ref = refs.get(node.get("$ref"))
+                if ref is not None and self._def_names[ref] not in defs:
+                    defs[self._def_names[ref]] = self._resolved[ref]
+                    stack.append(self._resolved[ref])
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+        return defs
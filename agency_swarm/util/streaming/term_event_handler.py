@@ -102,12 +102,9 @@ def create_term_handler(agency=None) -> Type[AgencyEventHandler]:
             if snapshot.type != "function":
                 return
 
-            if snapshot.function.name == "SendMessage" and not (
-                hasattr(
-                    self._agency.send_message_tool_class.ToolConfig,
-                    "output_as_result",
-                )
-                and self._agency.send_message_tool_class.ToolConfig.output_as_result
+            if (
+                snapshot.function.name == "SendMessage"
+                and not self._agency.send_message_tool_class._tool_config.output_as_result
             ):
                 try:
                     args = eval(snapshot.function.arguments)
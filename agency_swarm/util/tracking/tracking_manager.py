@@ -1,4 +1,5 @@
 import json
+import time
 from typing import Any
 from uuid import uuid4
 
@@ -7,13 +8,33 @@ from openai.types.beta.threads.run import RequiredActionFunctionToolCall, Run
 from openai.types.beta.threads.runs.tool_call import ToolCall
 
 from agency_swarm.messages.message_output import MessageOutput
+from agency_swarm.util import metrics
 from agency_swarm.util.tracking import get_callback_handler
 from agency_swarm.util.tracking.langchain_types import AgentAction
 
+_TOOL_CALLS = metrics.counter(
+    "agency_swarm_tool_calls_total",
+    "Number of tool calls executed by agents.",
+    ["tool", "status"],
+)
+_TOOL_DURATION = metrics.histogram(
+    "agency_swarm_tool_duration_seconds",
+    "Time spent executing tool calls requested by agents.",
+    ["tool", "status"],
+)
+
 
 class TrackingManager:
     def __init__(self):
         self.callback_handler = get_callback_handler()
+        self._tool_start_times: dict[str, float] = {}
+
+    def _observe_tool(self, tool_call: ToolCall, status: str) -> None:
+        start = self._tool_start_times.pop(tool_call.id, None)
+        name = tool_call.function.name
+        _TOOL_CALLS.inc(tool=name, status=status)
+        if start is not None:
+            _TOOL_DURATION.observe(time.perf_counter() - start, tool=name, status=status)
 
     def track_tool_start(
         self,
@@ -24,6 +45,7 @@ class TrackingManager:
         is_retriever: bool = False,
     ) -> None:
         """Track the start of a tool/retriever execution."""
+        self._tool_start_times[tool_call.id] = time.perf_counter()
         if not self.callback_handler:
             return
 
@@ -59,6 +81,7 @@ class TrackingManager:
         is_retriever: bool = False,
     ) -> None:
         """Track the successful completion of a tool/retriever execution."""
+        self._observe_tool(tool_call, "success")
         if not self.callback_handler:
             return
 
@@ -83,6 +106,7 @@ class TrackingManager:
         is_retriever: bool = False,
     ) -> None:
         """Track an error during tool/retriever execution."""
+        self._observe_tool(tool_call, "error")
         if not self.callback_handler:
             return
 
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agency_swarm.tools import ToolFactory  # noqa: E402
+from agency_swarm.tools.ModelCache import ModelCache  # noqa: E402
+
+SCHEMAS_DIR = Path(__file__).resolve().parents[1] / "data" / "schemas"
+
+
+def synthetic_spec(operations: int) -> str:
+    """OpenAPI spec with shared components, enums, nullable fields and nested objects."""
+    components = {
+        "Status": {"type": "string", "enum": ["active", "inactive", "pending"]},
+        "Address": {
+            "type": "object",
+            "properties": {
+                "street": {"type": "string"},
+                "city": {"type": "string"},
+                "zip": {"type": "string", "pattern": "^[0-9]{5}$"},
+            },
+            "required": ["street", "city"],
+        },
+    }
+    paths = {}
+    for i in range(operations):
+        paths[f"/resources{i}"] = {
+            "post": {
+                "operationId": f"createResource{i}",
+                "description": f"Create resource {i}",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "name": {"type": "string", "minLength": 1},
+                                    "status": {"$ref": "#/components/schemas/Status"},
+                                    "address": {"$ref": "#/components/schemas/Address"},
+                                    "tags": {"type": "array", "items": {"type": "string"}},
+                                    "note": {"type": "string", "nullable": True},
+                                    f"field{i}": {"type": "integer", "minimum": 0},
+                                },
+                                "required": ["name", "status"],
+                            }
+                        }
+                    }
+                },
+            }
+        }
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Synthetic", "version": "1.0.0"},
+        "servers": [{"url": "https://example.com"}],
+        "paths": paths,
+        "components": {"schemas": components},
+    }
+    return json.dumps(spec)
+
+
+def load_spec(source: str) -> str:
+    if source.startswith(("http://", "https://")):
+        return httpx.get(source, follow_redirects=True, timeout=30).text
+    return Path(source).read_text()
+
+
+def measure(spec: str, engine: str) -> tuple[float, int]:
+    ToolFactory.schema_engine = engine
+    start = time.perf_counter()
+    tools = ToolFactory.from_openapi_schema(spec, {})
+    return time.perf_counter() - start, len(tools)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the codegen and native engines of ToolFactory.")
+    parser.add_argument("specs", nargs="*", help="Additional OpenAPI specs, as file paths or URLs.")
+    parser.add_argument("--operations", type=int, default=300, help="Operations in the synthetic spec.")
+    args = parser.parse_args()
+
+    # Measure model building, not cache lookups
+    ToolFactory.model_cache = ModelCache(max_entries=0)
+
+    specs = {path.name: path.read_text() for path in sorted(SCHEMAS_DIR.glob("*.json"))}
+    specs[f"synthetic ({args.operations} operations)"] = synthetic_spec(args.operations)
+    for source in args.specs:
+        specs[os.path.basename(source)] = load_spec(source)
+
+    print(f"{'spec':<36} {'tools':>6} {'codegen':>10} {'native':>10} {'speedup':>8}")
+    for name, spec in specs.items():
+        codegen, count = measure(spec, "codegen")
+        native, _ = measure(spec, "native")
+        print(f"{name:<36} {count:>6} {codegen:>9.3f}s {native:>9.3f}s {codegen / native:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
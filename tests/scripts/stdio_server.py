@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+import time
+
+from mcp.server.fastmcp import Context, FastMCP
+
+mcp = FastMCP("Stdio Test Server", log_level="ERROR")
+
+
+@mcp.tool()
+async def sleep(seconds: float) -> str:
+    """Sleep for the given number of seconds"""
+    await asyncio.sleep(seconds)
+    return f"slept {seconds}"
+
+
+@mcp.tool()
+def get_pid() -> int:
+    """Return the process id of the server"""
+    return os.getpid()
+
+
+calls = {}
+
+
+@mcp.tool()
+def count(key: str = "default") -> int:
+    """Return how many times the tool was called with the key"""
+    calls[key] = calls.get(key, 0) + 1
+    return calls[key]
+
+
+@mcp.tool()
+def crash() -> str:
+    """Exit the server process"""
+    os._exit(1)
+
+
+@mcp.tool()
+async def add_tool(name: str, ctx: Context) -> str:
+    """Register a new tool and notify the client"""
+
+    def echo(text: str) -> str:
+        return text
+
+    mcp.add_tool(echo, name=name, description="Echo the text")
+    await ctx.session.send_tool_list_changed()
+    return f"added {name}"
+
+
+if __name__ == "__main__":
+    # Optional startup delay in seconds, to simulate slow servers
+    if len(sys.argv) > 1:
+        time.sleep(float(sys.argv[1]))
+    mcp.run(transport="stdio")
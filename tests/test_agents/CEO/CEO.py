@@ -0,0 +1,19 @@
+from agency_swarm.agents import Agent
+
+
+class CEO(Agent):
+    def __init__(self):
+        super().__init__(
+            name="CEO",
+            description="CEO Test Agent",
+            instructions="./instructions.md",
+            files_folder="./files",
+            schemas_folder="./schemas",
+            tools=[],
+            tools_folder="./tools",
+            temperature=0.3,
+            max_prompt_tokens=25000,
+        )
+
+    def response_validator(self, message):
+        return message
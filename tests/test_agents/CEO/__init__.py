@@ -0,0 +1 @@
+from .CEO import CEO
\ No newline at end of file
@@ -0,0 +1,19 @@
+from agency_swarm.agents import Agent
+from agency_swarm.tools import CodeInterpreter
+
+class TestAgent1(Agent):
+    def __init__(self):
+        super().__init__(
+            name="TestAgent1",
+            description="Test Agent 1",
+            instructions="./instructions.md",
+            files_folder="./files",
+            schemas_folder="./schemas",
+            tools=[CodeInterpreter],
+            tools_folder="./tools",
+            temperature=0.3,
+            max_prompt_tokens=25000,
+        )
+
+    def response_validator(self, message):
+        return message
@@ -0,0 +1 @@
+from .TestAgent1 import TestAgent1
\ No newline at end of file
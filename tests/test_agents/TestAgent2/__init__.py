@@ -0,0 +1 @@
+from .TestAgent2 import TestAgent2
\ No newline at end of file
@@ -0,0 +1,472 @@
+import asyncio
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agency_swarm import BaseTool
+from agency_swarm.integrations.fastapi import run_fastapi
+from agency_swarm.integrations.fastapi_utils.admission import AdmissionController, AdmissionRejected
+from agency_swarm.tools import ToolExecutor
+from agency_swarm.util.errors import ToolQueueFullError, ToolWorkerCrashedError
+
+
+class FakeAgency:
+    """Minimal stand-in for Agency that doesn't call the OpenAI API."""
+
+    def __init__(self, name="test_agency", delay=0.0):
+        self.name = name
+        self.agents = [SimpleNamespace(name="TestAgent")]
+        self.agents_and_threads = {}
+        self.main_thread = SimpleNamespace(id="thread_main")
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_completion(self, message, **kwargs):
+        with self._lock:
+            self.calls.append(message)
+        time.sleep(self.delay)
+        return f"echo: {message}"
+
+    def get_completion_stream(self, message, event_handler, **kwargs):
+        with self._lock:
+            self.calls.append(message)
+        handler = event_handler()
+        for word in message.split():
+            time.sleep(self.delay)
+            handler.on_event(SimpleNamespace(model_dump=lambda word=word: {"event": "delta", "data": word}))
+        event_handler.on_all_streams_end()
+        return message
+
+
+class SlowTool(BaseTool):
+    """Sleeps for the given number of seconds."""
+
+    seconds: float = 0.0
+
+    class ToolConfig:
+        timeout = 0.5
+
+    def run(self):
+        time.sleep(self.seconds)
+        return f"slept {self.seconds}"
+
+
+class SquareTool(BaseTool):
+    """Squares a number."""
+
+    number: int
+
+    def run(self):
+        return self.number**2
+
+
+class PidTool(BaseTool):
+    """Returns the id of the process running the tool."""
+
+    class ToolConfig:
+        executor = "process"
+
+    def run(self):
+        return os.getpid()
+
+
+class CrashTool(BaseTool):
+    """Exits the process running the tool."""
+
+    class ToolConfig:
+        executor = "process"
+
+    def run(self):
+        os._exit(1)
+
+
+@pytest.fixture(autouse=True)
+def no_app_token(monkeypatch):
+    monkeypatch.delenv("APP_TOKEN", raising=False)
+
+
+def test_completion_endpoint():
+    agency = FakeAgency()
+    app = run_fastapi(agencies=[agency], return_app=True)
+    with TestClient(app) as client:
+        response = client.post("/test_agency/get_completion", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.json()["response"] == "echo: hi"
+    assert response.json()["threads"] == {"main_thread": "thread_main"}
+    assert "x-queue-wait" in response.headers
+
+
+def test_completion_endpoint_invalid_priority():
+    app = run_fastapi(agencies=[FakeAgency()], return_app=True)
+    with TestClient(app) as client:
+        response = client.post("/test_agency/get_completion", json={"message": "hi"}, headers={"X-Priority": "vip"})
+    assert response.status_code == 400
+
+
+def test_completion_endpoint_rejects_when_queue_is_full():
+    agency = FakeAgency(delay=1.0)
+    app = run_fastapi(agencies=[agency], return_app=True, max_queue_size=1)
+    with TestClient(app) as client:
+        results = []
+
+        def post(message):
+            results.append(client.post("/test_agency/get_completion", json={"message": message}))
+
+        threads = [threading.Thread(target=post, args=(str(i),)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.1)
+        for thread in threads:
+            thread.join()
+
+    status_codes = sorted(r.status_code for r in results)
+    assert status_codes == [200, 200, 429]
+    rejected = next(r for r in results if r.status_code == 429)
+    assert "retry-after" in rejected.headers
+    assert len(agency.calls) == 2
+
+
+def test_agencies_run_in_parallel():
+    agencies = [FakeAgency(delay=0.5), FakeAgency(name="other_agency", delay=0.5)]
+    app = run_fastapi(agencies=agencies, return_app=True)
+    with TestClient(app) as client:
+        results = []
+
+        def post(name):
+            results.append(client.post(f"/{name}/get_completion", json={"message": "hi"}))
+
+        threads = [threading.Thread(target=post, args=(name,)) for name in ("test_agency", "other_agency")]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    assert [r.status_code for r in results] == [200, 200]
+    assert all(float(r.headers["x-queue-wait"]) < 0.1 for r in results)
+    assert elapsed < 0.9
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_priority_order():
+    controller = AdmissionController(max_in_flight=1, max_queue_size=10)
+    order = []
+
+    assert await controller.acquire() == 0.0
+
+    async def wait(priority, name):
+        await controller.acquire(priority)
+        order.append(name)
+        controller.release()
+
+    tasks = [asyncio.create_task(wait("batch", "batch"))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(wait("interactive", "interactive")))
+    await asyncio.sleep(0)
+    assert controller.queued == 2
+
+    controller.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "batch"]
+    assert controller.in_flight == 0
+    assert controller.stats()["admitted"] == 3
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_queue_timeout():
+    controller = AdmissionController(max_in_flight=1, queue_timeout=0.05)
+    await controller.acquire()
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire()
+    assert exc_info.value.queue_position == 1
+    controller.release()
+    assert controller.queued == 0
+    assert controller.in_flight == 0
+
+
+def test_metrics_endpoint():
+    app = run_fastapi(agencies=[FakeAgency(name="metrics_agency")], return_app=True, enable_metrics=True)
+    with TestClient(app) as client:
+        assert client.post("/metrics_agency/get_completion", json={"message": "hi"}).status_code == 200
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE agency_swarm_queue_wait_seconds histogram" in body
+    assert 'agency_swarm_http_requests_total{endpoint="get_completion",name="metrics_agency",status="200"} 1' in body
+    assert 'agency_swarm_queue_wait_seconds_count{agency="metrics_agency",priority="interactive"} 1' in body
+
+
+def test_metrics_endpoint_disabled_by_default():
+    app = run_fastapi(agencies=[FakeAgency()], return_app=True)
+    with TestClient(app) as client:
+        assert client.get("/metrics").status_code in (404, 405)
+
+
+def test_sync_tool_does_not_block_event_loop():
+    app = run_fastapi(tools=[SlowTool, SquareTool], return_app=True)
+    with TestClient(app) as client:
+        results = {}
+
+        def post_slow():
+            results["slow"] = client.post("/tool/SlowTool", json={"seconds": 0.4})
+
+        thread = threading.Thread(target=post_slow)
+        thread.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        fast = client.post("/tool/SquareTool", json={"number": 3})
+        fast_duration = time.monotonic() - start
+        thread.join()
+
+    assert fast.json() == {"response": 9}
+    assert fast_duration < 0.3
+    assert results["slow"].json() == {"response": "slept 0.4"}
+
+
+def test_tool_timeout():
+    app = run_fastapi(tools=[SlowTool], return_app=True)
+    with TestClient(app) as client:
+        response = client.post("/tool/SlowTool", json={"seconds": 1.0})
+    assert response.status_code == 504
+    assert "timed out" in response.json()["Error"]
+
+
+def test_tool_process_executor():
+    app = run_fastapi(tools=[SquareTool], return_app=True, tool_executor="process", tool_max_workers=1)
+    with TestClient(app) as client:
+        response = client.post("/tool/SquareTool", json={"number": 4})
+    assert response.json() == {"response": 16}
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_process_affinity_and_crash_isolation():
+    executor = ToolExecutor(process_workers=2)
+    try:
+        executor.warm_up([PidTool, SquareTool])
+        pids = {await executor.run(PidTool()) for _ in range(3)}
+        # Sequential calls stay on the tool's worker, thread tools stay in this process
+        assert len(pids) == 1 and os.getpid() not in pids
+        assert await executor.run(SquareTool(number=2)) == 4
+
+        with pytest.raises(ToolWorkerCrashedError):
+            await executor.run(CrashTool())
+        assert await executor.run(PidTool()) != os.getpid()
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_max_concurrency():
+    executor = ToolExecutor(max_concurrency=1)
+    start = time.monotonic()
+    results = await asyncio.gather(executor.run(SlowTool(seconds=0.2)), executor.run(SlowTool(seconds=0.2)))
+    executor.shutdown()
+    assert results == ["slept 0.2", "slept 0.2"]
+    assert time.monotonic() - start >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_fair_queueing():
+    executor = ToolExecutor(max_workers=1)
+    finished = []
+
+    async def call(tool, label, client=None):
+        await executor.run(tool, client=client)
+        finished.append(label)
+
+    # A backlog of slow calls doesn't delay a call to another tool, or a call from another client
+    await asyncio.gather(
+        *[call(SlowTool(seconds=0.1), f"slow{i}", client="a") for i in range(3)],
+        call(SquareTool(number=2), "square", client="a"),
+        call(SlowTool(seconds=0.1), "other_client", client="b"),
+    )
+    executor.shutdown()
+    # Without fair queueing, both would finish last
+    assert finished == ["slow0", "slow1", "square", "other_client", "slow2"]
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_rejects_when_queue_is_full():
+    executor = ToolExecutor(max_concurrency=1, max_queue_size=1)
+    results = await asyncio.gather(*[executor.run(SlowTool(seconds=0.2)) for _ in range(3)], return_exceptions=True)
+    stats = executor.stats()["SlowTool"]
+    executor.shutdown()
+    assert results[:2] == ["slept 0.2", "slept 0.2"]
+    assert isinstance(results[2], ToolQueueFullError)
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["queued"] == 0
+    assert stats["queue_wait_max"] >= 0.15
+
+
+def test_tool_endpoint_queue_full():
+    class BusyTool(BaseTool):
+        class ToolConfig:
+            max_concurrency = 1
+            max_queue_size = 0
+
+        def run(self):
+            time.sleep(0.3)
+            return "done"
+
+    app = run_fastapi(tools=[BusyTool], return_app=True)
+    with TestClient(app) as client:
+        thread = threading.Thread(target=client.post, args=("/tool/BusyTool",), kwargs={"json": {}})
+        thread.start()
+        time.sleep(0.1)
+        response = client.post("/tool/BusyTool", json={})
+        thread.join()
+    assert response.status_code == 429
+    assert "Too many queued calls" in response.json()["Error"]
+
+
+def test_idempotency_key_replays_completed_response():
+    agency = FakeAgency()
+    app = run_fastapi(agencies=[agency], return_app=True)
+    headers = {"Idempotency-Key": "abc"}
+    with TestClient(app) as client:
+        first = client.post("/test_agency/get_completion", json={"message": "hi"}, headers=headers)
+        second = client.post("/test_agency/get_completion", json={"message": "hi"}, headers=headers)
+        conflict = client.post("/test_agency/get_completion", json={"message": "other"}, headers=headers)
+    assert first.json() == second.json()
+    assert "idempotent-replayed" not in first.headers
+    assert second.headers["idempotent-replayed"] == "true"
+    assert conflict.status_code == 422
+    assert agency.calls == ["hi"]
+
+
+def test_idempotency_key_concurrent_duplicates_share_execution():
+    agency = FakeAgency(delay=0.5)
+    app = run_fastapi(agencies=[agency], return_app=True)
+    with TestClient(app) as client:
+        results = []
+
+        def post():
+            results.append(
+                client.post("/test_agency/get_completion", json={"message": "hi"}, headers={"Idempotency-Key": "k"})
+            )
+
+        threads = [threading.Thread(target=post) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert [r.status_code for r in results] == [200, 200, 200]
+    assert agency.calls == ["hi"]
+
+
+def test_idempotency_sqlite_tier(tmp_path):
+    db_path = str(tmp_path / "idempotency.db")
+    agency = FakeAgency()
+    for _ in range(2):
+        app = run_fastapi(agencies=[agency], return_app=True, idempotency_db_path=db_path)
+        with TestClient(app) as client:
+            response = client.post(
+                "/test_agency/get_completion", json={"message": "hi"}, headers={"Idempotency-Key": "k"}
+            )
+        assert response.json()["response"] == "echo: hi"
+    assert agency.calls == ["hi"]
+
+
+def test_idempotency_key_replays_stream():
+    agency = FakeAgency()
+    app = run_fastapi(agencies=[agency], return_app=True)
+    headers = {"Idempotency-Key": "stream"}
+    with TestClient(app) as client:
+        first = client.post("/test_agency/get_completion_stream", json={"message": "a b"}, headers=headers)
+        second = client.post("/test_agency/get_completion_stream", json={"message": "a b"}, headers=headers)
+    assert first.text == second.text
+    assert first.text.count("data: ") == 2
+    assert second.headers["idempotent-replayed"] == "true"
+    assert agency.calls == ["a b"]
+
+
+def test_stream_disconnect_before_body_releases_idempotency_key():
+    agency = FakeAgency()
+    app = run_fastapi(agencies=[agency], return_app=True)
+    path = "/test_agency/get_completion_stream"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"idempotency-key", b"gone")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b'{"message": "a b"}', "more_body": False}
+
+    async def send(message):
+        raise OSError("Client disconnected")
+
+    with TestClient(app) as client:
+        # The client is gone before the response starts, so the body is never iterated
+        with pytest.raises(Exception):
+            client.portal.call(app, scope, receive, send)
+        retry = client.post(path, json={"message": "a b"}, headers={"Idempotency-Key": "gone"})
+
+    assert "idempotent-replayed" not in retry.headers
+    assert retry.text.count("data: ") == 2
+    assert agency.calls == ["a b", "a b"]
+
+
+def test_websocket_multiplexes_turns():
+    agency = FakeAgency()
+    app = run_fastapi(agencies=[agency], return_app=True)
+    with TestClient(app) as client, client.websocket_connect("/test_agency/ws") as websocket:
+        websocket.send_json({"type": "message", "id": "1", "message": "a b"})
+        messages = [websocket.receive_json() for _ in range(3)]
+        websocket.send_json({"type": "message", "id": "2", "message": "c"})
+        messages += [websocket.receive_json() for _ in range(2)]
+        websocket.send_json({"type": "resume", "id": "1", "after": 0})
+        resumed = [websocket.receive_json() for _ in range(2)]
+
+    assert [(m["id"], m["type"], m["seq"]) for m in messages] == [
+        ("1", "event", 0),
+        ("1", "event", 1),
+        ("1", "done", 2),
+        ("2", "event", 0),
+        ("2", "done", 1),
+    ]
+    assert messages[2]["response"] == "a b"
+    assert resumed == messages[1:3]
+
+
+def test_websocket_cancel():
+    agency = FakeAgency(delay=0.2)
+    app = run_fastapi(agencies=[agency], return_app=True)
+    with TestClient(app) as client, client.websocket_connect("/test_agency/ws") as websocket:
+        websocket.send_json({"type": "message", "id": "1", "message": "a b c d e f"})
+        assert websocket.receive_json()["type"] == "event"
+        websocket.send_json({"type": "cancel", "id": "1"})
+        types = []
+        while not types or types[-1] == "event":
+            types.append(websocket.receive_json()["type"])
+    assert types[-1] == "cancelled"
+    assert len(types) < 6
+
+
+def test_websocket_requires_token(monkeypatch):
+    monkeypatch.setenv("APP_TOKEN", "secret")
+    app = run_fastapi(agencies=[FakeAgency()], return_app=True)
+    with TestClient(app) as client:
+        with pytest.raises(Exception):
+            with client.websocket_connect("/test_agency/ws") as websocket:
+                websocket.receive_json()
+        with client.websocket_connect("/test_agency/ws?token=secret") as websocket:
+            websocket.send_json({"type": "message", "id": "1", "message": "hi"})
+            assert websocket.receive_json()["type"] == "event"
@@ -0,0 +1,269 @@
+import asyncio
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agency_swarm import Agent
+from agency_swarm.tools import ToolFactory
+from agency_swarm.tools.mcp import MCPServerStdio
+
+stdio_server_file = os.path.join(os.path.dirname(__file__), "scripts", "stdio_server.py")
+
+
+def create_server(**kwargs):
+    return MCPServerStdio(
+        {"command": sys.executable, "args": [stdio_server_file]},
+        name="stdio_test_server",
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def server():
+    server = create_server()
+    yield server
+    server.cleanup()
+
+
+def test_concurrent_calls_overlap(server):
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: server.call_tool("sleep", {"seconds": 1}), range(4)))
+    assert [r.content[0].text for r in results] == ["slept 1.0"] * 4
+    assert time.monotonic() - start < 2.5
+
+
+def test_max_concurrency_limits_calls():
+    server = create_server(max_concurrency=1)
+    try:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda _: server.call_tool("sleep", {"seconds": 0.5}), range(2)))
+        assert time.monotonic() - start >= 1.0
+    finally:
+        server.cleanup()
+
+
+def test_call_timeout_does_not_block_other_calls(server):
+    with pytest.raises(TimeoutError):
+        server.call_tool("sleep", {"seconds": 5}, timeout=0.5)
+    result = server.call_tool("sleep", {"seconds": 0}, timeout=5)
+    assert result.content[0].text == "slept 0.0"
+
+
+def test_reconnects_after_server_crash(server):
+    pid = server.call_tool("get_pid", {}).content[0].text
+    with pytest.raises(Exception):
+        server.call_tool("crash", {}, timeout=5)
+    new_pid = server.call_tool("get_pid", {}, timeout=10).content[0].text
+    assert new_pid != pid
+
+
+def test_tool_result_cache():
+    server = create_server(cache_tool_results={"count": 0.5})
+    try:
+
+        def count(key):
+            return server.call_tool("count", {"key": key}).content[0].text
+
+        assert [count("a"), count("a"), count("b")] == ["1", "1", "1"]
+        assert asyncio.run(server.acall_tool("count", {"key": "a"})).content[0].text == "1"
+        assert server.result_cache.stats()["hits"] == 2 and server.result_cache.stats()["misses"] == 2
+
+        # Tools outside the allowlist are not cached
+        assert server.call_tool("sleep", {"seconds": 0}) is not server.call_tool("sleep", {"seconds": 0})
+        assert server.result_cache.stats()["entries"] == 2
+
+        server.invalidate_tools_cache()
+        assert count("a") == "2"
+        time.sleep(0.6)
+        assert count("a") == "3"
+    finally:
+        server.cleanup()
+
+
+def test_tool_result_cache_cleared_on_reconnect():
+    server = create_server(cache_tool_results=["get_pid"])
+    try:
+        pid = server.call_tool("get_pid", {}).content[0].text
+        assert server.call_tool("get_pid", {}).content[0].text == pid
+        with pytest.raises(Exception):
+            server.call_tool("crash", {}, timeout=5)
+        server.call_tool("sleep", {"seconds": 0}, timeout=10)
+        assert server.call_tool("get_pid", {}).content[0].text != pid
+    finally:
+        server.cleanup()
+
+
+def test_servers_share_runtime_loop(server):
+    other = MCPServerStdio({"command": sys.executable, "args": [stdio_server_file]}, name="stdio_test_server_2")
+    try:
+        assert other._loop is server._loop
+        assert other.call_tool("get_pid", {}).content[0].text != server.call_tool("get_pid", {}).content[0].text
+    finally:
+        other.cleanup()
+
+
+def test_async_calls(server):
+    async def call_many():
+        return await asyncio.gather(*(server.acall_tool("sleep", {"seconds": 1}) for _ in range(3)))
+
+    start = time.monotonic()
+    results = asyncio.run(call_many())
+    assert [r.content[0].text for r in results] == ["slept 1.0"] * 3
+    assert time.monotonic() - start < 2.0
+
+    # Coroutines running on the runtime loop itself call the server directly
+    tools = server._runtime.submit(server.alist_tools()).result(timeout=10)
+    assert "sleep" in [tool.name for tool in tools]
+
+
+def test_mcp_tools_use_async_api(server):
+    sleep_tool = next(tool for tool in ToolFactory.from_mcp(server) if tool.__name__ == "sleep")
+
+    async def call_many():
+        return await asyncio.gather(*(sleep_tool(seconds=1).run() for _ in range(3)))
+
+    start = time.monotonic()
+    assert asyncio.run(call_many()) == ["slept 1.0"] * 3
+    assert time.monotonic() - start < 2.0
+
+    # The sync API would raise on the runtime loop
+    assert server._runtime.submit(sleep_tool(seconds=0).run()).result(timeout=10) == "slept 0.0"
+
+
+def test_cancelled_call_during_connect_does_not_break_server():
+    server = MCPServerStdio({"command": sys.executable, "args": [stdio_server_file, "2"]}, name="slow_stdio_server")
+    try:
+
+        async def call_twice():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(server.acall_tool("get_pid", {}), timeout=0.5)
+            return await server.acall_tool("get_pid", {}, timeout=10)
+
+        assert asyncio.run(call_twice()).content[0].text.isdigit()
+    finally:
+        server.cleanup()
+
+
+def test_sync_call_from_runtime_loop_raises(server):
+    async def call_sync():
+        return server.call_tool("get_pid", {})
+
+    with pytest.raises(RuntimeError, match="async API"):
+        server._runtime.submit(call_sync()).result(timeout=10)
+
+
+def test_persisted_tools_list(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENCY_SWARM_CACHE_DIR", str(tmp_path))
+    server = create_server(persist_tools_list=True)
+    try:
+        names = [tool.name for tool in server.list_tools()]
+    finally:
+        server.cleanup()
+
+    # The next server is created from the stored list and only connects on first use
+    server = create_server(persist_tools_list=True)
+    try:
+        assert not server._initialized
+        assert [tool.name for tool in server.list_tools()] == names
+        tools = ToolFactory.from_mcp(server)
+        assert not server._initialized
+        assert "sleep" in [tool.__name__ for tool in tools]
+        assert server.call_tool("sleep", {"seconds": 0}).content[0].text == "slept 0.0"
+    finally:
+        server.cleanup()
+
+
+def test_tools_changed_refreshes_persisted_list(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENCY_SWARM_CACHE_DIR", str(tmp_path))
+    server = create_server(persist_tools_list=True, cache_tools_list=True)
+    try:
+        server.list_tools()
+        server.call_tool("add_tool", {"name": "echo"})
+        deadline = time.monotonic() + 5
+        while "echo" not in server._manifest.path.read_text() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert "echo" in server._manifest.path.read_text()
+        assert "echo" in [tool.name for tool in server.list_tools()]
+    finally:
+        server.cleanup()
+
+
+def test_pool_routes_to_least_loaded_session():
+    server = create_server(pool_size=2)
+    try:
+        server.list_tools()  # Wait for the connections
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            busy = pool.submit(server.call_tool, "sleep", {"seconds": 2})
+            time.sleep(0.5)
+            idle_pid = server.call_tool("get_pid", {}).content[0].text
+            busy_pid = server.call_tool("get_pid", {}).content[0].text
+            assert idle_pid == busy_pid
+            busy.result()
+        # Without load, calls go to the first session
+        assert server.call_tool("get_pid", {}).content[0].text != idle_pid
+    finally:
+        server.cleanup()
+
+
+def test_pool_replaces_dead_session_without_failing_calls():
+    server = create_server(pool_size=2)
+    try:
+        server.list_tools()  # Wait for the connections
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(server.call_tool, "sleep", {"seconds": 1.5})
+            time.sleep(0.3)
+            pid = int(server.call_tool("get_pid", {}).content[0].text)
+            second = pool.submit(server.call_tool, "sleep", {"seconds": 1})
+            time.sleep(0.3)
+            os.kill(pid, signal.SIGKILL)
+            assert first.result().content[0].text == "slept 1.5"
+            assert second.result().content[0].text == "slept 1.0"
+        pids = {server.call_tool("get_pid", {}).content[0].text for _ in range(3)}
+        assert str(pid) not in pids
+    finally:
+        server.cleanup()
+
+
+def test_agent_connects_servers_concurrently():
+    servers = [
+        MCPServerStdio({"command": sys.executable, "args": [stdio_server_file, "3"]}, name=f"slow_server_{i}")
+        for i in range(3)
+    ]
+    try:
+        start = time.monotonic()
+        agent = Agent(name="test", description="test", instructions="test", mcp_servers=servers)
+        # Connecting one after the other would take over 9 seconds
+        assert time.monotonic() - start < 8
+        assert "get_pid" in [tool.__name__ for tool in agent.tools]
+        assert all(server._initialized for server in servers)
+    finally:
+        for server in servers:
+            server.cleanup()
+
+
+def test_agent_reports_failed_servers_together(monkeypatch):
+    monkeypatch.setenv("MCP_STARTUP_TIMEOUT", "2")
+    servers = [
+        create_server(),
+        MCPServerStdio({"command": sys.executable, "args": [stdio_server_file, "4"]}, name="too_slow_server"),
+        MCPServerStdio({"command": sys.executable, "args": ["-c", "import sys; sys.exit(1)"]}, name="broken_server"),
+    ]
+    try:
+        start = time.monotonic()
+        with pytest.raises(Exception) as exc_info:
+            Agent(name="test", description="test", instructions="test", mcp_servers=servers)
+        assert time.monotonic() - start < 5
+        assert "too_slow_server" in str(exc_info.value)
+        assert "broken_server" in str(exc_info.value)
+        assert "stdio_test_server" not in str(exc_info.value)
+        # The slow server is shut down once it finishes starting
+        assert servers[1]._shutdown_event.wait(15)
+    finally:
+        for server in servers:
+            server.cleanup()
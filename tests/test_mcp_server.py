@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+
+import pytest
+from pydantic import Field
+from starlette.testclient import TestClient
+
+from agency_swarm import BaseTool
+from agency_swarm.integrations.mcp_server import run_mcp
+
+
+class AddTool(BaseTool):
+    """Add two numbers"""
+
+    a: int = Field(..., description="First number")
+    b: int = Field(..., description="Second number")
+
+    def run(self):
+        return self.a + self.b
+
+
+class EchoTool(BaseTool):
+    """Echo the text"""
+
+    text: str
+
+    async def run(self):
+        return self.text
+
+
+class PidTool(BaseTool):
+    """Return the id of the process running the tool"""
+
+    class ToolConfig:
+        executor = "process"
+
+    def run(self):
+        return os.getpid()
+
+
+class SleepTool(BaseTool):
+    """Sleep for a while"""
+
+    class ToolConfig:
+        max_concurrency = 1
+        max_queue_size = 0
+
+    def run(self):
+        time.sleep(0.5)
+        return "done"
+
+
+class MCPTestClient:
+    """Minimal MCP client speaking the streamable HTTP transport in JSON mode."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.headers = {"Accept": "application/json, text/event-stream"}
+        self._id = 0
+        self.initialize_result = self.request(
+            "initialize",
+            {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "test", "version": "1"}},
+        )
+        assert "serverInfo" in self.initialize_result
+        self.client.post("/mcp/", json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=self.headers)
+
+    def request(self, method: str, params: dict | None = None) -> dict:
+        self._id += 1
+        response = self.client.post(
+            "/mcp/",
+            json={"jsonrpc": "2.0", "id": self._id, "method": method, "params": params or {}},
+            headers=self.headers,
+        )
+        assert response.status_code == 200, response.text
+        if "mcp-session-id" in response.headers:
+            self.headers["mcp-session-id"] = response.headers["mcp-session-id"]
+        return response.json()["result"]
+
+    def call_tool(self, name: str, arguments: dict) -> str:
+        return self.request("tools/call", {"name": name, "arguments": arguments})["content"][0]["text"]
+
+
+@pytest.fixture
+def mcp_client():
+    app = run_mcp([AddTool, EchoTool], return_app=True)
+    with TestClient(app) as client:
+        yield MCPTestClient(client)
+
+
+def test_list_tools_is_precomputed(mcp_client, monkeypatch):
+    first = mcp_client.request("tools/list")
+    assert [tool["name"] for tool in first["tools"]] == ["AddTool", "EchoTool"]
+    assert first["tools"][0]["description"] == "Add two numbers"
+    assert first["_meta"]["version"]
+
+    # Schemas are not rebuilt on later requests
+    def fail():
+        raise AssertionError("schema rebuilt")
+
+    monkeypatch.setattr(AddTool, "model_json_schema", fail)
+    assert mcp_client.request("tools/list") == first
+
+
+def test_version_changes_with_tools():
+    def version(tools):
+        with TestClient(run_mcp(tools, return_app=True)) as client:
+            return MCPTestClient(client).request("tools/list")["_meta"]["version"]
+
+    assert version([AddTool, EchoTool]) == version([AddTool, EchoTool])
+    assert version([AddTool]) != version([AddTool, EchoTool])
+
+
+def test_call_tool(mcp_client):
+    assert mcp_client.call_tool("AddTool", {"a": 1, "b": 2}) == "3"
+    assert mcp_client.call_tool("EchoTool", {"text": "hi"}) == "hi"
+    assert "Invalid arguments" in mcp_client.call_tool("AddTool", {"a": "x", "b": 2})
+    assert "Unknown tool" in mcp_client.call_tool("MissingTool", {})
+
+
+def test_process_executor():
+    app = run_mcp([PidTool], return_app=True, tool_process_workers=1)
+    with TestClient(app) as client:
+        pid = MCPTestClient(client).call_tool("PidTool", {})
+    assert pid != str(os.getpid())
+
+
+def test_rejects_calls_when_queue_is_full():
+    app = run_mcp([SleepTool], return_app=True, enable_metrics=True)
+    with TestClient(app) as client:
+        mcp_client = MCPTestClient(client)
+        results = {}
+        thread = threading.Thread(target=lambda: results.update(first=mcp_client.call_tool("SleepTool", {})))
+        thread.start()
+        time.sleep(0.2)
+        rejected = mcp_client.request("tools/call", {"name": "SleepTool", "arguments": {}})
+        thread.join()
+        stats = client.get("/stats").json()
+
+    assert results["first"] == "done"
+    assert rejected["isError"] is True
+    assert "Too many queued calls" in rejected["content"][0]["text"]
+    assert stats["SleepTool"]["completed"] == 1 and stats["SleepTool"]["rejected"] == 1
+
+
+TOOL_MODULE = """
+import os
+from agency_swarm import BaseTool
+
+with open(os.path.join(os.path.dirname(__file__), "imports.log"), "a") as log:
+    log.write(__name__ + "\\n")
+
+
+class {name}(BaseTool):
+    "{doc}"
+
+    def run(self):
+        return "{doc}"
+"""
+
+
+def test_watch_reloads_changed_modules(tmp_path):
+    def write_tool(file, name, doc):
+        path = tmp_path / file
+        path.write_text(TOOL_MODULE.format(name=name, doc=doc))
+        return path
+
+    def wait_for_version(client, version):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            result = client.request("tools/list")
+            if result["_meta"]["version"] != version:
+                return result
+            time.sleep(0.05)
+        raise AssertionError("tools were not reloaded")
+
+    first = write_tool("first.py", "FirstTool", "first")
+    app = run_mcp(str(tmp_path), return_app=True, watch=True, watch_interval=0.05)
+    with TestClient(app) as client:
+        mcp_client = MCPTestClient(client)
+        initial = mcp_client.request("tools/list")
+        assert [tool["name"] for tool in initial["tools"]] == ["FirstTool"]
+
+        # New module
+        write_tool("second.py", "SecondTool", "second")
+        result = wait_for_version(mcp_client, initial["_meta"]["version"])
+        assert [tool["name"] for tool in result["tools"]] == ["FirstTool", "SecondTool"]
+
+        # Touching a module without changing it doesn't re-import it
+        os.utime(first, (time.time() + 10, time.time() + 10))
+        time.sleep(0.3)
+        assert (tmp_path / "imports.log").read_text().split() == ["first", "second"]
+
+        # Changed module replaces its tool, deleted module removes it
+        write_tool("first.py", "FirstTool", "changed")
+        (tmp_path / "second.py").unlink()
+        result = wait_for_version(mcp_client, result["_meta"]["version"])
+        if len(result["tools"]) == 2:
+            result = wait_for_version(mcp_client, result["_meta"]["version"])
+        assert [tool["description"] for tool in result["tools"]] == ["changed"]
+        assert mcp_client.call_tool("FirstTool", {}) == "changed"
+        capabilities = mcp_client.initialize_result["capabilities"]
+    assert capabilities["tools"]["listChanged"] is True
@@ -0,0 +1,316 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import ClassVar, List
+from unittest.mock import Mock
+
+import pytest
+from openai.types.beta.threads.required_action_function_tool_call import RequiredActionFunctionToolCall
+
+from agency_swarm import Agent
+from agency_swarm.threads.thread import Thread
+from agency_swarm.tools import BaseTool
+from agency_swarm.user import User
+from agency_swarm.util.helpers.event_loop import get_shared_loop
+
+
+class SleepTool(BaseTool):
+    """Sleeps, blocking the thread."""
+
+    seconds: float = 0.3
+
+    def run(self):
+        time.sleep(self.seconds)
+        return f"slept {self.seconds}"
+
+
+class AsyncSleepTool(BaseTool):
+    """Sleeps without blocking."""
+
+    seconds: float = 0.3
+
+    async def run(self):
+        await asyncio.sleep(self.seconds)
+        return {"slept": self.seconds}
+
+
+class BlockingAsyncTool(BaseTool):
+    """Blocks its event loop."""
+
+    async def run(self):
+        time.sleep(0.5)
+        return "done"
+
+
+class AsyncFailingTool(BaseTool):
+    """Always fails."""
+
+    async def run(self):
+        raise ValueError("boom")
+
+
+class TimedSleepTool(SleepTool):
+    """Sleeps, blocking the thread, with a timeout."""
+
+    class ToolConfig:
+        timeout = 0.2
+
+
+class TimedAsyncSleepTool(AsyncSleepTool):
+    """Sleeps without blocking, with a timeout."""
+
+    class ToolConfig:
+        timeout = 0.2
+
+
+class IsolatedTool(BaseTool):
+    """Sleeps in a worker process, then returns its id. Exits the process if asked to."""
+
+    seconds: float = 0.0
+    crash: bool = False
+
+    class ToolConfig:
+        isolation = "subprocess"
+        timeout = 1
+
+    def run(self):
+        if self.crash:
+            os._exit(1)
+        time.sleep(self.seconds)
+        return os.getpid()
+
+
+class PriceTool(BaseTool):
+    """Looks up the price of a ticker."""
+
+    ticker: str
+    batches: ClassVar[List[List[str]]] = []
+
+    class ToolConfig:
+        batchable = True
+
+    def run(self):
+        return self.run_batch([self])[0]
+
+    @classmethod
+    def run_batch(cls, instances):
+        tickers = [instance.ticker for instance in instances]
+        cls.batches.append(tickers)
+        if "FAIL" in tickers:
+            raise RuntimeError("bulk request failed")
+        return [f"{ticker}: {len(ticker)}" for ticker in tickers]
+
+
+class SingleCallPriceTool(PriceTool):
+    """Looks up the price of a ticker, one call at a time."""
+
+    batches: ClassVar[List[List[str]]] = []
+
+    class ToolConfig:
+        batchable = True
+        one_call_at_a_time = True
+
+
+@pytest.fixture
+def tool_executor():
+    yield Thread.get_tool_executor()
+    Thread.tool_executor.shutdown()
+    Thread.tool_executor = None
+
+
+def make_tool_call(call_id: str, name: str, **arguments) -> RequiredActionFunctionToolCall:
+    return RequiredActionFunctionToolCall(
+        id=call_id,
+        type="function",
+        function={"name": name, "arguments": json.dumps(arguments)},
+    )
+
+
+def make_thread(tools, tool_calls):
+    agent = Agent(name="TestAgent", description="Test agent", instructions="Test instructions", tools=tools)
+    thread = Thread(User(), agent)
+    thread.client = Mock()
+    thread.id = "test_thread_id"
+    thread._run = Mock()
+    thread._run.id = "test_run_id"
+    thread._run.required_action.submit_tool_outputs.tool_calls = tool_calls
+    thread.submit_tool_outputs = Mock()
+    thread._tracking_manager = Mock()
+    return thread, agent
+
+
+def handle_requires_action(thread, agent, yield_messages=False):
+    gen = thread._handle_run_requires_action(agent, None, yield_messages, None, None)
+    messages = []
+    try:
+        while True:
+            messages.append(next(gen))
+    except StopIteration as e:
+        return e.value, messages
+
+
+def submitted_outputs(thread) -> dict:
+    tool_outputs = thread.submit_tool_outputs.call_args[0][0]
+    return {output["tool_call_id"]: output["output"] for output in tool_outputs}
+
+
+@pytest.mark.parametrize("async_first", [True, False])
+def test_async_tools_overlap_with_sync_tools(async_first):
+    tool_calls = [
+        make_tool_call("call_async_1", "AsyncSleepTool", seconds=0.3),
+        make_tool_call("call_async_2", "AsyncSleepTool", seconds=0.3),
+        make_tool_call("call_sync", "SleepTool", seconds=0.3),
+    ]
+    if not async_first:
+        tool_calls.reverse()
+    thread, agent = make_thread([SleepTool, AsyncSleepTool], tool_calls)
+
+    start = time.perf_counter()
+    result, _ = handle_requires_action(thread, agent)
+    elapsed = time.perf_counter() - start
+
+    assert result is None
+    assert elapsed < 0.55
+    assert submitted_outputs(thread) == {
+        "call_async_1": "{'slept': 0.3}",
+        "call_async_2": "{'slept': 0.3}",
+        "call_sync": "slept 0.3",
+    }
+    # Async tools track their end when they finish, once
+    ended = [call.kwargs["tool_call"].id for call in thread._tracking_manager.track_tool_end.call_args_list]
+    assert sorted(ended) == ["call_async_1", "call_async_2", "call_sync"]
+
+
+def test_blocking_async_tool_does_not_stall_shared_loop():
+    thread, agent = make_thread([BlockingAsyncTool], [make_tool_call("call", "BlockingAsyncTool")])
+    future, _ = thread.execute_tool(thread._run.required_action.submit_tool_outputs.tool_calls[0], agent)
+    time.sleep(0.1)
+
+    # MCP sessions and pooled HTTP clients run on the shared loop, which stays responsive
+    start = time.perf_counter()
+    get_shared_loop().submit(asyncio.sleep(0)).result()
+    assert time.perf_counter() - start < 0.2
+    assert future.result() == "done"
+
+
+def test_async_tool_errors_and_messages():
+    tool_calls = [make_tool_call("call_fail", "AsyncFailingTool"), make_tool_call("call_ok", "AsyncSleepTool")]
+    thread, agent = make_thread([AsyncFailingTool, AsyncSleepTool], tool_calls)
+
+    _, messages = handle_requires_action(thread, agent, yield_messages=True)
+
+    assert submitted_outputs(thread)["call_fail"] == "Error: boom"
+    thread._tracking_manager.track_tool_error.assert_called_once()
+    outputs = {message.obj.id: message.content for message in messages if message.msg_type == "function_output"}
+    assert outputs == {"call_fail": "Error: boom", "call_ok": "{'slept': 0.3}"}
+
+
+def test_tool_timeouts():
+    tool_calls = [
+        make_tool_call("call_sync", "TimedSleepTool", seconds=2),
+        make_tool_call("call_async", "TimedAsyncSleepTool", seconds=2),
+        make_tool_call("call_fast", "TimedSleepTool", seconds=0),
+    ]
+    thread, agent = make_thread([TimedSleepTool, TimedAsyncSleepTool], tool_calls)
+
+    start = time.perf_counter()
+    handle_requires_action(thread, agent)
+
+    assert time.perf_counter() - start < 1
+    assert submitted_outputs(thread) == {
+        "call_sync": "Error: Tool TimedSleepTool timed out after 0.2 seconds.",
+        "call_async": "Error: Tool TimedAsyncSleepTool timed out after 0.2 seconds.",
+        "call_fast": "slept 0.0",
+    }
+    assert thread._tracking_manager.track_tool_error.call_count == 2
+
+
+def test_timed_out_tools_hold_their_thread(monkeypatch):
+    monkeypatch.setattr(Thread, "_timeout_slots", threading.BoundedSemaphore(1))
+
+    def call(seconds) -> str:
+        thread, agent = make_thread([TimedSleepTool], [make_tool_call("call", "TimedSleepTool", seconds=seconds)])
+        handle_requires_action(thread, agent)
+        return submitted_outputs(thread)["call"]
+
+    timed_out = "Error: Tool TimedSleepTool timed out after 0.2 seconds."
+    assert call(0.5) == timed_out
+    # The timed out call still runs in the only thread
+    assert call(0) == timed_out
+    time.sleep(0.4)
+    assert call(0) == "slept 0.0"
+
+
+def test_isolated_tool_is_killed_on_timeout(tool_executor):
+    tool_executor.warm_up([IsolatedTool])
+
+    def call(**arguments) -> str:
+        thread, agent = make_thread([IsolatedTool], [make_tool_call("call", "IsolatedTool", **arguments)])
+        handle_requires_action(thread, agent)
+        return submitted_outputs(thread)["call"]
+
+    pid = call()
+    assert int(pid) != os.getpid()
+
+    start = time.perf_counter()
+    assert call(seconds=30) == "Error: Tool IsolatedTool timed out after 1.0 seconds."
+    assert time.perf_counter() - start < 3
+    assert call(crash=True) == "Error: Tool IsolatedTool crashed its worker process."
+
+    # The killed and crashed processes were replaced
+    new_pid = call()
+    assert new_pid not in (pid, str(os.getpid()))
+
+
+def test_batchable_tool_calls_are_merged():
+    tool_calls = [
+        make_tool_call("call_1", "PriceTool", ticker="AAPL"),
+        make_tool_call("call_sync", "SleepTool", seconds=0),
+        make_tool_call("call_2", "PriceTool", ticker="GOOG"),
+        make_tool_call("call_invalid", "PriceTool"),
+        make_tool_call("call_3", "PriceTool", ticker="MSFT"),
+    ]
+    thread, agent = make_thread([PriceTool, SleepTool], tool_calls)
+    PriceTool.batches.clear()
+
+    handle_requires_action(thread, agent)
+
+    # One run_batch for the valid calls, outputs scattered back to their tool calls
+    assert PriceTool.batches == [["AAPL", "GOOG", "MSFT"]]
+    outputs = submitted_outputs(thread)
+    assert outputs["call_1"] == "AAPL: 4"
+    assert outputs["call_2"] == "GOOG: 4"
+    assert outputs["call_3"] == "MSFT: 4"
+    assert outputs["call_sync"] == "slept 0.0"
+    assert outputs["call_invalid"].startswith("Error:")
+
+    # A failing batch fails each of its calls, a single call uses run
+    tool_calls = [
+        make_tool_call("call_1", "PriceTool", ticker="FAIL"),
+        make_tool_call("call_2", "PriceTool", ticker="A"),
+    ]
+    thread, agent = make_thread([PriceTool], tool_calls)
+    handle_requires_action(thread, agent)
+    assert submitted_outputs(thread) == {"call_1": "Error: bulk request failed", "call_2": "Error: bulk request failed"}
+
+    thread, agent = make_thread([PriceTool], [make_tool_call("call_1", "PriceTool", ticker="A")])
+    handle_requires_action(thread, agent)
+    assert submitted_outputs(thread) == {"call_1": "A: 1"}
+
+
+def test_batchable_tool_respects_one_call_at_a_time():
+    tool_calls = [
+        make_tool_call("call_1", "SingleCallPriceTool", ticker="AAPL"),
+        make_tool_call("call_2", "SingleCallPriceTool", ticker="GOOG"),
+    ]
+    thread, agent = make_thread([SingleCallPriceTool], tool_calls)
+    SingleCallPriceTool.batches.clear()
+
+    handle_requires_action(thread, agent)
+
+    outputs = submitted_outputs(thread)
+    assert outputs["call_1"] == "AAPL: 4"
+    assert "is already called" in outputs["call_2"]
+    assert SingleCallPriceTool.batches == [["AAPL"]]
@@ -1,19 +1,24 @@
 import asyncio
+import json
 import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
 from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import List, Optional
 
 import httpx
 import pytest
 from langchain_community.tools import MoveFileTool, YouTubeSearchTool
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from agency_swarm.tools import BaseTool, ToolFactory
+from agency_swarm.tools.HttpClientPool import HttpClientPool
 from agency_swarm.tools.mcp import MCPServerSse, MCPServerStdio, MCPServerStreamableHttp, MCPToolParams
+from agency_swarm.tools.ModelCache import ModelCache
 from agency_swarm.util import get_openai_client
 from agency_swarm.util.helpers.sync_async import run_async_sync
 
@@ -146,6 +151,319 @@ def test_custom_tool():
     assert tool2.openai_schema["strict"]
 
 
+def test_openai_schema_is_cached(monkeypatch):
+    class Address(BaseModel):
+        city: str
+
+    class CachedTool(BaseTool):
+        """Look up a user.
+
+        Args:
+            user_id: Id of the user.
+        """
+
+        user_id: int
+        address: Address
+
+        class ToolConfig:
+            strict = False
+
+        def run(self):
+            return self.user_id
+
+    schema = CachedTool.openai_schema
+    assert schema["parameters"]["properties"]["user_id"]["description"] == "Id of the user."
+
+    # Computed once, and callers get their own copy
+    monkeypatch.setattr(CachedTool, "model_json_schema", classmethod(lambda cls: pytest.fail("schema rebuilt")))
+    schema["parameters"]["properties"].clear()
+    assert CachedTool.openai_schema["parameters"]["properties"]
+
+    # Building the OpenAPI schema doesn't modify the cached schema
+    ToolFactory.get_openapi_schema([CachedTool], "https://example.com")
+    assert "Address" in CachedTool.openai_schema["parameters"]["$defs"]
+    monkeypatch.undo()
+
+    # Changes of the strict mode and explicit invalidations rebuild it
+    CachedTool.ToolConfig.strict = True
+    assert CachedTool.openai_schema["strict"] is True
+    CachedTool.invalidate_openai_schema()
+    assert CachedTool.__dict__["_openai_schema_cache"] is None
+
+
+def test_tool_config_is_resolved_per_class():
+    class ConfiguredTool(BaseTool):
+        value: int = 0
+
+        class ToolConfig:
+            one_call_at_a_time = True
+
+        def run(self):
+            return self.value
+
+    class ChildTool(ConfiguredTool):
+        pass
+
+    # Resolved with the defaults when the class is created
+    config = ConfiguredTool._tool_config
+    assert config.one_call_at_a_time is True
+    assert config.output_as_result is False and config.timeout is None
+    assert ConfiguredTool.ToolConfig.output_as_result is False
+    assert ChildTool._tool_config == config
+    with pytest.raises(ValidationError):
+        config.timeout = 5
+
+    # Instances share the resolved config
+    assert ConfiguredTool(value=1)._tool_config is config
+
+    # Modifying or replacing ToolConfig resolves it again, for subclasses too
+    ConfiguredTool.ToolConfig.timeout = 5
+    assert ConfiguredTool._tool_config.timeout == 5
+    assert ChildTool._tool_config.timeout == 5
+
+    class ToolConfig:
+        output_as_result = True
+
+    ChildTool.ToolConfig = ToolConfig
+    assert ChildTool._tool_config.output_as_result is True
+    assert ChildTool._tool_config.one_call_at_a_time is False
+    assert ConfiguredTool._tool_config.output_as_result is False
+
+
+def test_from_openai_schema_model_cache(tmp_path, monkeypatch):
+    schema = {
+        "name": "get_user",
+        "description": "Get a user",
+        "parameters": {
+            "type": "object",
+            "properties": {"user_id": {"type": "integer", "description": "Id of the user"}},
+            "required": ["user_id"],
+        },
+    }
+    monkeypatch.setattr(ToolFactory, "model_cache", ModelCache(cache_dir=tmp_path))
+    first = ToolFactory.from_openai_schema(schema, lambda self: self.user_id)
+
+    # Identical schemas reuse the model, without generating code again
+    def fail(*args):
+        raise AssertionError("model source generated again")
+
+    monkeypatch.setattr(ToolFactory, "_generate_model_source", staticmethod(fail))
+    second = ToolFactory.from_openai_schema({**schema, "name": "get_user_again"}, lambda self: self.user_id)
+    assert second.__mro__[2] is first.__mro__[2]
+    assert second(user_id=3).run() == 3
+
+    # A new process loads the generated source from disk
+    monkeypatch.setattr(ToolFactory, "model_cache", ModelCache(cache_dir=tmp_path))
+    third = ToolFactory.from_openai_schema(schema, lambda self: self.user_id)
+    assert third.openai_schema == first.openai_schema
+    assert ToolFactory.model_cache.stats()["disk_hits"] == 1
+
+    # Strict mode generates a different model
+    with pytest.raises(AssertionError):
+        ToolFactory.from_openai_schema({**schema, "strict": True}, lambda self: self.user_id)
+
+
+def test_from_openai_schema_native_engine():
+    schema = {
+        "name": "create_task",
+        "description": "Create a task",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "Title of the task", "minLength": 1},
+                "from": {"type": "string", "description": "Author of the task"},
+                "status": {"$ref": "#/$defs/Status"},
+                "due": {"type": ["string", "null"], "format": "date"},
+                "subtasks": {"type": "array", "items": {"$ref": "#/$defs/Task"}},
+                "labels": {"type": "object", "additionalProperties": {"type": "string"}},
+            },
+            "required": ["title", "from", "status"],
+            "$defs": {
+                "Status": {"type": "string", "enum": ["open", "closed"]},
+                "Task": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "subtasks": {"type": "array", "items": {"$ref": "#/$defs/Task"}},
+                    },
+                    "required": ["title"],
+                },
+            },
+        },
+    }
+    tool = ToolFactory.from_openai_schema(schema, lambda self: self.model_dump(by_alias=True), engine="native")
+    assert tool.__name__ == "create_task"
+
+    # Reserved names are aliased and recursive references are resolved
+    result = tool(
+        title="Release",
+        **{"from": "me"},
+        status="open",
+        subtasks=[{"title": "Tag", "subtasks": [{"title": "Push"}]}],
+        labels={"team": "core"},
+    ).run()
+    assert result["from"] == "me"
+    assert result["subtasks"][0]["subtasks"][0]["title"] == "Push"
+
+    with pytest.raises(ValueError):
+        tool(title="Release", **{"from": "me"}, status="unknown")
+    with pytest.raises(ValueError):
+        tool(title="", **{"from": "me"}, status="open")
+
+    parameters = tool.openai_schema["parameters"]
+    assert parameters["required"] == ["from", "status", "title"]
+    assert parameters["properties"]["status"]["enum"] == ["open", "closed"]
+    assert parameters["properties"]["due"]["anyOf"] == [{"type": "string"}, {"type": "null"}]
+    assert parameters["properties"]["due"]["format"] == "date"
+
+    # In strict mode, optional properties are required but nullable
+    strict_tool = ToolFactory.from_openai_schema({**schema, "strict": True}, lambda self: None, engine="native")
+    assert "due" in strict_tool.openai_schema["parameters"]["required"]
+
+    with pytest.raises(ValueError):
+        ToolFactory.from_openai_schema(schema, lambda self: None, engine="unknown")
+
+
+@pytest.mark.parametrize("engine", ["codegen", "native"])
+def test_draft4_exclusive_bounds(engine):
+    schema = {
+        "name": "set_quantity",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "n": {"type": "integer", "minimum": 0, "exclusiveMinimum": True},
+                "ratio": {"type": "number", "maximum": 1, "exclusiveMaximum": True},
+            },
+            "required": ["n"],
+        },
+    }
+    tool = ToolFactory.from_openai_schema(schema, lambda self: None, engine=engine)
+
+    tool(n=1, ratio=0.5)
+    with pytest.raises(ValueError):
+        tool(n=0)
+    with pytest.raises(ValueError):
+        tool(n=1, ratio=1)
+
+
+def test_native_engine_matches_codegen():
+    with open("./data/schemas/ga4.json", "r") as f:
+        schema = f.read()
+
+    codegen = ToolFactory.from_openapi_schema(schema, {})[0]
+    ToolFactory.schema_engine = "native"
+    try:
+        native = ToolFactory.from_openapi_schema(schema, {})[0]
+    finally:
+        ToolFactory.schema_engine = "codegen"
+    assert native.openai_schema == codegen.openai_schema
+
+
+def test_lazy_tools(monkeypatch):
+    with open("./data/schemas/get-weather.json", "r") as f:
+        spec = f.read()
+    monkeypatch.setattr(ToolFactory, "model_cache", ModelCache(max_entries=0))
+    eager = ToolFactory.from_openapi_schema(spec, {})[0]
+
+    def fail(*args):
+        raise AssertionError("model built")
+
+    monkeypatch.setattr(ToolFactory, "_generate_model_source", staticmethod(fail))
+    tool = ToolFactory.from_openapi_schema(spec, {}, lazy=True)[0]
+
+    # The schema is served from the spec, without building the model
+    assert issubclass(tool, BaseTool) and not tool.is_materialized
+    assert tool.openai_schema["name"] == eager.openai_schema["name"]
+    assert tool.openai_schema["parameters"]["required"] == eager.openai_schema["parameters"]["required"]
+    assert list(tool.openai_schema["parameters"]["properties"]) == list(eager.openai_schema["parameters"]["properties"])
+
+    # The model is built on first use
+    monkeypatch.undo()
+    instance = tool(parameters={"location": "Paris"})
+    assert tool.is_materialized
+    assert isinstance(instance, BaseTool)
+    assert instance.parameters.location == "Paris"
+    assert list(tool.model_fields) == ["parameters"]
+    with pytest.raises(ValueError):
+        tool(parameters={})
+
+
+def _object_shapes(schema, root=None, path="$"):
+    """Properties, required properties and additionalProperties of each object of a schema, with $refs resolved."""
+    root = root or schema
+    if "$ref" in schema:
+        schema = root["$defs"][schema["$ref"].rsplit("/", 1)[-1]]
+    shapes = {}
+    for option in schema.get("anyOf", []):
+        if option.get("type") != "null":
+            shapes.update(_object_shapes(option, root, path))
+    if "items" in schema:
+        shapes.update(_object_shapes(schema["items"], root, f"{path}[]"))
+    if "properties" in schema:
+        shapes[path] = (
+            sorted(schema["properties"]),
+            sorted(schema.get("required", [])),
+            schema.get("additionalProperties"),
+        )
+        for name, prop in schema["properties"].items():
+            shapes.update(_object_shapes(prop, root, f"{path}.{name}"))
+    return shapes
+
+
+def test_lazy_tool_strict_schema_matches_materialized():
+    schema = {
+        "name": "create_order",
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "customer": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string", "x-order": 1},
+                        "address": {
+                            "type": "object",
+                            "properties": {"city": {"type": "string", "example": "Paris"}, "zip": {"type": "string"}},
+                            "required": ["city"],
+                        },
+                    },
+                    "required": ["name"],
+                },
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}},
+                        "required": ["sku"],
+                    },
+                },
+                "note": {"type": "string", "frontend_metadata": {"required": True}},
+            },
+            "required": ["customer"],
+        },
+    }
+    tool = ToolFactory.from_openai_schema(schema, lambda self: None, lazy=True)
+    lazy_parameters = tool.openai_schema["parameters"]
+    materialized_parameters = tool.materialize().openai_schema["parameters"]
+
+    assert _object_shapes(lazy_parameters) == _object_shapes(materialized_parameters)
+    assert _object_shapes(lazy_parameters)["$.customer.address"] == (["city", "zip"], ["city", "zip"], False)
+    assert lazy_parameters["properties"]["customer"]["properties"]["address"]["properties"]["zip"] == {
+        "type": ["string", "null"]
+    }
+    assert "frontend_metadata" not in json.dumps(lazy_parameters)
+    assert "x-order" not in json.dumps(lazy_parameters)
+
+    # The bundled OpenAPI schemas too
+    for name in ("ga4", "get-headers-params", "get-weather", "relevance"):
+        with open(f"./data/schemas/{name}.json", "r") as f:
+            spec = f.read()
+        for lazy_tool in ToolFactory.from_openapi_schema(spec, {}, strict=True, lazy=True):
+            assert _object_shapes(lazy_tool.openai_schema["parameters"]) == _object_shapes(
+                lazy_tool.materialize().openai_schema["parameters"]
+            ), lazy_tool.__name__
+
+
 def test_get_weather_openapi():
     with open("./data/schemas/get-weather.json", "r") as f:
         tools = ToolFactory.from_openapi_schema(f.read(), {})
@@ -161,14 +479,13 @@ async def test_relevance_openapi_schema():
             def __init__(self, **kwargs):
                 self.timeout = kwargs.get("timeout", None)
 
-            async def __aenter__(self):
-                return self
-
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
+            async def aclose(self):
                 pass
 
-            async def post(self, *args, **kwargs):
+            async def request(self, method, url, **kwargs):
                 class MockResponse:
+                    status_code = 200
+
                     def json(self):
                         return {"output": {"transformed": {"data": "test complete."}}}
 
@@ -179,7 +496,9 @@ async def test_relevance_openapi_schema():
         httpx.AsyncClient = MockClient
 
         try:
-            tools = ToolFactory.from_openapi_schema(f.read(), {"Authorization": "mock-key"})
+            tools = ToolFactory.from_openapi_schema(
+                f.read(), {"Authorization": "mock-key"}, http_client_pool=HttpClientPool()
+            )
 
             output = await tools[0](requestBody={"text": "test"}).run()
 
@@ -189,6 +508,105 @@ async def test_relevance_openapi_schema():
             httpx.AsyncClient = original_client
 
 
+def test_openapi_tools_reuse_connections():
+    connections = set()
+    attempts = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            connections.add(self.client_address)
+            attempts.append(self.path)
+            # The first request fails once, and is retried
+            status = 503 if len(attempts) == 1 else 200
+            body = json.dumps({"path": self.path}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Items", "version": "1.0.0"},
+        "servers": [{"url": f"http://127.0.0.1:{server.server_port}"}],
+        "paths": {
+            "/items/{id}": {
+                "get": {
+                    "operationId": "getItem",
+                    "description": "Get an item",
+                    "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                }
+            }
+        },
+    }
+    pool = HttpClientPool(backoff_factor=0)
+    try:
+        tool = ToolFactory.from_openapi_schema(spec, {}, http_client_pool=pool)[0]
+
+        # Calls from different event loops share the client
+        for i in range(3):
+            assert asyncio.run(tool(parameters={"id": i}).run()) == {"path": f"/items/{i}"}
+        assert len(attempts) == 4
+        assert len(connections) == 1
+        assert pool.stats()["clients"] == 1
+    finally:
+        pool.close()
+        server.shutdown()
+    assert pool.stats()["clients"] == 0
+
+
+def test_openapi_patch_sends_request_body():
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_PATCH(self):
+            requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    item = {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Items", "version": "1.0.0"},
+        "servers": [{"url": f"http://127.0.0.1:{server.server_port}"}],
+        "paths": {
+            "/items": {
+                "patch": {
+                    "operationId": "updateItem",
+                    "description": "Update an item",
+                    "requestBody": {"content": {"application/json": {"schema": item}}},
+                }
+            }
+        },
+    }
+    pool = HttpClientPool()
+    try:
+        tool = ToolFactory.from_openapi_schema(spec, {}, http_client_pool=pool)[0]
+        asyncio.run(tool(requestBody={"name": "renamed"}).run())
+    finally:
+        pool.close()
+        server.shutdown()
+    assert requests == [{"name": "renamed"}]
+
+
 @pytest.mark.asyncio
 async def test_get_headers_openapi_schema():
     with open("./data/schemas/get-headers-params.json", "r") as f:
@@ -199,6 +617,57 @@ async def test_get_headers_openapi_schema():
         assert "headers" in output
 
 
+def test_openapi_schema_filters_and_shared_components(caplog, monkeypatch):
+    address = {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}
+    node = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}},
+        },
+    }
+
+    def operation(operation_id, tag, schema_ref):
+        return {
+            "operationId": operation_id,
+            "description": operation_id,
+            "tags": [tag],
+            "requestBody": {"content": {"application/json": {"schema": {"$ref": schema_ref}}}},
+        }
+
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Users", "version": "1.0.0"},
+        "servers": [{"url": "https://example.com"}],
+        "paths": {
+            "/users": {
+                "post": operation("createUser", "users", "#/components/schemas/Address"),
+                "put": operation("updateUser", "users", "#/components/schemas/Address"),
+            },
+            "/users/{id}/tree": {"post": operation("createTree", "trees", "#/components/schemas/Node")},
+            "/admin/reset": {"post": operation("reset", "admin", "#/components/schemas/Address")},
+        },
+        "components": {"schemas": {"Address": address, "Node": node}},
+    }
+
+    # Only the native engine supports recursive models
+    monkeypatch.setattr(ToolFactory, "schema_engine", "native")
+    with caplog.at_level("INFO", logger="agency_swarm.tools.ToolFactory"):
+        tools = ToolFactory.from_openapi_schema(spec, {}, exclude_tags=["admin"])
+    assert [tool.__name__ for tool in tools] == ["createUser", "updateUser", "createTree"]
+    assert "Created 3 tools from OpenAPI schema" in caplog.text
+    assert "1 operations filtered out" in caplog.text
+
+    # Recursive components are kept as definitions
+    tree = tools[2](requestBody={"name": "root", "children": [{"name": "leaf", "children": []}]})
+    assert tree.requestBody.children[0].name == "leaf"
+    assert "Node" in tools[2].openai_schema["parameters"]["$defs"]
+
+    filtered = ToolFactory.from_openapi_schema(spec, {}, include_paths=["/users*"], exclude_operations=["update*"])
+    assert [tool.__name__ for tool in filtered] == ["createUser", "createTree"]
+    assert spec["components"]["schemas"]["Address"] == address
+
+
 def test_ga4_openapi_schema():
     with open("./data/schemas/ga4.json", "r") as f:
         tools = ToolFactory.from_openapi_schema(f.read(), {})